@@ -14,6 +14,8 @@ import argparse
 import tempfile
 
 from . import simulator
+from .sim import ROUTING_ALGORITHMS, RWA_ALGORITHMS, WAVELENGTH_ALGORITHMS
+from .traffic import load_grid
 from .util import validate_args
 
 logger = logging.getLogger(__name__)
@@ -26,7 +28,8 @@ parser = argparse.ArgumentParser(
     formatter_class=fmt,
     description='RWA WDM Simulator: routing and wavelength assignment '
                 'simulator for WDM networks',
-    usage='%(prog)s [-h] [-r <alg> -w <alg> | --rwa <alg>] [options]')
+    usage='%(prog)s [-h] [-r <alg> -w <alg> | --rwa <alg> | '
+          '--compare <alg> [<alg> ...]] [options]')
 
 net = parser.add_argument_group('Network options')
 rwa = parser.add_argument_group('RWA algorithms options')
@@ -35,26 +38,34 @@ ga = parser.add_argument_group('Genetic algorithm options')
 
 # network topology options
 net.add_argument('-t', default='nsf', dest='topology',
-                 choices=['nsf', 'clara', 'janet', 'rnp'],
                  metavar='<topology>',
-                 help='network topology')
+                 help='network topology, either one of nsf, clara, janet, '
+                      'rnp, a .json or .gml file describing one, or a '
+                      'synthetic one such as grid:10x10, torus:8x8, ring:64, '
+                      'waxman:500,seed=1 or ba:1000,m=2')
 net.add_argument('-c', type=int, default=8, dest='channels',
-                 choices=[2 ** (i + 1) for i in range(8)],  # max: 256
                  metavar='<channels>',
                  help='number of λ per link')
+net.add_argument('--packed', default=False, action='store_true',
+                 help='hold λ availability packed as 64 λ per word, which '
+                      'speeds up simulations with many channels per link')
 
 # rwa algorithms options
 # TODO [ -r <algorithms> -w <algorithm> ] [ --rwa <algorithm> ]
 # https://stackoverflow.com/questions/17909294/python-argparse-mutual-exclusive-group
 rwa.add_argument('-r', metavar='<algorithm>',
-                 choices=['dijkstra', 'yen'],
+                 choices=ROUTING_ALGORITHMS,
                  help='routing algorithm')
 rwa.add_argument('-w', metavar='<algorithm>',
-                 choices=['vertex-coloring', 'first-fit', 'random-fit'],
+                 choices=WAVELENGTH_ALGORITHMS,
                  help='wavelength assignment algorithm')
 rwa.add_argument('--rwa', metavar='<algorithm>',
-                 choices=['genetic-algorithm'],
+                 choices=RWA_ALGORITHMS,
                  help='routing *and* wavelength assigment algorithm')
+rwa.add_argument('--compare', metavar='<algorithm>', nargs='+',
+                 help='compare several algorithms in lockstep over the same '
+                      'traffic, e.g. dijkstra_first-fit yen_vertex-coloring '
+                      'genetic-algorithm (instead of -r/-w or --rwa)')
 rwa.add_argument('-y', metavar='<yen-alt-paths>', type=int,
                  default=2, choices=range(2, 5),
                  help='number of routing alternate paths (Yen\'s)')
@@ -63,15 +74,94 @@ rwa.add_argument('-y', metavar='<yen-alt-paths>', type=int,
 sim.add_argument('-l', type=int, default=30, dest='load',
                  metavar='<max-load>', choices=range(10, 256),
                  help='maximum network load, in Erlangs')
+sim.add_argument('--loads', type=load_grid, default=None,
+                 metavar='<load-grid>',
+                 help='network loads, in Erlangs, instead of 1 to <max-load>: '
+                      'either a list such as 1,2,5,10, a range such as 1:30 '
+                      'or 0.5:30:0.5, or log:<start>:<stop>:<num> for '
+                      'log-spaced loads')
+sim.add_argument('--refine', type=int, default=0,
+                 metavar='<rounds>',
+                 help='after simulating the load grid, refine it for this '
+                      'many rounds where the blocking probability changes '
+                      'the fastest (implies --independent-loads)')
+sim.add_argument('--refine-points', type=int, default=5,
+                 metavar='<num-loads>',
+                 help='maximum number of loads added per refinement round')
 sim.add_argument('-k', type=int, default=150, dest='calls',
                  metavar='<conn-requests>',
-                 help='number of connection requests to arrive')
+                 help='number of connection requests to arrive (batch '
+                      'size when --ci is set)')
 sim.add_argument('-d', default=TEMP_DIR, dest='result_dir',
                  metavar='<result-dir>',
                  help='dir to store blocking probability results')
 sim.add_argument('-s', type=int, default=1, dest='num_sim',
                  metavar='<num-simulations>',
-                 help='number of times to run the simulation')
+                 help='number of times to run the simulation (maximum '
+                      'when --ci is set)')
+sim.add_argument('-j', '--jobs', type=int, default=1,
+                 metavar='<num-jobs>',
+                 help='number of worker processes to run simulations on')
+sim.add_argument('--independent-loads', default=False, action='store_true',
+                 help='simulate each load over a fresh network instance, so '
+                      'loads can run in parallel as well')
+sim.add_argument('--ci', type=float, default=None, dest='ci_width',
+                 metavar='<rel-half-width>',
+                 help='keep simulating batches of calls (and repetitions) '
+                      'until the relative half-width of the blocking '
+                      'probability\'s confidence interval falls below this '
+                      'value, e.g. 0.05 (disabled if unset)')
+sim.add_argument('--confidence', type=float, default=0.95,
+                 metavar='<level>',
+                 help='confidence level of the confidence intervals')
+sim.add_argument('--max-calls', type=int, default=1000000,
+                 metavar='<max-conn-requests>',
+                 help='maximum number of connection requests per load when '
+                      '--ci is set')
+sim.add_argument('--seed', type=int, default=None,
+                 metavar='<seed>',
+                 help='seed for random number generators (random if unset)')
+sim.add_argument('--progress', default='console', dest='progress',
+                 choices=['console', 'json', 'none'],
+                 help='how to report the progress of the simulation: on the '
+                      'console, as JSON lines on stdout, or not at all')
+sim.add_argument('--progress-interval', type=float, default=None,
+                 metavar='<secs>',
+                 help='minimum time between progress updates, in seconds '
+                      '(0.1 for console and 1.0 for json if unset)')
+sim.add_argument('-q', '--quiet', action='store_const', const='none',
+                 dest='progress',
+                 help='do not report progress nor results on stdout')
+sim.add_argument('--checkpoint-dir', default=None,
+                 metavar='<checkpoint-dir>',
+                 help='dir to periodically save the state of the simulation '
+                      'to, so it can be resumed (disabled if unset)')
+sim.add_argument('--checkpoint-interval', type=float, default=300.0,
+                 metavar='<secs>',
+                 help='minimum time between checkpoints, in seconds')
+sim.add_argument('--resume', default=False, action='store_true',
+                 help='resume an interrupted simulation from the last '
+                      'checkpoint found in --checkpoint-dir')
+sim.add_argument('--profile', default=False, action='store_true',
+                 help='time each phase of the simulation loop and the '
+                      'latency of RWA decisions, written to .prof files '
+                      'alongside .it ones')
+sim.add_argument('--trace-dir', default=None, metavar='<trace-dir>',
+                 help='dir to write a binary trace of every call to, along '
+                      'with the cause of its blocking (disabled if unset)')
+sim.add_argument('--trace-buffer', type=int, default=65536,
+                 metavar='<num-calls>',
+                 help='number of calls buffered between two writes to a '
+                      'trace')
+sim.add_argument('--traffic', default=None, metavar='<uniform|matrix-file>',
+                 help='draw the source and destination nodes of each call '
+                      'either uniformly or from a text file with a square '
+                      'traffic matrix, instead of always using the '
+                      'topology\'s own')
+sim.add_argument('--estimate', default=False, action='store_true',
+                 help='also estimate the blocking probability analytically '
+                      '(Erlang-B / reduced-load approximation), written to '
+                      '.est files alongside .bp ones')
 sim.add_argument('-p', default=False, dest='plot', action='store_true',
                  help='plot blocking probability graph after simulation?')
 
@@ -103,5 +193,6 @@ if __name__ == '__main__':
                     '%d λ per link using %s as RWA algorithm' %
                     (args.calls, args.topology, args.channels,
                      args.rwa if args.rwa is not None else
+                     ', '.join(args.compare) if args.compare else
                      '%s + %s combination' % (args.r, args.w)))
         simulator(args)
@@ -0,0 +1,236 @@
+"""Analytical approximations of the blocking probability
+
+"""
+
+# [1] F. P. Kelly, "Blocking probabilities in large circuit-switched
+#     networks", Advances in Applied Probability, vol. 18, no. 2, 1986
+# [2] A. Birman, "Computing approximate blocking probabilities for a class of
+#     all-optical networks", IEEE JSAC, vol. 14, no. 5, 1996
+
+import logging
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .rwa.routing import RouteTable
+from .traffic import traffic_matrix
+
+__all__ = (
+    'erlang_b',
+    'erlang_b_table',
+    'reduced_load_blocking',
+    'estimate_blocking',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def erlang_b_table(servers: int, load: float) -> np.ndarray:
+    """Erlang-B blocking probability for every number of servers up to one
+
+    Computed via the numerically stable recursion
+    E(0) = 1, E(c) = a E(c - 1) / (c + a E(c - 1)).
+
+    Args:
+        servers: maximum number of servers, i.e., wavelength channels
+        load: offered load, in Erlangs
+
+    Returns:
+        :obj:`np.ndarray`: blocking probabilities for 0, 1, ..., `servers`
+            servers
+
+    """
+    table = np.empty(servers + 1)
+    table[0] = 1.0
+    for c in range(1, servers + 1):
+        table[c] = load * table[c - 1] / (c + load * table[c - 1])
+    return table
+
+
+def erlang_b(servers: int, load: float) -> float:
+    """Erlang-B blocking probability of a loss system
+
+    Args:
+        servers: number of servers, i.e., wavelength channels
+        load: offered load, in Erlangs
+
+    Returns:
+        :obj:`float`: probability that an arriving call finds every server
+            busy
+
+    """
+    return float(erlang_b_table(servers, load)[-1])
+
+
+def _binomial_pmf(n: int, p: float) -> np.ndarray:
+    """Probability mass function of Binomial(n, p) over 0, 1, ..., n"""
+    k = np.arange(n + 1)
+    if p <= 0.0:
+        return (k == 0).astype(np.float64)
+    if p >= 1.0:
+        return (k == n).astype(np.float64)
+    log_fact = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n + 1)))))
+    log_pmf = log_fact[n] - log_fact[k] - log_fact[n - k] + \
+        k * np.log(p) + (n - k) * np.log1p(-p)
+    return np.exp(log_pmf)
+
+
+def reduced_load_blocking(routes: Sequence[Sequence[Sequence[int]]],
+                          loads: Sequence[float], channels: int,
+                          tol: float = 1e-9, max_iter: int = 1000,
+                          damping: float = 0.5) -> np.ndarray:
+    """Reduced-load fixed-point approximation of the blocking probability
+
+    Every demand offers Poisson traffic to its routes in turn, as alternate
+    routing does: calls blocked on a route overflow to the next one, and are
+    lost when blocked on the last. The traffic offered to each route is thus
+    reduced by the blocking on the routes before it, in the spirit of
+    Kelly's reduced-load approximation [1].
+
+    Under the wavelength continuity constraint, the calls a route carries
+    hold the same λ on all of its links, so they compete with each other as
+    in a single Erlang loss system. The calls of other routes sharing some
+    of its links, on the other hand, are assumed to hold λs independently on
+    each link [2], so each of the `channels` λs remains usable by the route
+    with probability equal to the product, over its links, of the fraction
+    of that link's λs not taken by foreign traffic. The blocking on the
+    route is then Erlang-B averaged over the resulting binomial number of
+    usable λs.
+
+    Blocking probabilities are iterated upon, with damping, until they
+    settle. A route alone on its links gets Erlang-B blocking, as it should.
+
+    Args:
+        routes: for each demand, its routes in the order they are tried,
+            each one as a sequence of router indices
+        loads: offered load of each demand, in Erlangs
+        channels: number of wavelength channels per link
+        tol: maximum change in any route's blocking for the fixed point to
+            be considered reached
+        max_iter: maximum number of iterations
+        damping: weight of the previous iterate in the next one, within
+            [0, 1)
+
+    Returns:
+        :obj:`np.ndarray`: blocking probability of each demand
+
+    """
+    if len(routes) != len(loads):
+        raise ValueError('Expect as many route sets as loads')
+
+    # flatten routes of all demands, identifying links regardless of their
+    # direction
+    flat: List[Tuple[int, int]] = []  # (demand, rank) of each route
+    link_ids: Dict[Tuple[int, int], int] = {}
+    route_links: List[List[int]] = []
+    for demand, route_set in enumerate(routes):
+        for rank, route in enumerate(route_set):
+            flat.append((demand, rank))
+            route_links.append([
+                link_ids.setdefault((min(i, j), max(i, j)), len(link_ids))
+                for i, j in zip(route[:-1], route[1:])])
+
+    # incidence matrix of routes over links
+    incidence = np.zeros((len(flat), len(link_ids)))
+    for r, links in enumerate(route_links):
+        incidence[r, links] = 1.0
+
+    blocking = np.zeros(len(flat))
+    for iteration in range(max_iter):
+        # traffic offered to each route, overflowing from the previous ones
+        offered = np.empty(len(flat))
+        for r, (demand, rank) in enumerate(flat):
+            if rank == 0:
+                offered[r] = loads[demand]
+            else:
+                offered[r] = offered[r - 1] * blocking[r - 1]
+        carried = offered * (1.0 - blocking)
+
+        # fraction of λs held by foreign traffic, per route and link
+        link_carried = carried @ incidence
+        foreign = (link_carried[np.newaxis, :] -
+                   carried[:, np.newaxis] * incidence) / channels
+        foreign = np.clip(foreign, 0.0, 1.0)
+        usable = np.prod(np.where(incidence > 0, 1.0 - foreign, 1.0), axis=1)
+
+        updated = np.array([
+            np.dot(_binomial_pmf(channels, usable[r]),
+                   erlang_b_table(channels, offered[r]))
+            for r in range(len(flat))])
+        updated = damping * blocking + (1.0 - damping) * updated
+        converged = np.max(np.abs(updated - blocking)) <= tol
+        blocking = updated
+        if converged:
+            break
+    else:
+        logger.warning('Reduced-load fixed point not reached within %d '
+                       'iterations' % max_iter)
+
+    # a demand is lost when every one of its routes is blocked
+    demand_blocking = np.ones(len(routes))
+    for r, (demand, _) in enumerate(flat):
+        demand_blocking[demand] *= blocking[r]
+    return demand_blocking
+
+
+def estimate_blocking(topology: str, channels: int, routing: str,
+                      loads: Sequence[float], k: int = 2,
+                      traffic: Union[str, None] = None) -> np.ndarray:
+    """Estimates the blocking probability of a simulation analytically
+
+    The routes are the ones `dijkstra` or `yen` produce between the source
+    and destination nodes of the topology, which all calls of the simulation
+    go between, or else between every pair of nodes with traffic, each one
+    offered its share of the load. The blocking probability is then the
+    average over pairs, weighted by their share. The estimate refers to the
+    steady state, and does not depend on the wavelength assignment
+    algorithm. NumPy's global RNG, which the network instantiation draws
+    from, is left untouched.
+
+    Args:
+        topology: short identifier for the network topology
+        channels: number of wavelength channels per network link
+        routing: either "dijkstra" or "yen"
+        loads: network loads, in Erlangs
+        k: number of alternate paths for Yen's routing algorithm
+        traffic: traffic matrix, as understood by `traffic_matrix`, or None
+            for the topology's source and destination nodes only
+
+    Returns:
+        :obj:`np.ndarray`: blocking probabilities, as percentages, per load
+
+    Raises:
+        ValueError: if there is no analytical model for the routing algorithm
+
+    """
+    from .sim import get_net_instance_from_args
+
+    state = np.random.get_state()
+    try:
+        net = get_net_instance_from_args(topology, channels)
+    finally:
+        np.random.set_state(state)
+
+    if routing not in ('dijkstra', 'yen'):
+        raise ValueError('No analytical model for routing algorithm "%s"'
+                         % routing)
+
+    if traffic is None:
+        pairs, share = [(net.s, net.d)], np.ones(1)
+    else:
+        matrix = traffic_matrix(traffic, net.nnodes)
+        pairs = [(s, d) for s, d in np.argwhere(matrix > 0).tolist()]
+        share = matrix[matrix > 0] / matrix.sum()
+
+    if routing == 'dijkstra':
+        routes = RouteTable(net.a, pairs)
+        route_sets = [[routes.shortest(s, d)] for s, d in pairs]
+    else:
+        routes = RouteTable(net.a, pairs, shortest=False, k=k)
+        route_sets = [routes.alternate(s, d) for s, d in pairs]
+
+    return np.array([
+        100.0 * np.dot(share, reduced_load_blocking(route_sets,
+                                                    (load * share).tolist(),
+                                                    channels))
+        for load in loads])
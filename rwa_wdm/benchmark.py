@@ -0,0 +1,335 @@
+"""Benchmark suite of the RWA algorithms and of the simulation loop
+
+Every operation is timed over each network topology, number of channels per
+link and occupancy level requested, and the results can be saved as a
+baseline to be compared against later on, e.g., before and after upgrading
+to a new release:
+
+.. code-block:: sh
+
+    python -m rwa_wdm.benchmark -t nsf clara -c 8 64 --save baseline.json
+    python -m rwa_wdm.benchmark -t nsf clara -c 8 64 --baseline baseline.json
+
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import timeit
+from timeit import default_timer
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import __version__
+from .net import Lightpath, Network
+from .rwa.ga import GeneticAlgorithm
+from .rwa.routing import dijkstra, yen
+from .rwa.wlassignment import (first_fit, random_fit, most_used, least_used,
+                               vertex_coloring)
+from .sim import (get_net_instance_from_args, parse_algorithm,
+                  SimulationConfig, Simulator)
+
+__all__ = (
+    'OPERATIONS',
+    'occupy',
+    'time_operation',
+    'benchmark',
+    'compare',
+    'main',
+)
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ('dijkstra', 'yen', 'first-fit', 'random-fit', 'most-used',
+              'least-used', 'vertex-coloring', 'genetic-algorithm',
+              'allocate', 'simulator')
+
+
+def occupy(net: Network, occupancy: float, rng: np.random.Generator) -> None:
+    """Sets the network up at a given level of occupancy
+
+    Every λ channel of every link is made busy with probability `occupancy`,
+    as background traffic, and as many lightpaths as that fraction of the
+    channels are set up along the shortest route between the network's source
+    and destination nodes, on distinct channels, as the traffic of the
+    simulation itself would.
+
+    Args:
+        net: Network topology instance, whose state is overwritten
+        occupancy: fraction of busy channels, within [0, 1]
+        rng: random number generator to draw busy channels from
+
+    """
+    net.n[...] = rng.random(net.n.shape) >= occupancy
+    net.t[...] = 0
+    net.t.clear_lightpaths()
+
+    route = dijkstra(net.a, net.s, net.d)
+    links = net.route_links(route)
+    num_lightpaths = int(round(occupancy * net.nchannels))
+    for w in rng.choice(net.nchannels, num_lightpaths, replace=False):
+        net.t.add_lightpath(Lightpath(route, int(w), links))
+        net.n[links, w] = 0
+    net.recount()
+
+
+def time_operation(operation: Callable[[], object], repeat: int = 3) -> float:
+    """Measures the latency of a single run of an operation
+
+    The operation is run in rounds long enough (0.2 seconds at least) for the
+    timer's resolution not to matter, and the fastest of the rounds is kept,
+    as it is the least disturbed by whatever else runs on the machine.
+
+    Args:
+        operation: callable taking no arguments
+        repeat: number of rounds
+
+    Returns:
+        :obj:`float`: time, in seconds, taken by a single run
+
+    """
+    timer = timeit.Timer(operation, timer=default_timer)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def _allocate(net: Network, route: List[int], wavelength: int) -> bool:
+    """Allocates a lightpath within a transaction that is then rolled back,
+    so the network is the same for every round"""
+    net.begin()
+    try:
+        return net.try_allocate(Lightpath(route, wavelength))
+    finally:
+        net.rollback()
+
+
+def _operation(name: str, net: Network, k: int) -> Callable[[], object]:
+    """Binds an operation to a network, ready to be timed"""
+    if name == 'dijkstra':
+        return lambda: dijkstra(net.a, net.s, net.d)
+    if name == 'yen':
+        return lambda: yen(net.a, net.s, net.d, k)
+
+    route = dijkstra(net.a, net.s, net.d)
+    if name == 'first-fit':
+        return lambda: first_fit(net, route)
+    if name == 'random-fit':
+        return lambda: random_fit(net, route)
+    if name == 'most-used':
+        return lambda: most_used(net, route)
+    if name == 'least-used':
+        return lambda: least_used(net, route)
+    if name == 'vertex-coloring':
+        return lambda: vertex_coloring(net, Lightpath(route, 0))
+    if name == 'genetic-algorithm':
+        ga = GeneticAlgorithm(25, 25, 0.40, 0.02)
+        return lambda: ga.run(net, k)
+    if name == 'allocate':
+        wavelength = first_fit(net, route)
+        wavelength = 0 if wavelength is None else wavelength
+        return lambda: _allocate(net, route, wavelength)
+    raise ValueError('Unknown operation "%s"' % name)
+
+
+def benchmark(topologies: Sequence[str], channels: Sequence[int],
+              occupancies: Sequence[float],
+              operations: Sequence[str] = OPERATIONS, k: int = 2,
+              repeat: int = 3, seed: int = 0,
+              sim_algorithm: str = 'dijkstra_first-fit',
+              sim_load: float = 10, sim_calls: int = 2000,
+              packed: bool = False) -> Dict[str, float]:
+    """Runs the benchmark suite
+
+    Routing operations depend on the topology only, so they are timed once
+    per topology. Wavelength assignment, the GA and the allocation of a
+    lightpath (rolled back right after, see `Network.rollback`) are timed
+    over every combination of topology, number of channels and occupancy
+    level. The simulation loop is timed over every topology and number of
+    channels, since occupancy is then up to the load.
+
+    Args:
+        topologies: short identifiers of the network topologies
+        channels: numbers of wavelength channels per link
+        occupancies: fractions of busy channels, within [0, 1]
+        operations: names of the operations to time, out of `OPERATIONS`
+        k: number of alternate paths for Yen's routing algorithm
+        repeat: number of timing rounds per case
+        seed: seed for the random number generators
+        sim_algorithm: algorithm the simulation loop is timed with, as
+            understood by `parse_algorithm`
+        sim_load: network load, in Erlangs, the simulation runs at
+        sim_calls: number of calls simulated per round
+        packed: hold the wavelength availability packed as 64 λs per word
+            (see `Network.pack`). Case identifiers are the same either way,
+            so one representation can be compared against the other
+
+    Returns:
+        :obj:`dict`: time, in seconds, taken by a single operation (or a
+            single simulated call), keyed by case identifier, such as
+            "first-fit/nsf/8ch/50%"
+
+    """
+    for name in operations:
+        if name not in OPERATIONS:
+            raise ValueError('Unknown operation "%s"' % name)
+
+    cases: List[Tuple[str, str, str, int, float]] = []
+    for topology in topologies:
+        for name in operations:
+            if name in ('dijkstra', 'yen'):
+                cases.append(('%s/%s' % (name, topology),
+                              name, topology, min(channels), 0.0))
+            elif name == 'simulator':
+                cases.extend(('%s/%s/%dch' % (name, topology, num_ch),
+                              name, topology, num_ch, 0.0)
+                             for num_ch in channels)
+            else:
+                cases.extend(('%s/%s/%dch/%d%%'
+                              % (name, topology, num_ch, 100 * occupancy),
+                              name, topology, num_ch, occupancy)
+                             for num_ch in channels
+                             for occupancy in occupancies)
+
+    results = {}
+    for case, name, topology, num_ch, occupancy in cases:
+        logger.info('Benchmarking %s' % case)
+        np.random.seed(seed)
+        if name == 'simulator':
+            routing, wavelength, rwa = parse_algorithm(sim_algorithm)
+            config = SimulationConfig(topology=topology, channels=num_ch,
+                                      routing=routing, wavelength=wavelength,
+                                      rwa=rwa, k=k, loads=(sim_load,),
+                                      calls=sim_calls, seed=seed,
+                                      packed=packed)
+            simulator = Simulator(config)
+            results[case] = time_operation(simulator.run, repeat) / sim_calls
+        else:
+            net = get_net_instance_from_args(topology, num_ch)
+            if packed:
+                net.pack()
+            occupy(net, occupancy, np.random.default_rng(seed))
+            results[case] = time_operation(_operation(name, net, k), repeat)
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float],
+            threshold: float) -> List[str]:
+    """Finds the cases that got slower than a baseline
+
+    Args:
+        results: time per operation, keyed by case identifier
+        baseline: time per operation, keyed by case identifier, as saved by
+            a previous run
+        threshold: tolerated slowdown, relative to the baseline
+
+    Returns:
+        :obj:`list`: identifiers of the cases whose time per operation exceeds
+            the baseline's by more than `threshold`. Cases missing from the
+            baseline are ignored
+
+    """
+    return [case for case, latency in results.items()
+            if case in baseline and latency > baseline[case] * (1 + threshold)]
+
+
+def main(argv: Union[Sequence[str], None] = None) -> int:
+    """Command line entry point of the benchmark suite
+
+    Args:
+        argv: command line arguments. Defaults to `sys.argv`
+
+    Returns:
+        :obj:`int`: exit status, i.e., 1 if any case regressed with respect to
+            the baseline, 0 otherwise
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m rwa_wdm.benchmark',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description='Benchmark suite of the RWA algorithms and of the '
+                    'simulation loop')
+    parser.add_argument('-t', nargs='+', dest='topologies',
+                        default=['nsf', 'clara', 'janet', 'rnp'],
+                        metavar='<topology>',
+                        help='network topologies, either built-in ones, '
+                             'files or synthetic ones, e.g., grid:32x32 or '
+                             'waxman:1000,seed=1')
+    parser.add_argument('-c', nargs='+', type=int, dest='channels',
+                        default=[8, 16, 32, 64, 128, 256],
+                        metavar='<channels>', help='numbers of λ per link')
+    parser.add_argument('-o', nargs='+', type=float, dest='occupancies',
+                        default=[0.25, 0.5, 0.75], metavar='<occupancy>',
+                        help='fractions of busy channels')
+    parser.add_argument('--ops', nargs='+', default=list(OPERATIONS),
+                        choices=OPERATIONS, metavar='<operation>',
+                        help='operations to time, out of %s'
+                             % ', '.join(OPERATIONS))
+    parser.add_argument('-y', type=int, default=2, metavar='<yen-alt-paths>',
+                        help='number of routing alternate paths (Yen\'s)')
+    parser.add_argument('--repeat', type=int, default=3, metavar='<rounds>',
+                        help='number of timing rounds per case')
+    parser.add_argument('--seed', type=int, default=0, metavar='<seed>',
+                        help='seed for random number generators')
+    parser.add_argument('--sim-algorithm', default='dijkstra_first-fit',
+                        metavar='<algorithm>',
+                        help='algorithm to time the simulation loop with')
+    parser.add_argument('--sim-load', type=float, default=10,
+                        metavar='<load>',
+                        help='network load the simulation runs at')
+    parser.add_argument('--sim-calls', type=int, default=2000,
+                        metavar='<conn-requests>',
+                        help='number of calls simulated per timing round')
+    parser.add_argument('--packed', default=False, action='store_true',
+                        help='hold λ availability packed as 64 λ per word')
+    parser.add_argument('--save', default=None, metavar='<json-file>',
+                        help='save results as a baseline to this file')
+    parser.add_argument('--baseline', default=None, metavar='<json-file>',
+                        help='compare results against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        metavar='<rel-slowdown>',
+                        help='tolerated slowdown relative to the baseline')
+    args = parser.parse_args(argv)
+
+    for occupancy in args.occupancies:
+        if not 0 <= occupancy <= 1:
+            parser.error('occupancy levels should lie within [0, 1]')
+
+    baseline = {}
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    results = benchmark(args.topologies, args.channels, args.occupancies,
+                        args.ops, args.y, args.repeat, args.seed,
+                        args.sim_algorithm, args.sim_load, args.sim_calls,
+                        args.packed)
+
+    print('%-40s %12s %12s %9s' % ('Case', 'Latency (us)', 'Ops/s',
+                                   'Ratio'))
+    for case, latency in results.items():
+        ratio = '%9.2f' % (latency / baseline[case]) \
+            if case in baseline else '%9s' % '-'
+        print('%-40s %12.2f %12.1f %s' % (case, 1e6 * latency,
+                                          1.0 / latency, ratio))
+
+    if args.save is not None:
+        logger.info('Writing benchmark results to file "%s"' % args.save)
+        with open(args.save, 'w') as f:
+            json.dump({'version': __version__,
+                       'python': platform.python_version(),
+                       'numpy': np.__version__,
+                       'machine': platform.machine(),
+                       'results': results}, f, indent=2)
+
+    regressions = compare(results, baseline, args.threshold)
+    for case in regressions:
+        logger.error('Regression on %s: %.2fx slower than the baseline'
+                     % (case, results[case] / baseline[case]))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Checkpointing of long simulations, so they can be resumed
+
+"""
+
+import logging
+import os
+import pickle
+from timeit import default_timer
+from typing import Any, Dict, Union
+
+__all__ = (
+    'Checkpoint',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint(object):
+    """Periodic snapshots of a piece of the simulation, stored on disk
+
+    Snapshots are pickled to a temporary file which then atomically replaces
+    the previous one, so a process killed halfway through a save never leaves
+    a corrupt checkpoint behind. Temporary files are named after the process
+    writing them, so processes saving the same checkpoint do not trip over
+    each other.
+
+    Each snapshot is stored along with the identity of its `owner`, e.g.,
+    the parameters of the simulation that took it, so one taken by a
+    different simulation is never resumed from by mistake.
+
+    The simulation loop is expected to ask whether a snapshot is `due` as
+    often as it sees fit, and to `save` its state only when it is, so the
+    cost of checkpointing is bounded by the interval between snapshots.
+
+    Args:
+        path: file to store snapshots in
+        interval: minimum time, in seconds, between two periodic snapshots
+        owner: picklable identity of whatever the snapshots belong to, which
+            must compare equal for a snapshot to be loaded
+
+    """
+
+    def __init__(self, path: str, interval: float = 300.0,
+                 owner: Any = None) -> None:
+        self._path: str = path
+        self._interval: float = interval
+        self._owner: Any = owner
+        self._deadline: float = default_timer() + interval
+
+    @property
+    def path(self) -> str:
+        """The file snapshots are stored in"""
+        return self._path
+
+    def due(self) -> bool:
+        """Checks whether it is time for a periodic snapshot
+
+        Returns:
+            :obj:`bool`: True if `interval` seconds went by since the last
+                snapshot was saved (or since instantiation)
+
+        """
+        return default_timer() >= self._deadline
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Stores a snapshot, replacing the previous one
+
+        Args:
+            state: picklable state of the simulation
+
+        """
+        tmp_path = '%s.%d.tmp' % (self._path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((self._owner, state), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path)
+        self._deadline = default_timer() + self._interval
+
+    def load(self) -> Union[Dict[str, Any], None]:
+        """Retrieves the last snapshot stored
+
+        Returns:
+            :obj:`dict`: state of the simulation, or None if no snapshot has
+                been stored yet
+
+        Raises:
+            ValueError: if the snapshot stored belongs to another owner
+
+        """
+        if not os.path.isfile(self._path):
+            return None
+        logger.info('Loading checkpoint from "%s"' % self._path)
+        with open(self._path, 'rb') as f:
+            snapshot = pickle.load(f)
+        if not isinstance(snapshot, tuple) or len(snapshot) != 2 or \
+                snapshot[0] != self._owner:
+            raise ValueError('Checkpoint "%s" belongs to a different '
+                             'simulation.' % self._path)
+        return snapshot[1]
+
+    def remove(self) -> None:
+        """Deletes the stored snapshot, if any"""
+        if os.path.isfile(self._path):
+            os.remove(self._path)
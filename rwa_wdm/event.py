@@ -0,0 +1,203 @@
+"""Discrete-event scheduling of lightpath departures
+
+"""
+
+import heapq
+import logging
+from itertools import count
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from .net import Lightpath, Network
+
+__all__ = (
+    'DepartureScheduler',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DepartureScheduler(object):
+    """Releases network resources as connections depart, in time order
+
+    The scheduler keeps an absolute simulation clock and a priority queue
+    (binary heap) of departure times. Whenever the clock advances, only the
+    entries whose departure time has already passed are popped from the queue,
+    and the corresponding links and λ channels are freed. That makes the cost
+    of each call proportional to the number of departures and to the length of
+    the routes involved, rather than to the number of links times the number of
+    channels of the network.
+
+    Channels found busy upon instantiation (i.e., the random initial occupancy
+    set up by the `Network` constructor) are scheduled as well, so they depart
+    at the time stored in the network's traffic matrix.
+
+    Lightpaths may be allocated within a transaction of the network (see
+    `Network.begin`). If it is rolled back, their departures are left in the
+    queue but dropped once due, since the lightpaths are no longer running
+    by then. A lightpath rolled back must thus not be allocated again: a
+    fresh one should be created instead.
+
+    The state of both the network's resources and the pending departures can
+    be captured via `snapshot` and brought back via `restore`, which is what
+    checkpointing a running simulation boils down to.
+
+    Args:
+        net: Network instance whose resources are to be managed
+
+    """
+
+    def __init__(self, net: Network) -> None:
+        self._net: Network = net
+        self._clock: float = 0.0
+        self._seq = count(0)  # breaks ties between equal departure times
+        self._queue: List[Tuple[float, int, Union[Lightpath, None],
+                                np.ndarray, int]] = []
+
+        for link, w in zip(*np.nonzero(np.logical_not(net.n))):
+            self._push(float(net.t[link, w]), None, np.array([link]), int(w))
+
+    @property
+    def clock(self) -> float:
+        """The absolute simulation time"""
+        return self._clock
+
+    @property
+    def nevents(self) -> int:
+        """The number of departures still pending"""
+        return len(self._queue)
+
+    def _push(self, departure: float, lightpath: Union[Lightpath, None],
+              links: np.ndarray, w: int) -> None:
+        heapq.heappush(self._queue,
+                       (departure, next(self._seq), lightpath, links, w))
+
+    def _route_links(self, lightpath: Lightpath) -> np.ndarray:
+        """Links along the lightpath's route, looked up once and kept"""
+        links = lightpath.link_ids
+        if links is None:
+            links = lightpath.link_ids = self._net.route_links(lightpath.r)
+        return links
+
+    def allocate(self, lightpath: Lightpath) -> None:
+        """Locks the lightpath's resources and schedules its departure
+
+        The lightpath is expected to have its holding time already set. Its
+        departure is scheduled to the current clock plus the holding time,
+        which is also the value written to the traffic matrix on every link
+        along the route.
+
+        Args:
+            lightpath: a Lightpath instance that has been successfully routed
+                and assigned a wavelength
+
+        """
+        departure = self._clock + lightpath.holding_time
+        links = self._route_links(lightpath)
+        self._net.allocate(lightpath, departure)
+        self._push(departure, lightpath, links, lightpath.w)
+
+    def try_allocate(self, lightpath: Lightpath) -> bool:
+        """Allocates the lightpath, as `allocate` does, if its λ is available
+        on every link along the route
+
+        The availability check and the allocation are made at once by the
+        network (see `Network.try_allocate`), so the route is looked up only
+        once.
+
+        Args:
+            lightpath: a Lightpath instance, with its holding time set
+
+        Returns:
+            :obj:`bool`: whether the lightpath was allocated
+
+        """
+        departure = self._clock + lightpath.holding_time
+        links = self._route_links(lightpath)
+        if not self._net.try_allocate(lightpath, departure):
+            return False
+        self._push(departure, lightpath, links, lightpath.w)
+        return True
+
+    def advance(self, dt: float) -> int:
+        """Moves the clock forward and releases connections that departed
+
+        Args:
+            dt: amount of time to move the clock by, typically the time until
+                the next call arrives
+
+        Returns:
+            :obj:`int`: the number of departures processed
+
+        """
+        self._clock += dt
+        return self.release()
+
+    def release(self) -> int:
+        """Frees the resources of every connection whose time is up
+
+        Returns:
+            :obj:`int`: the number of departures processed
+
+        """
+        net = self._net
+        queue = self._queue
+        released = 0
+        while queue and queue[0][0] <= self._clock:
+            departure, _, lightpath, links, w = heapq.heappop(queue)
+            if lightpath is not None:
+                # time's up: remove conn from traffic matrix's list. If it is
+                # not there, its allocation was rolled back (see
+                # `Network.rollback`), so the channel is no longer its own
+                if net.t.remove_lightpath_by_id(lightpath.id) is None:
+                    continue
+            # time's up: free channel on every link, both directions
+            net.release(links, w)
+            released += 1
+        return released
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Captures the state of the network's resources and departures
+
+        The wavelength availability and traffic matrices are copied along with
+        the active lightpaths, the clock and the departure queue.
+
+        Returns:
+            :obj:`dict`: picklable state, to be handed over to `restore`
+
+        """
+        net = self._net
+        seq = next(self._seq)
+        self._seq = count(seq)
+        return {
+            'n': np.array(net.n),
+            't': np.array(net.t),
+            'lightpaths': net.t.lightpaths,
+            'clock': self._clock,
+            'seq': seq,
+            'queue': list(self._queue),
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Brings the network and the departures back to a captured state
+
+        Args:
+            state: state previously returned by `snapshot`
+
+        """
+        net = self._net
+        net.n[...] = state['n']
+        net.t[...] = state['t']
+        net.recount()
+        net.t.clear_lightpaths()
+        for lightpath in state['lightpaths']:
+            net.t.add_lightpath(lightpath)
+        self._clock = state['clock']
+        self._seq = count(state['seq'])
+        self._queue = list(state['queue'])
+
+        # lightpaths created from now on must not reuse the ids of the
+        # restored ones, otherwise the wrong connection could be released
+        last_id = max((lp.id for lp in state['lightpaths']), default=-1)
+        Lightpath._ids = count(max(last_id + 1, next(Lightpath._ids)))
@@ -10,7 +10,10 @@ from typing import List
 import numpy as np
 import matplotlib.pyplot as plt
 
-__all__ = ('write_bp_to_disk', 'write_it_to_disk', 'plot_bp')
+from .profiling import PHASES, PhaseProfile
+
+__all__ = ('write_bp_to_disk', 'write_ci_to_disk', 'write_it_to_disk',
+           'write_loads_to_disk', 'write_profile_to_disk', 'plot_bp')
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +41,32 @@ def write_bp_to_disk(result_dir: str,
         f.write('\n')
 
 
+def write_ci_to_disk(result_dir: str,
+                     filename: str, cilist: List[float]) -> None:
+    """Writes half-widths of blocking probability's confidence intervals
+
+    Each line matches the one written by `write_bp_to_disk` at the same time,
+    so every blocking probability value has its achieved confidence interval
+    stored at the same position of the sibling file.
+
+    Args:
+        result_dir: directory to write files to
+        filename: name of the file to be written
+        cilist: list of half-widths, as percentages, to be dumped to file
+
+    """
+    if not os.path.isdir(result_dir):
+        logger.info('Creating result dir in %s' % result_dir)
+        os.mkdir(result_dir)
+
+    filepath = os.path.join(result_dir, filename)
+    logger.info('Writing confidence intervals to file "%s"' % filepath)
+    with open(filepath, 'a') as f:
+        for ci in cilist:
+            f.write(' %7.3f' % ci)
+        f.write('\n')
+
+
 def write_it_to_disk(result_dir: str,
                      filename: str, itlist: List[float]) -> None:
     """Writes profiling time information to text file
@@ -59,6 +88,65 @@ def write_it_to_disk(result_dir: str,
             f.write(' %7.7f' % it)
 
 
+def write_loads_to_disk(result_dir: str,
+                        filename: str, loads: List[float]) -> None:
+    """Writes the load grid blocking probabilities refer to
+
+    Every column of the sibling file written by `write_bp_to_disk` matches
+    the load at the same position. The file is overwritten rather than
+    appended to, since the grid is the same for every repetition.
+
+    Args:
+        result_dir: directory to write files to
+        filename: name of the file to be written
+        loads: network loads, in Erlangs, to be dumped to file
+
+    """
+    if not os.path.isdir(result_dir):
+        logger.info('Creating result dir in %s' % result_dir)
+        os.mkdir(result_dir)
+
+    filepath = os.path.join(result_dir, filename)
+    logger.info('Writing load grid to file "%s"' % filepath)
+    with open(filepath, 'w') as f:
+        for load in loads:
+            f.write(' %g' % load)
+        f.write('\n')
+
+
+def write_profile_to_disk(result_dir: str,
+                          filename: str, profile: PhaseProfile) -> None:
+    """Writes time per phase and RWA latency percentiles to text file
+
+    One row is written per load, with the number of RWA decisions profiled,
+    the total time, in seconds, spent on each of the phases of the
+    simulation loop, and the 50th, 95th and 99th percentiles of the latency,
+    in seconds, of a single RWA decision. A header line, commented out,
+    names the columns.
+
+    Args:
+        result_dir: directory to write files to
+        filename: name of the file to be written
+        profile: phase profile accumulated over all repetitions
+
+    """
+    if not os.path.isdir(result_dir):
+        logger.info('Creating result dir in %s' % result_dir)
+        os.mkdir(result_dir)
+
+    filepath = os.path.join(result_dir, filename)
+    logger.info('Writing phase profile to file "%s"' % filepath)
+    with open(filepath, 'w') as f:
+        f.write('# load calls %s rwa_p50 rwa_p95 rwa_p99\n' % ' '.join(PHASES))
+        for load in profile.loads:
+            f.write(' %g %d' % (load, profile.ncalls(load)))
+            for phase_time in profile.phase_time(load):
+                f.write(' %.6f' % phase_time)
+            for latency in profile.percentiles(load):
+                f.write(' %.3e' % latency)
+            f.write('\n')
+
+
 def plot_bp(result_dir: str) -> None:
     """Reads blocking probabilities from file and plot overlapping graph
 
@@ -70,13 +158,16 @@ def plot_bp(result_dir: str) -> None:
     for f in glob.glob(os.path.join(result_dir, '*.bp')):
         filelist.append(os.path.basename(f))
         data = np.loadtxt(f)
-        if data.ndim == 1:
-            max_load =  data.shape[0] + 1
-            plt.plot(np.arange(1, max_load), data, '--')
+        mean = data if data.ndim == 1 else data.mean(axis=0)
+
+        # loads are 1, 2, ... Erlangs unless a grid is stored alongside
+        loads_file = os.path.splitext(f)[0] + '.loads'
+        if os.path.isfile(loads_file):
+            loads = np.loadtxt(loads_file, ndmin=1)
         else:
-            max_load =  data.shape[1] + 1
-            plt.plot(np.arange(1, max_load), data.mean(axis=0), '--')
-        plt.xlim(0.5, max_load - 0.5)
+            loads = np.arange(1, mean.shape[0] + 1)
+        plt.plot(loads, mean, '--')
+        plt.xlim(loads[0] - 0.5, loads[-1] + 0.5)
         if data.ndim == 1 or data.shape[0] < 10:
             logger.warning('Remember you should simulate at least 10 times '
                            '(found only %d in %s)' % (data.shape[0], f))
@@ -1,7 +1,10 @@
 from .net import Network, Lightpath
+from .availability import link_availability, path_availability
 from .clara import CooperacionLatinoAmericana
 from .janet import JointAcademicNetwork
 from .nsf import NationalScienceFoundation
 from .rnp import RedeNacionalPesquisa
+from .loader import TopologyFromFile, load_topology
+from .synthetic import SyntheticTopology, generate_topology
 # from .arpa import AdvancedResearchProjectsAgency
 # from .italian import Italian
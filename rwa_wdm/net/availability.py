@@ -0,0 +1,107 @@
+"""Wavelength availability along routes, computed in a single NumPy gather
+
+"""
+
+import logging
+from typing import TYPE_CHECKING, List, Sequence, Union, cast
+
+import numpy as np
+
+from .bitset import PackedWavelengthAvailability
+
+if TYPE_CHECKING:
+    from .net import Network
+
+__all__ = (
+    'link_availability',
+    'path_availability',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def link_availability(net: 'Network', route: Sequence[int]) -> np.ndarray:
+    """Availability of every λ channel on every link of a route
+
+    Args:
+        net: Network object
+        route: path encoded as a sequence of router indices
+
+    Returns:
+        :obj:`np.ndarray`: boolean matrix with a row per link along the route
+            and a column per λ channel. Hops between nodes that are not
+            neighbours, which some RWA algorithms may come up with, have no
+            λ available at all
+
+    """
+    return _gather(net, net.route_links(route))
+
+
+def _gather(net: 'Network', links: np.ndarray) -> np.ndarray:
+    """Rows of the wavelength availability matrix, none for missing links"""
+    n = net.n
+    if isinstance(n, PackedWavelengthAvailability):
+        return n.unpack(n.gather(links))
+    available = np.asarray(n)[links]
+    missing = links < 0
+    if missing.any():
+        available[missing] = False
+    return available
+
+
+def path_availability(net: 'Network',
+                      routes: Union[Sequence[int], Sequence[Sequence[int]]]
+                      ) -> np.ndarray:
+    """Availability of every λ channel along whole routes
+
+    A λ is available along a route if it is available on each and every
+    link of it, as the wavelength continuity constraint demands. All the
+    links of all the routes given are looked up at once, and then reduced
+    route by route via a logical AND, or via a bitwise AND of 64 λs at a
+    time if the network holds its wavelength availability packed.
+
+    Args:
+        net: Network object
+        routes: either a single path or a sequence of paths, each one
+            encoded as a sequence of router indices
+
+    Returns:
+        :obj:`np.ndarray`: boolean mask of the λ channels available along the
+            route, or boolean matrix with such a mask per route. Routes of a
+            single node, having no links, have every λ available
+
+    """
+    n = net.n
+    if len(routes) and isinstance(routes[0], (int, np.integer)):
+        route = cast(Sequence[int], routes)
+        if isinstance(n, PackedWavelengthAvailability):
+            return n.unpack(n.path(net.route_links(route)))
+        return np.all(link_availability(net, route), axis=0)
+
+    # routes with no links at all, i.e., of a single node, have every λ
+    # available, and are kept out of the reduction, which needs at least one
+    # link per route
+    sources: List[int] = []
+    targets: List[int] = []
+    starts: List[int] = []
+    linked: List[int] = []
+    paths = cast(Sequence[Sequence[int]], routes)
+    for index, route in enumerate(paths):
+        if len(route) < 2:
+            continue
+        linked.append(index)
+        starts.append(len(sources))
+        sources.extend(route[:-1])
+        targets.extend(route[1:])
+    if len(linked) < len(paths):
+        available = np.ones((len(paths), net.nchannels), dtype=bool)
+        if linked:
+            available[linked] = path_availability(
+                net, [paths[index] for index in linked])
+        return available
+    if not starts:
+        return np.zeros((0, net.nchannels), dtype=bool)
+    links = net.lookup_links(sources, targets)
+    if isinstance(n, PackedWavelengthAvailability):
+        return n.unpack(n.paths(links, starts))
+    return np.logical_and.reduceat(_gather(net, links), starts, axis=0)
@@ -0,0 +1,252 @@
+"""Bit-packed wavelength availability, with word-level operations
+
+"""
+
+import copy
+import logging
+from typing import Sequence, Union
+
+import numpy as np
+
+__all__ = (
+    'PackedWavelengthAvailability',
+    'pack_bits',
+    'unpack_bits',
+    'first_set_bit',
+    'popcount',
+    'random_set_bit',
+)
+
+logger = logging.getLogger(__name__)
+
+WORD_BITS = 64
+
+# number of bits set in each possible byte
+_POPCOUNT8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis],
+                           axis=1).sum(axis=1)
+
+# word with only the bit at each position set, and with all but that one set
+_BIT_MASKS = np.left_shift(np.uint64(1), np.arange(WORD_BITS, dtype=np.uint64))
+_CLEAR_MASKS = ~_BIT_MASKS
+
+# up to this many links, words are written one by one rather than through
+# fancy indexing, whose overhead only pays off over longer routes
+_SCALAR_LINKS = 4
+
+
+def pack_bits(mask: np.ndarray) -> np.ndarray:
+    """Packs booleans into 64-bit words along the last axis
+
+    Bit `w` is stored at position `w % 64` of word `w // 64`, the least
+    significant bit being position 0.
+
+    Args:
+        mask: boolean array
+
+    Returns:
+        :obj:`np.ndarray`: little-endian unsigned 64-bit words
+
+    """
+    mask = np.asarray(mask, dtype=bool)
+    num_words = -(-mask.shape[-1] // WORD_BITS)
+    padded = np.zeros(mask.shape[:-1] + (num_words * WORD_BITS,), dtype=bool)
+    padded[..., :mask.shape[-1]] = mask
+    return np.packbits(padded, axis=-1, bitorder='little').view('<u8')
+
+
+def unpack_bits(words: np.ndarray, num_bits: int) -> np.ndarray:
+    """Unpacks 64-bit words into booleans along the last axis
+
+    Args:
+        words: little-endian unsigned 64-bit words, as packed by `pack_bits`
+        num_bits: number of booleans to unpack
+
+    Returns:
+        :obj:`np.ndarray`: boolean array
+
+    """
+    words = np.ascontiguousarray(words, dtype='<u8')
+    bits = np.unpackbits(words.view(np.uint8), axis=-1, bitorder='little')
+    return bits[..., :num_bits].view(bool)
+
+
+def popcount(words: np.ndarray) -> int:
+    """Number of bits set
+
+    Args:
+        words: little-endian unsigned 64-bit words
+
+    Returns:
+        :obj:`int`: number of bits set across all words
+
+    """
+    words = np.ascontiguousarray(words, dtype='<u8')
+    return int(_POPCOUNT8[words.view(np.uint8)].sum())
+
+
+def first_set_bit(words: np.ndarray) -> Union[int, None]:
+    """Index of the lowest bit set
+
+    Args:
+        words: 1D array of little-endian unsigned 64-bit words
+
+    Returns:
+        :obj:`int`: bit index, or None if no bit is set
+
+    """
+    nonzero = np.flatnonzero(words)
+    if not len(nonzero):
+        return None
+    word = int(words[nonzero[0]])
+    return int(nonzero[0]) * WORD_BITS + (word & -word).bit_length() - 1
+
+
+def random_set_bit(words: np.ndarray) -> Union[int, None]:
+    """Index of a bit set, chosen uniformly at random
+
+    Draws from NumPy's global RNG exactly as `np.random.choice` over the
+    indices of the bits set would, so both ways pick the very same bit.
+
+    Args:
+        words: 1D array of little-endian unsigned 64-bit words
+
+    Returns:
+        :obj:`int`: bit index, or None if no bit is set
+
+    """
+    words = np.ascontiguousarray(words, dtype='<u8')
+    bits = np.flatnonzero(np.unpackbits(words.view(np.uint8),
+                                        bitorder='little').view(bool))
+    if not len(bits):
+        return None
+    return int(bits[np.random.randint(len(bits))])
+
+
+class PackedWavelengthAvailability(object):
+    """Link-indexed wavelength availability, packed as 64 λs per word
+
+    Holds the same information as a `WavelengthAvailabilityMatrix`, i.e., a
+    row per link and a bit per λ channel, so intersecting the availability
+    of the links along a route takes one bitwise AND per word rather than
+    one per channel. The matrix can still be written to with the usual
+    ``n[links, w] = value`` and ``n[...] = matrix`` statements, read from
+    with ``n[links, w]``, and turned into a boolean one via `np.asarray`.
+
+    Args:
+        mat: boolean matrix, with a row per link and a column per λ channel
+
+    """
+
+    def __init__(self, mat: np.ndarray) -> None:
+        mat = np.asarray(mat, dtype=bool)
+        self._num_channels: int = mat.shape[1]
+        self._words: np.ndarray = pack_bits(mat)
+
+    @property
+    def shape(self):
+        """Number of links and number of λ channels"""
+        return self._words.shape[0], self._num_channels
+
+    @property
+    def words(self) -> np.ndarray:
+        """The packed words, with a row per link"""
+        return self._words
+
+    def copy(self) -> 'PackedWavelengthAvailability':
+        """A copy of the matrix, not sharing its words"""
+        packed = copy.copy(self)
+        packed._words = self._words.copy()
+        return packed
+
+    def __array__(self, dtype=None) -> np.ndarray:
+        mat = unpack_bits(self._words, self._num_channels)
+        return mat if dtype is None else mat.astype(dtype)
+
+    def __getitem__(self, key) -> np.ndarray:
+        links, w = key
+        word, bit = divmod(int(w), WORD_BITS)
+        return self._words[links, word] & _BIT_MASKS[bit] != 0
+
+    def __setitem__(self, key, value) -> None:
+        if key is Ellipsis:
+            self._words[...] = pack_bits(
+                np.broadcast_to(np.asarray(value, dtype=bool), self.shape))
+            return
+        links, w = key
+        word, bit = divmod(int(w), WORD_BITS)
+        words = self._words
+        if type(links) is np.ndarray and links.ndim == 1 and \
+                len(links) <= _SCALAR_LINKS:
+            if value:
+                mask = _BIT_MASKS[bit]
+                for link in links.tolist():
+                    words[link, word] |= mask
+            else:
+                mask = _CLEAR_MASKS[bit]
+                for link in links.tolist():
+                    words[link, word] &= mask
+        elif value:
+            words[links, word] |= _BIT_MASKS[bit]
+        else:
+            words[links, word] &= _CLEAR_MASKS[bit]
+
+    def available(self, links: np.ndarray, w: int) -> bool:
+        """Whether a single λ is available on every link of a sequence
+
+        Only the word holding λ is looked at on each link, rather than all
+        of them as `path` does.
+
+        Args:
+            links: link identifiers, none of them missing (-1)
+            w: wavelength channel index
+
+        Returns:
+            :obj:`bool`: True if the bit of λ is set on every link
+
+        """
+        word, bit = divmod(int(w), WORD_BITS)
+        mask = _BIT_MASKS[bit]
+        words = self._words
+        if len(links) <= _SCALAR_LINKS:
+            for link in links.tolist():
+                if not words[link, word] & mask:
+                    return False
+            return True
+        return bool(np.bitwise_and.reduce(words[links, word]) & mask)
+
+    def gather(self, links: np.ndarray) -> np.ndarray:
+        """Words of a sequence of links, none set for missing links (-1)"""
+        words = self._words[links]
+        missing = links < 0
+        if missing.any():
+            words[missing] = 0
+        return words
+
+    def path(self, links: np.ndarray) -> np.ndarray:
+        """Words of the λs available along all links of a route
+
+        Args:
+            links: link identifiers along the route
+
+        Returns:
+            :obj:`np.ndarray`: bitwise AND of the links' words
+
+        """
+        return np.bitwise_and.reduce(self.gather(links), axis=0)
+
+    def paths(self, links: np.ndarray, starts: Sequence[int]) -> np.ndarray:
+        """Words of the λs available along each of several routes
+
+        Args:
+            links: link identifiers along all routes, one after the other
+            starts: index within `links` where each route starts
+
+        Returns:
+            :obj:`np.ndarray`: bitwise AND of the links' words, per route
+
+        """
+        return np.bitwise_and.reduceat(self.gather(links), starts, axis=0)
+
+    def unpack(self, words: np.ndarray) -> np.ndarray:
+        """Boolean mask of λ channels out of words of this matrix"""
+        return unpack_bits(words, self._num_channels)
@@ -0,0 +1,434 @@
+"""Network topologies loaded from files, with a preprocessed binary cache
+
+Topologies can be described in either JSON or GML. A JSON description lists
+the nodes, optionally with their coordinates, and the links between them,
+referring to nodes by their identifiers:
+
+.. code-block:: json
+
+    {
+        "name": "ring4",
+        "fullname": "Ring of four nodes",
+        "nodes": [{"id": "a", "pos": [0, 0]}, {"id": "b", "pos": [1, 0]},
+                  {"id": "c", "pos": [1, 1]}, {"id": "d", "pos": [0, 1]}],
+        "edges": [["a", "b"], ["b", "c"], ["c", "d"], ["d", "a"]],
+        "source": "a",
+        "destination": "c"
+    }
+
+Nodes may also be given as plain identifiers rather than objects. GML files,
+such as the ones of the Internet Topology Zoo, are read via NetworkX, taking
+coordinates from either "x" and "y" or "Longitude" and "Latitude" node
+attributes, and source and destination nodes from "source" and
+"destination" graph attributes. Links are undirected: repeated links and
+self-loops are dropped.
+
+Parsing is done once per file. The topology is then compiled into NumPy
+arrays, i.e., links as pairs of node indices, node coordinates, and
+neighbour lists in compressed sparse row (CSR) form along with the
+identifier of the link to each neighbour, which are saved to a cache
+directory under the hash of the file's contents. Loading the same file
+again, even from another path, reads the arrays back instead.
+
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from .net import Network, compile_links
+
+__all__ = (
+    'CompiledTopology',
+    'TopologyFromFile',
+    'compile_topology',
+    'read_topology',
+    'load_topology',
+    'is_topology_file',
+)
+
+logger = logging.getLogger(__name__)
+
+# bumped whenever the layout of cached arrays changes, so stale caches are
+# simply not found rather than misread
+CACHE_VERSION = 2
+
+EXTENSIONS = ('.json', '.gml')
+
+
+class CompiledTopology(object):
+    """Preprocessed form of a network topology, as NumPy arrays
+
+    Args:
+        name: short name tag identifier of the topology
+        fullname: descriptive name of the topology
+        labels: identifier of each node, as found in the file
+        pos: coordinates of each node, as a N x 2 matrix
+        edges: links as pairs of node indices, the lowest one first, as a
+            E x 2 matrix. The row of a link is its identifier
+        source: index of the source node
+        destination: index of the destination node
+
+    """
+
+    def __init__(self, name: str, fullname: str, labels: np.ndarray,
+                 pos: np.ndarray, edges: np.ndarray, source: int,
+                 destination: int) -> None:
+        self.name: str = name
+        self.fullname: str = fullname
+        self.labels: np.ndarray = labels
+        self.pos: np.ndarray = pos
+        self.edges: np.ndarray = edges
+        self.source: int = source
+        self.destination: int = destination
+
+        # neighbour lists in CSR form, both directions of each link
+        # included, sorted by node and then by neighbour
+        self.indptr, self.indices, self.link_ids = compile_links(
+            edges, len(labels))
+
+    @property
+    def nnodes(self) -> int:
+        """The number of nodes"""
+        return len(self.labels)
+
+    @property
+    def nlinks(self) -> int:
+        """The number of links"""
+        return len(self.edges)
+
+    def neighbours(self, node: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Neighbours of a node and the links to them
+
+        Args:
+            node: node index
+
+        Returns:
+            :obj:`tuple`: indices of the neighbouring nodes, in ascending
+                order, and identifiers of the links leading to each of them
+
+        """
+        begin, end = self.indptr[node], self.indptr[node + 1]
+        return self.indices[begin:end], self.link_ids[begin:end]
+
+    def save(self, path: str) -> None:
+        """Writes the arrays to a NumPy archive, atomically"""
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp, 'wb') as f:
+            np.savez(f, version=CACHE_VERSION, name=self.name,
+                     fullname=self.fullname, labels=self.labels,
+                     pos=self.pos, edges=self.edges,
+                     endpoints=(self.source, self.destination),
+                     indptr=self.indptr, indices=self.indices,
+                     link_ids=self.link_ids)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledTopology':
+        """Reads the arrays back from a NumPy archive written by `save`
+
+        Raises:
+            ValueError: if the archive was written by another version
+
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            if int(arrays['version']) != CACHE_VERSION:
+                raise ValueError('Topology cache "%s" is of another version'
+                                 % path)
+            topology = cls.__new__(cls)
+            topology.name = str(arrays['name'])
+            topology.fullname = str(arrays['fullname'])
+            topology.labels = arrays['labels']
+            topology.pos = arrays['pos']
+            topology.edges = arrays['edges']
+            topology.source, topology.destination = \
+                arrays['endpoints'].tolist()
+            topology.indptr = arrays['indptr']
+            topology.indices = arrays['indices']
+            topology.link_ids = arrays['link_ids']
+        return topology
+
+
+class TopologyFromFile(Network):
+    """Network whose topology was loaded from a file (see `load_topology`)
+
+    The network is built straight out of the compiled arrays, i.e., links
+    and CSR neighbour lists, as they come out of the cache.
+
+    Args:
+        topology: compiled topology
+        ch_n: number of wavelength channels per link
+
+    """
+
+    def __init__(self, topology: CompiledTopology, ch_n: int) -> None:
+        self._topology = topology
+        self._name = topology.name
+        self._fullname = topology.fullname
+        self._s = topology.source
+        self._d = topology.destination
+        super().__init__(ch_n, topology.nnodes, topology.nlinks)
+
+    @property
+    def topology(self) -> CompiledTopology:
+        """The compiled topology, with its CSR neighbour lists"""
+        return self._topology
+
+    def get_edges(self) -> List[Tuple[int, int]]:
+        """Get edges as a list of tuples of pairs of nodes"""
+        return [tuple(edge) for edge in self._topology.edges.tolist()]
+
+    def get_edge_array(self) -> np.ndarray:
+        """Get edges as compiled, with no conversion at all"""
+        return self._topology.edges
+
+    def get_links_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get neighbour lists and link identifiers as compiled, and cached
+        along with the topology"""
+        return (self._topology.indptr, self._topology.indices,
+                self._topology.link_ids)
+
+    def get_nodes_2D_pos(self) -> Dict[str, Tuple[float, float]]:
+        """Get position of the nodes on the bidimensional Cartesian plan"""
+        return OrderedDict(zip(self._topology.labels.tolist(),
+                               map(tuple, self._topology.pos.tolist())))
+
+
+def is_topology_file(topname: str) -> bool:
+    """Whether a topology identifier refers to a file rather than to one of
+    the built-in topologies"""
+    return os.path.splitext(topname)[1].lower() in EXTENSIONS
+
+
+def _read_json(path: str) -> Tuple[List, Dict, List, Dict]:
+    """Nodes, coordinates, links and attributes out of a JSON description"""
+    with open(path) as f:
+        desc = json.load(f)
+    nodes, pos = [], {}
+    for node in desc.get('nodes', []):
+        if isinstance(node, dict):
+            nodes.append(node['id'])
+            if 'pos' in node:
+                pos[node['id']] = tuple(node['pos'])
+            elif 'x' in node and 'y' in node:
+                pos[node['id']] = (node['x'], node['y'])
+        else:
+            nodes.append(node)
+    edges = [tuple(edge[:2]) for edge in desc.get('edges', [])]
+    if not nodes:
+        # nodes may be implied by the links alone
+        nodes = list(OrderedDict.fromkeys(node for edge in edges
+                                          for node in edge))
+    return nodes, pos, edges, desc
+
+
+def _read_gml(path: str) -> Tuple[List, Dict, List, Dict]:
+    """Nodes, coordinates, links and attributes out of a GML file"""
+    import networkx as nx
+
+    graph = nx.read_gml(path, label='id')
+    nodes, pos = list(graph.nodes), {}
+    for node, attrs in graph.nodes(data=True):
+        if 'x' in attrs and 'y' in attrs:
+            pos[node] = (attrs['x'], attrs['y'])
+        elif 'Longitude' in attrs and 'Latitude' in attrs:
+            pos[node] = (attrs['Longitude'], attrs['Latitude'])
+    edges = [(i, j) for i, j in graph.edges()]
+    return nodes, pos, edges, graph.graph
+
+
+def read_topology(path: str) -> CompiledTopology:
+    """Parses a topology file and compiles it, bypassing the cache
+
+    Args:
+        path: JSON or GML file describing the topology
+
+    Returns:
+        CompiledTopology: the topology as NumPy arrays
+
+    Raises:
+        ValueError: if the file is not a valid topology description
+
+    """
+    return _name_after(_compile_file(path), path)
+
+
+def _compile_file(path: str) -> CompiledTopology:
+    """Parses and compiles a topology file, leaving the names the file
+    does not give empty, since they depend on its path and not its contents
+    """
+    ext = os.path.splitext(path)[1]
+    if ext.lower() == '.json':
+        nodes, pos, edges, attrs = _read_json(path)
+    elif ext.lower() == '.gml':
+        nodes, pos, edges, attrs = _read_gml(path)
+    else:
+        raise ValueError('Expect a topology file ending in %s'
+                         % ' or '.join(EXTENSIONS))
+    return compile_topology(nodes, edges, pos,
+                            attrs.get('source'), attrs.get('destination'),
+                            str(attrs.get('name', '')),
+                            str(attrs.get('fullname',
+                                          attrs.get('label', ''))))
+
+
+def _name_after(topology: CompiledTopology, path: str) -> CompiledTopology:
+    """Names a topology after its file, unless the file names it"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    topology.name = topology.name or stem
+    topology.fullname = topology.fullname or stem
+    return topology
+
+
+def compile_topology(nodes: List, edges: List[Tuple],
+                     pos: Union[Dict, None] = None, source=None,
+                     destination=None, name: str = 'topology',
+                     fullname: Union[str, None] = None) -> CompiledTopology:
+    """Compiles a topology given as lists of nodes and links
+
+    Args:
+        nodes: node identifiers, of any hashable type, in the order nodes
+            are to be indexed
+        edges: links as pairs of node identifiers, in the order links are to
+            be identified. Repeated links and self-loops are dropped
+        pos: coordinates of nodes, by identifier. Either all nodes have
+            coordinates, or none, in which case they are laid out in a circle
+        source: identifier of the source node. Defaults to the first node
+        destination: identifier of the destination node. Defaults to the
+            node the most hops away from the source, the first one in case
+            of ties
+        name: short name tag identifier of the topology
+        fullname: descriptive name of the topology. Defaults to `name`
+
+    Returns:
+        CompiledTopology: the topology as NumPy arrays
+
+    Raises:
+        ValueError: if the topology is empty, refers to unknown nodes or is
+            not connected
+
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+    if len(index) < 2:
+        raise ValueError('Expect a topology of at least two nodes')
+    if len(index) < len(nodes):
+        raise ValueError('Expect unique node identifiers')
+    try:
+        pairs = np.array([(index[i], index[j]) for i, j in edges],
+                         dtype=np.int64).reshape(-1, 2)
+        source = index[source] if source is not None else 0
+        destination = index[destination] if destination is not None \
+            else None
+    except KeyError as e:
+        raise ValueError('No node "%s" in the topology' % e.args[0])
+
+    loops = pairs[:, 0] == pairs[:, 1]
+    if loops.any():
+        logger.warning('Dropping %d self-loops' % np.count_nonzero(loops))
+        pairs = pairs[~loops]
+    pairs = np.sort(pairs, axis=1)
+    _, first = np.unique(pairs, axis=0, return_index=True)
+    if len(first) < len(pairs):
+        logger.warning('Dropping %d repeated links'
+                       % (len(pairs) - len(first)))
+    pairs = pairs[np.sort(first)]
+
+    if pos:
+        missing = [node for node in nodes if node not in pos]
+        if missing:
+            raise ValueError('No coordinates for node "%s"' % missing[0])
+        coords = np.array([pos[node] for node in nodes], dtype=np.float64)
+    else:
+        angles = 2 * np.pi * np.arange(len(nodes)) / len(nodes)
+        coords = np.column_stack((1 + np.cos(angles), 1 + np.sin(angles)))
+
+    topology = CompiledTopology(
+        name, fullname if fullname is not None else name,
+        np.array([str(node) for node in nodes]), coords, pairs, source, 0)
+
+    # breadth-first search over the CSR neighbour lists, from the source
+    hops = np.full(topology.nnodes, -1, dtype=np.int64)
+    hops[source] = 0
+    frontier = [source]
+    while frontier:
+        following = []
+        for node in frontier:
+            neighbours, _ = topology.neighbours(node)
+            fresh = neighbours[hops[neighbours] < 0]
+            hops[fresh] = hops[node] + 1
+            following.extend(fresh.tolist())
+        frontier = following
+    if (hops < 0).any():
+        raise ValueError('Expect a connected topology, but node "%s" cannot '
+                         'be reached' % nodes[int(np.argmin(hops))])
+    if destination is None:
+        destination = int(np.argmax(hops))
+    if destination == source:
+        raise ValueError('Expect distinct source and destination nodes')
+    topology.destination = destination
+    return topology
+
+
+def _cache_dir() -> str:
+    """Default directory to cache compiled topologies in"""
+    if 'RWA_WDM_CACHE' in os.environ:
+        return os.environ['RWA_WDM_CACHE']
+    base = os.environ.get('XDG_CACHE_HOME',
+                          os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'rwa_wdm')
+
+
+def load_topology(path: str, ch_n: int,
+                  cache_dir: Union[str, None] = None) -> TopologyFromFile:
+    """Instantiates a network whose topology is described in a file
+
+    The compiled topology is looked up in the cache first, under the
+    SHA-256 hash of the file's contents, and the file is only parsed if not
+    found, its compiled form then being cached. A cache that cannot be
+    written to is not an error: the topology is just compiled again next
+    time. Names are not taken from the cache unless the file itself gives
+    them, so identical files under different paths are named each after
+    its own.
+
+    Args:
+        path: JSON or GML file describing the topology
+        ch_n: number of wavelength channels per link
+        cache_dir: directory to cache compiled topologies in. Defaults to
+            $RWA_WDM_CACHE, or else to "rwa_wdm" under the user's cache
+            directory
+
+    Returns:
+        TopologyFromFile: network topology instance
+
+    Raises:
+        ValueError: if the file is not a valid topology description
+
+    """
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    if cache_dir is None:
+        cache_dir = _cache_dir()
+    cached = os.path.join(cache_dir, '%s.v%d.npz' % (digest, CACHE_VERSION))
+
+    topology = None
+    if os.path.isfile(cached):
+        try:
+            topology = CompiledTopology.load(cached)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning('Ignoring unreadable topology cache "%s": %s'
+                           % (cached, e))
+    if topology is None:
+        logger.info('Compiling topology "%s"' % path)
+        topology = _compile_file(path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            topology.save(cached)
+        except OSError as e:
+            logger.warning('Could not cache topology to "%s": %s'
+                           % (cached, e))
+    return TopologyFromFile(_name_after(topology, path), ch_n)
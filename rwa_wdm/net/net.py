@@ -4,16 +4,25 @@
 
 __author__ = 'Cassio Batista'
 
+import copy
 import logging
 from itertools import count
 from operator import itemgetter
-from typing import Iterable, List, Tuple
+from typing import (TYPE_CHECKING, Dict, Iterable, Iterator, List, Sequence,
+                    Tuple, Union)
 
 import numpy as np
 import matplotlib.pyplot as plt
 
+from .bitset import PackedWavelengthAvailability
+
+if TYPE_CHECKING:
+    from ..rwa.routing import RouteTable
+
 __all__ = (
+    'compile_links',
     'Lightpath',
+    'ConnectionTable',
     'AdjacencyMatrix',
     'WavelengthAvailabilityMatrix',
     'TrafficMatrix',
@@ -23,6 +32,34 @@ __all__ = (
 logger = logging.getLogger(__name__)
 
 
+def compile_links(edges: np.ndarray, num_nodes: int
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Neighbour lists of a topology in compressed sparse row (CSR) form
+
+    Both directions of each link are included, sorted by node and then by
+    neighbour, along with the identifier of the link to each neighbour.
+
+    Args:
+        edges: links as pairs of node indices, as a E x 2 matrix. The row of
+            a link is its identifier
+        num_nodes: number of nodes
+
+    Returns:
+        :obj:`tuple`: offsets of each node's neighbours (`indptr`), the
+            neighbours themselves (`indices`) and the identifiers of the
+            links to them (`link_ids`)
+
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    heads = np.concatenate((edges[:, 0], edges[:, 1]))
+    tails = np.concatenate((edges[:, 1], edges[:, 0]))
+    links = np.concatenate((np.arange(len(edges)),) * 2)
+    order = np.lexsort((tails, heads))
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(heads, minlength=num_nodes), out=indptr[1:])
+    return indptr, tails[order], links[order]
+
+
 class Lightpath(object):
     """Emulates a lightpath composed by a route and a wavelength channel
 
@@ -35,20 +72,31 @@ class Lightpath(object):
     on network links, and therefore taking up space in the traffic matrix,
     before it finally terminates and resources are deallocated.
 
+    Attributes are laid out in slots rather than in a dictionary, since
+    hundreds of lightpaths may be running at once. The identifiers of the
+    links along the route (see `Network.route_links`) are kept along with
+    it, so they are looked up only once, either upon instantiation or when
+    the lightpath is first allocated.
+
     Args:
         route: a liste of nodes encoded as integer indices
         wavelength: a single number representing the wavelength channel index
+        link_ids: identifiers of the links along the route, if already known
 
     """
 
+    __slots__ = ('_id', '_route', '_wavelength', '_holding_time', '_link_ids')
+
     # https://stackoverflow.com/questions/8628123/counting-instances-of-a-class
     _ids = count(0)
 
-    def __init__(self, route: List[int], wavelength: int):
+    def __init__(self, route: List[int], wavelength: int,
+                 link_ids: Union[np.ndarray, None] = None) -> None:
         self._id: int = next(self._ids)
         self._route: List[int] = route
         self._wavelength: int = wavelength
         self._holding_time: float = 0.0
+        self._link_ids: Union[np.ndarray, None] = link_ids
 
     @property
     def id(self) -> int:
@@ -60,17 +108,21 @@ class Lightpath(object):
         """The path as a sequence of router indices"""
         return self._route
 
-    # https://stackoverflow.com/questions/5389507/iterating-over-every-two-elements-in-a-list
     # pairwise: https://docs.python.org/3/library/itertools.html
     @property
     def links(self) -> Iterable[Tuple[int, int]]:
-        """Network links as a sequence of pairs of nodes"""
-        iterable = iter(self._route)
-        while True:
-            try:
-                yield next(iterable), next(iterable)
-            except StopIteration:
-                return
+        """Network links as a sequence of pairs of consecutive nodes"""
+        return zip(self._route[:-1], self._route[1:])
+
+    @property
+    def link_ids(self) -> Union[np.ndarray, None]:
+        """Identifiers of the links along the route, or None if not known
+        yet"""
+        return self._link_ids
+
+    @link_ids.setter
+    def link_ids(self, link_ids: np.ndarray) -> None:
+        self._link_ids = link_ids
 
     @property
     def w(self) -> int:
@@ -93,6 +145,104 @@ class Lightpath(object):
         return '%s %d' % (self._route, self._wavelength)
 
 
+class ConnectionTable(object):
+    """Table of the connections (lightpaths) currently running
+
+    Every lightpath takes up a slot of the table, which is looked up by the
+    lightpath's identifier, so adding and removing lightpaths takes constant
+    time regardless of how many are running. Slots freed by departed
+    lightpaths are handed out again to the next ones, so the table does not
+    grow beyond the largest number of lightpaths ever running at once.
+
+    """
+
+    __slots__ = ('_slots', '_free', '_index')
+
+    def __init__(self) -> None:
+        self._slots: List[Union[Lightpath, None]] = []
+        self._free: List[int] = []  # stack of vacant slots
+        self._index: Dict[int, int] = {}  # slot of each lightpath, by id
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, _id: int) -> bool:
+        return _id in self._index
+
+    def __iter__(self) -> Iterator[Lightpath]:
+        # a list, so lightpaths may be removed while iterating
+        return iter(self.lightpaths())
+
+    def lightpaths(self) -> List[Lightpath]:
+        """The lightpaths running, in order of the slots they take up"""
+        return [lp for lp in self._slots if lp is not None]
+
+    def slot(self, _id: int) -> int:
+        """Slot taken up by a lightpath
+
+        Raises:
+            KeyError: if no lightpath of such identifier is running
+
+        """
+        return self._index[_id]
+
+    def add(self, lightpath: Lightpath) -> int:
+        """Puts a lightpath into a vacant slot
+
+        Args:
+            lightpath: a Lightpath instance
+
+        Returns:
+            :obj:`int`: the slot taken up by the lightpath
+
+        Raises:
+            ValueError: if the lightpath is already in the table
+
+        """
+        if lightpath.id in self._index:
+            raise ValueError('Lightpath %d is already running' % lightpath.id)
+        if self._free:
+            slot = self._free.pop()
+            self._slots[slot] = lightpath
+        else:
+            slot = len(self._slots)
+            self._slots.append(lightpath)
+        self._index[lightpath.id] = slot
+        return slot
+
+    def remove(self, _id: int) -> Union[Lightpath, None]:
+        """Vacates the slot of a lightpath
+
+        Args:
+            _id: the unique identifier of a lightpath
+
+        Returns:
+            Lightpath: the lightpath removed, or None if it was not running
+
+        """
+        slot = self._index.pop(_id, None)
+        if slot is None:
+            return None
+        lightpath = self._slots[slot]
+        self._slots[slot] = None
+        self._free.append(slot)
+        return lightpath
+
+    def clear(self) -> None:
+        """Removes every lightpath at once"""
+        self._slots.clear()
+        self._free.clear()
+        self._index.clear()
+
+    def copy(self) -> 'ConnectionTable':
+        """A copy of the table, sharing the lightpaths themselves"""
+        table = ConnectionTable()
+        table._slots = list(self._slots)
+        table._free = list(self._free)
+        table._index = dict(self._index)
+        return table
+
+
 class AdjacencyMatrix(np.ndarray):
     """Boolean 2D matrix that stores network neighbourhood info
 
@@ -107,8 +257,7 @@ class AdjacencyMatrix(np.ndarray):
     """
 
     def __new__(cls, num_nodes: int):
-        arr = np.zeros((num_nodes, num_nodes))
-        obj = np.asarray(arr, dtype=np.bool).view(cls)
+        obj = np.zeros((num_nodes, num_nodes), dtype=bool).view(cls)
 
         return obj
 
@@ -118,23 +267,24 @@ class AdjacencyMatrix(np.ndarray):
 
 
 class WavelengthAvailabilityMatrix(np.ndarray):
-    """Boolean 3D matrix that stores network wavelength availability info
+    """Boolean 2D matrix that stores network wavelength availability info
 
-    The wavelength availability matrix is a tridimensional, binary matrix that
+    The wavelength availability matrix is a bidimensional, binary matrix that
     stores information on whether a particular wavelength λ is available on an
-    optical link (i, j). This class is a subclass of a NumPy array.
+    optical link, rows being indexed by link identifier (see `Network.link`)
+    rather than by pairs of nodes, so both directions of a link share a
+    single row. This class is a subclass of a NumPy array.
 
     Args:
-        num_nodes: number of nodes in the network, which defines two of the
-            matrix's dimensions
-        num_ch: number of wavelength channels on each link, defining the shape
-            of the third dimension of the matrix
+        num_links: number of links in the network, which defines the number
+            of rows of the matrix
+        num_ch: number of wavelength channels on each link, defining the
+            number of columns of the matrix
 
     """
 
-    def __new__(cls, num_nodes: int, num_ch: int):
-        arr = np.zeros((num_nodes, num_nodes, num_ch))
-        obj = np.asarray(arr, dtype=np.bool).view(cls)
+    def __new__(cls, num_links: int, num_ch: int):
+        obj = np.zeros((num_links, num_ch), dtype=bool).view(cls)
 
         return obj
 
@@ -144,23 +294,32 @@ class WavelengthAvailabilityMatrix(np.ndarray):
 
 
 class TrafficMatrix(np.ndarray):
-    """Boolean 3D matrix that stores traffic info
+    """2D matrix that stores traffic info, i.e., departure times per channel
+
+    Just like the wavelength availability matrix, rows are indexed by link
+    identifier and columns by wavelength channel. The matrix also keeps track
+    of the lightpaths running and of how many channels are busy per λ and
+    per link (see `Network.wavelength_usage`).
 
     Args:
-        num_nodes: number of nodes in the network, which defines two of the
-            matrix's dimensions
-        num_ch: number of wavelength channels on each link, defining the shape
-            of the third dimension of the matrix
+        num_links: number of links in the network, which defines the number
+            of rows of the matrix
+        num_ch: number of wavelength channels on each link, defining the
+            number of columns of the matrix
 
     """
 
-    def __new__(cls, num_nodes: int, num_ch: int):
-        arr = np.zeros((num_nodes, num_nodes, num_ch))
-        obj = np.asarray(arr, dtype=np.float32).view(cls)
+    _usage: np.ndarray
+    _link_usage: np.ndarray
+    _conns: ConnectionTable
 
-        # set extra parameters
-        obj._usage: np.ndarray = np.zeros(num_ch, dtype=np.uint16)
-        obj._lightpaths: List[Lightpath] = []
+    def __new__(cls, num_links: int, num_ch: int):
+        obj = np.zeros((num_links, num_ch), dtype=np.float32).view(cls)
+
+        # set extra parameters: number of busy channels per λ and per link
+        obj._usage = np.zeros(num_ch, dtype=np.int64)
+        obj._link_usage = np.zeros(num_links, dtype=np.int64)
+        obj._conns = ConnectionTable()
 
         return obj
 
@@ -168,48 +327,83 @@ class TrafficMatrix(np.ndarray):
         if obj is None:
             return
         self._usage = getattr(obj, "_usage", None)
-        self._lightpaths = getattr(obj, "_lightpaths", None)
+        self._link_usage = getattr(obj, "_link_usage", None)
+        self._conns = getattr(obj, "_conns", None)
+
+    @property
+    def connections(self) -> ConnectionTable:
+        """The table of connections (lightpaths) currently running"""
+        return self._conns
 
     @property
     def lightpaths(self) -> List[Lightpath]:
-        """The list of connections (lightpaths) currently running"""
-        return self._lightpaths
+        """The list of connections (lightpaths) currently running
+
+        The list is built anew upon every access, so changing it does not
+        change the connections running, and lightpaths may be added and
+        removed while iterating over it.
+
+        """
+        return self._conns.lightpaths()
 
     @property
     def nconns(self):
         """The number of connections (lightpaths) currently running"""
-        return len(self._lightpaths)
+        return len(self._conns)
 
-    def add_lightpath(self, lightpath: Lightpath) -> None:
-        """Add a lightpath to the list of lightpath
+    def add_lightpath(self, lightpath: Lightpath) -> int:
+        """Add a lightpath to the table of running connections
 
         Args:
             lightpath: a Lightpath instance
 
+        Returns:
+            :obj:`int`: the slot of the table the lightpath takes up
+
         """
-        self._lightpaths.append(lightpath)
+        return self._conns.add(lightpath)
 
-    # FIXME this seems silly, but...
-    # https://stackoverflow.com/questions/9140857/oop-python-removing-class-instance-from-a-list/9140906
-    def remove_lightpath_by_id(self, _id: int) -> None:
-        """Remove a lightpath from the list of currently running connections
+    def remove_lightpath_by_id(self, _id: int) -> Union[Lightpath, None]:
+        """Remove a lightpath from the table of running connections
 
         Args:
             _id: the unique identifier of a lightpath
 
+        Returns:
+            Lightpath: the lightpath removed, or None if it was not running
+
         """
-        for i, lightpath in enumerate(self.lightpaths):
-            if lightpath.id == _id:
-                del self._lightpaths[i]
-                break
+        return self._conns.remove(_id)
+
+    def clear_lightpaths(self) -> None:
+        """Remove every lightpath from the table of running connections"""
+        self._conns.clear()
 
 
 class Network(object):
     """Network base class
 
     Hols network properties such as adjacency, wavelength-availability and
-    traffic graph matrices, fixed source and destination nodes for all
-    connections, number of λ channels per link
+    traffic graph matrices, source and destination nodes of connections,
+    number of λ channels per link. Source and destination nodes are fixed
+    by the topology, unless traffic is offered between many pairs of nodes,
+    in which case they are changed from one call to the next.
+
+    Links are identified by their index within `get_edges`. Both the
+    wavelength availability and the traffic matrices hold a row per link,
+    which is shared by both directions of it, so their size grows with the
+    number of links rather than with the square of the number of nodes. So
+    does the map from pairs of nodes to link identifiers, a dictionary built
+    once out of the neighbour lists in compressed sparse row (CSR) form (see
+    `compile_links`), and accessed via `link`, `lookup_links` and
+    `route_links`.
+
+    The wavelength availability matrix can also be packed as 64 λs per
+    machine word via `pack`, which pays off with many channels per link.
+
+    Lightpaths can be allocated tentatively within a transaction (see
+    `begin`), which is then either committed or rolled back, so candidate
+    allocations can be tried out without copying the network.
 
     Args:
         num_channels: number of wavelength channels per link
@@ -223,69 +417,399 @@ class Network(object):
         self._num_channels = num_channels
         self._num_nodes = num_nodes
         self._num_links = num_links
+        self._routes: Union['RouteTable', None] = None
 
-        self._n = WavelengthAvailabilityMatrix(self._num_nodes,
-                                               self._num_channels)
+        edges = self.get_edge_array()
+        self._n: Union[WavelengthAvailabilityMatrix,
+                       PackedWavelengthAvailability] = \
+            WavelengthAvailabilityMatrix(len(edges), self._num_channels)
         self._a = AdjacencyMatrix(self._num_nodes)
-        self._t = TrafficMatrix(self._num_nodes, self._num_channels)
+        self._t: TrafficMatrix = TrafficMatrix(len(edges), self._num_channels)
+
+        # fill in link identifiers, the same for both directions of a link,
+        # keyed by pair of nodes, and adjacency matrix
+        indptr, indices, link_ids = self.get_links_csr()
+        heads = np.repeat(np.arange(self._num_nodes, dtype=np.int64),
+                          np.diff(indptr))
+        self._link_of: Dict[Tuple[int, int], int] = dict(zip(
+            zip(heads.tolist(), indices.tolist()), link_ids.tolist()))
+        self._a[heads, indices] = True
+
+        # fill in wavelength availability and traffic matrices
+        self.reset()
+
+    def reset(self, rng: Union[np.random.Generator, np.random.RandomState,
+                               None] = None) -> None:
+        """Draws a fresh initial occupancy of the network
+
+        Every λ channel of every link is made available or busy at random,
+        and available ones are given a random departure time, in place,
+        into the very matrices the network was built with. No lightpaths
+        are left running, and transactions left open are discarded.
+
+        Drawing from NumPy's global RNG (or from a `RandomState`) is kept as
+        the default so as to reproduce the very draws the network's
+        constructor has always made, and thus the results of simulations
+        seeded via `np.random.seed`: resetting a network is then just like
+        instantiating it again, minus rebuilding the topology. A `Generator`,
+        which the rest of the simulation seeds its random streams as, draws
+        an occupancy just as random, but a different one.
 
-        # fill in wavelength availability matrix
-        for (i, j) in self.get_edges():
-            for w in range(self._num_channels):
-                availability = np.random.choice((0, 1))
-                self._n[i][j][w] = availability
-                self._n[j][i][w] = self._n[i][j][w]
+        Args:
+            rng: random number generator to draw from. Defaults to NumPy's
+                global one
+
+        Raises:
+            TypeError: if `rng` is neither a `Generator` nor a `RandomState`
 
-        # fill in adjacency matrix
-        for (i, j) in self.get_edges():
-            neigh = 1
-            self._a[i][j] = neigh
-            self._a[j][i] = self._a[i][j]
+        """
+        shape = self._t.shape
+
+        # fill in wavelength availability matrix, drawing in the very same
+        # order as one channel at a time, link after link
+        if rng is None:
+            # module-level functions share the global RNG
+            available = np.random.choice((0, 1), size=shape)
+            departures = np.random.rand(*shape)
+        elif isinstance(rng, np.random.Generator):
+            available = rng.integers(0, 2, size=shape)
+            departures = rng.random(shape)
+        elif isinstance(rng, np.random.RandomState):
+            available = rng.choice((0, 1), size=shape)
+            departures = rng.rand(*shape)
+        else:
+            raise TypeError('Expect a NumPy Generator or RandomState, not %s'
+                            % type(rng).__name__)
+        self._n[...] = available
 
         # fill in traffic matrix
         # FIXME when updating the traffic matrix via holding time parameter,
         # these random time attributions may seem not the very smart ones,
         # since decreasing values by until_next leads T to be uneven and
         # unbalanced
-        for (i, j) in self.get_edges():
-            for w in range(self._num_channels):
-                random_time = self._n[i][j][w] * np.random.rand()
-                self._t[i][j][w] = random_time
-                self._t[j][i][w] = self._t[i][j][w]
+        self._t[...] = available * departures
+        self._t.clear_lightpaths()
+        self.recount()
+        self._journal: List[Tuple[Lightpath, np.ndarray, int, np.ndarray,
+                                  np.ndarray]] = []
+        self._marks: List[int] = []  # journal length as each transaction began
+
+    def clone(self) -> 'Network':
+        """Copies the network, sharing its static structure
+
+        The adjacency matrix and the map from pairs of nodes to link
+        identifiers never change, so the copy shares them with the original
+        network, and only the wavelength availability and traffic matrices
+        are copied. This makes a built network a cheap template to spawn
+        others from, which `reset` then re-randomizes.
+
+        Returns:
+            Network: a network of the same topology and occupancy
+
+        """
+        net = copy.copy(self)
+        net._n = self._n.copy()
+        net._t = self._t.copy()
+        net._t._usage = self._t._usage.copy()
+        net._t._link_usage = self._t._link_usage.copy()
+        net._t._conns = self._t._conns.copy()
+        net._journal = []
+        net._marks = []
+        return net
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether a transaction is open, i.e., allocations are tentative"""
+        return bool(self._marks)
+
+    def begin(self) -> None:
+        """Opens a transaction
+
+        Lightpaths allocated via `try_allocate` from now on are tentative:
+        `commit` keeps them, and `rollback` takes them back, leaving the
+        network exactly as it was when the transaction was opened. Only the
+        links and channel each allocation changes are recorded, so trying an
+        allocation out is about as cheap as making it, and no matrix is ever
+        copied. Transactions may be nested, in which case committing an
+        inner one hands its allocations over to the outer one.
+
+        """
+        self._marks.append(len(self._journal))
+
+    def try_allocate(self, lightpath: Lightpath,
+                     departure: float = 0.0) -> bool:
+        """Allocates a lightpath, if its λ is available along the route
+
+        Args:
+            lightpath: a Lightpath instance, assigned a wavelength already
+            departure: time the lightpath departs at, which is written to the
+                traffic matrix on every link along the route
+
+        Returns:
+            :obj:`bool`: whether the lightpath was allocated. If not, the
+                network is left untouched
+
+        Raises:
+            ValueError: if the lightpath is running already
+
+        """
+        w = lightpath.w
+        links = lightpath.link_ids
+        if links is None:
+            links = lightpath.link_ids = self.route_links(lightpath.r)
+        if (links < 0).any():
+            return False
+        if isinstance(self._n, PackedWavelengthAvailability):
+            if not self._n.available(links, w):
+                return False
+        elif not self._n[links, w].all():
+            return False
+
+        self.allocate(lightpath, departure)
+        return True
+
+    def allocate(self, lightpath: Lightpath, departure: float = 0.0) -> None:
+        """Allocates a lightpath, whose λ is known to be available along the
+        route, and adds it to the running connections
+
+        Args:
+            lightpath: a Lightpath instance, assigned a wavelength already
+            departure: time the lightpath departs at, which is written to the
+                traffic matrix on every link along the route
+
+        Raises:
+            ValueError: if the lightpath is running already, in which case
+                the network is left untouched
+
+        """
+        w = lightpath.w
+        links = lightpath.link_ids
+        if links is None:
+            links = lightpath.link_ids = self.route_links(lightpath.r)
+        self._t.add_lightpath(lightpath)
+        if self._marks:
+            # journaled only once the lightpath is known to be new. Channels
+            # are not checked for availability here, so whether they were is
+            # journaled as well as their departure times
+            self._journal.append((lightpath, links, w,
+                                  np.asarray(self._t[links, w]),
+                                  np.asarray(self._n[links, w], dtype=bool)))
+        self._n[links, w] = 0  # lock channel on every link, both directions
+        self._t[links, w] = departure
+        self._t._usage[w] += len(links)
+        self._t._link_usage[links] += 1
+
+    def release(self, links: np.ndarray, w: int) -> None:
+        """Frees a λ channel, known to be busy, on every link of a sequence
+
+        The lightpath the channel was allocated to, if any, is left to the
+        caller to remove from the running connections.
+
+        Args:
+            links: link identifiers, each one appearing once at most
+            w: wavelength channel index
+
+        """
+        self._n[links, w] = 1
+        self._t[links, w] = 0
+        self._t._usage[w] -= len(links)
+        self._t._link_usage[links] -= 1
+
+    def commit(self) -> None:
+        """Closes the innermost transaction, keeping its allocations
+
+        Raises:
+            RuntimeError: if no transaction is open
+
+        """
+        if not self._marks:
+            raise RuntimeError('No transaction to commit')
+        self._marks.pop()
+        if not self._marks:
+            self._journal.clear()
+
+    def rollback(self) -> None:
+        """Closes the innermost transaction, taking its allocations back in
+        the reverse order they were made
+
+        Lightpaths allocated through a `DepartureScheduler` within the
+        transaction are taken back as well: the scheduler drops the
+        departure of any lightpath no longer running once it is due.
+
+        Raises:
+            RuntimeError: if no transaction is open
+
+        """
+        if not self._marks:
+            raise RuntimeError('No transaction to roll back')
+        mark = self._marks.pop()
+        while len(self._journal) > mark:
+            lightpath, links, w, departures, available = self._journal.pop()
+            self._t.remove_lightpath_by_id(lightpath.id)
+            self.release(links, w)
+            if not available.all():
+                # channels already busy before the allocation stay busy
+                self._n[links[~available], w] = 0
+            self._t[links, w] = departures
 
     # Children are responsible for overriding this method
     def get_edges(self):
         raise NotImplementedError
 
+    def get_edge_array(self) -> np.ndarray:
+        """Get edges as a E x 2 matrix of node indices, the row of each link
+        being its identifier"""
+        return np.asarray(self.get_edges(), dtype=np.int64).reshape(-1, 2)
+
+    def get_links_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get neighbour lists and link identifiers in CSR form, as
+        `compile_links` builds them out of `get_edge_array`"""
+        return compile_links(self.get_edge_array(), self._num_nodes)
+
     # Children are responsible for overriding this method
     def get_nodes_2D_pos(self):
         raise NotImplementedError
 
     @property
-    def n(self) -> np.ndarray:
-        """The wavelength availability matrix graph"""
+    def n(self) -> Union['WavelengthAvailabilityMatrix',
+                         PackedWavelengthAvailability]:
+        """The wavelength availability matrix, with a row per link"""
         return self._n
 
+    @property
+    def packed(self) -> bool:
+        """Whether the wavelength availability matrix is bit-packed"""
+        return isinstance(self._n, PackedWavelengthAvailability)
+
+    def pack(self) -> None:
+        """Packs the wavelength availability matrix as 64 λs per word
+
+        The matrix keeps its contents and the way it is written to, but
+        becomes a `PackedWavelengthAvailability` instead of a
+        `WavelengthAvailabilityMatrix`. It does nothing if already packed.
+
+        """
+        if not isinstance(self._n, PackedWavelengthAvailability):
+            self._n = PackedWavelengthAvailability(self._n)
+
+    @property
+    def wavelength_usage(self) -> np.ndarray:
+        """Number of links each λ channel is busy on
+
+        Counters are kept up to date as channels are allocated and released
+        via `allocate` and `release`, so reading them costs nothing. Whoever
+        writes to the wavelength availability matrix directly is expected to
+        call `recount` afterwards.
+
+        """
+        return self._t._usage
+
+    @property
+    def link_usage(self) -> np.ndarray:
+        """Number of busy λ channels on each link (see `wavelength_usage`)"""
+        return self._t._link_usage
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of the λ channels of the whole network that are busy"""
+        return float(self._t._usage.sum()) / self._t.size
+
+    def recount(self) -> None:
+        """Counts busy λ channels per λ and per link from scratch, out of the
+        wavelength availability matrix"""
+        busy = np.logical_not(self._n)
+        self._t._usage[...] = busy.sum(axis=0)
+        self._t._link_usage[...] = busy.sum(axis=1)
+
     @property
     def a(self) -> np.ndarray:
         """The adjacency matrix graph"""
         return self._a
 
     @property
-    def t(self) -> np.ndarray:
-        """The traffic matrix"""
+    def t(self) -> TrafficMatrix:
+        """The traffic matrix, with a row per link"""
         return self._t
 
+    def lookup_links(self, sources: Sequence[int],
+                     targets: Sequence[int]) -> np.ndarray:
+        """Identifiers of the links between pairs of nodes
+
+        Args:
+            sources: one end of each link
+            targets: the other end of each link
+
+        Returns:
+            :obj:`np.ndarray`: link identifiers, -1 where nodes are not
+                neighbours
+
+        """
+        get = self._link_of.get
+        return np.array([get(pair, -1) for pair in zip(sources, targets)],
+                        dtype=np.int32)
+
+    def link(self, i: int, j: int) -> int:
+        """Identifier of the link between two nodes, in either direction
+
+        Args:
+            i: one end of the link
+            j: the other end of the link
+
+        Returns:
+            :obj:`int`: row of the link in the wavelength availability and
+                traffic matrices
+
+        Raises:
+            ValueError: if the nodes are not neighbours
+
+        """
+        link = self._link_of.get((i, j), -1)
+        if link < 0:
+            raise ValueError('No link between nodes %d and %d' % (i, j))
+        return link
+
+    def route_links(self, route: Sequence[int]) -> np.ndarray:
+        """Identifiers of the links along a route
+
+        Args:
+            route: path encoded as a sequence of router indices
+
+        Returns:
+            :obj:`np.ndarray`: link identifiers, in the order they are
+                traversed
+
+        """
+        return self.lookup_links(route[:-1], route[1:])
+
     @property
     def s(self) -> int:
-        """The source node"""
+        """The source node, i.e., the one the current call comes from"""
         return self._s
 
+    @s.setter
+    def s(self, node: int) -> None:
+        self._s = node
+
     @property
     def d(self) -> int:
-        """The destination node"""
+        """The destination node, i.e., the one the current call goes to"""
         return self._d
 
+    @d.setter
+    def d(self, node: int) -> None:
+        self._d = node
+
+    @property
+    def routes(self) -> Union['RouteTable', None]:
+        """Routes precomputed between the pairs of nodes calls go between,
+        if any, which RWA algorithms then look up rather than routing every
+        call again"""
+        return self._routes
+
+    @routes.setter
+    def routes(self, routes: Union['RouteTable', None]) -> None:
+        self._routes = routes
+
     @property
     def name(self) -> str:
         """The short name tag idenfier of the network topology"""
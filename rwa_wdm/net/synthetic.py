@@ -0,0 +1,284 @@
+"""Synthetic network topologies of arbitrary size, for scalability studies
+
+Topologies are identified by a specification string made of the name of a
+generator, a colon, the size of the topology and, optionally, further
+comma-separated parameters, which is what `-t` takes as well:
+
+.. code-block:: sh
+
+    python -m rwa_wdm -t grid:10x20 ...
+    python -m rwa_wdm -t torus:32x32 ...
+    python -m rwa_wdm -t ring:100 ...
+    python -m rwa_wdm -t waxman:1000,alpha=0.05,beta=0.4,seed=7 ...
+    python -m rwa_wdm -t ba:2000,m=3,seed=7 ...
+
+Random topologies are drawn from a generator of their own, seeded by the
+`seed` parameter (0 by default), so the same specification always yields
+the same topology. NumPy's global RNG, which the initial occupancy of the
+network is drawn from, is not drawn from for the topology itself.
+
+"""
+
+import logging
+from typing import Callable, Dict, List, Set, Tuple, Union
+
+import numpy as np
+
+from .loader import CompiledTopology, TopologyFromFile, compile_topology
+
+__all__ = (
+    'GENERATORS',
+    'SyntheticTopology',
+    'grid',
+    'torus',
+    'ring',
+    'waxman',
+    'preferential_attachment',
+    'synthesize_topology',
+    'generate_topology',
+    'is_synthetic_topology',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SyntheticTopology(TopologyFromFile):
+    """Network whose topology was generated (see `generate_topology`)
+
+    Args:
+        topology: compiled topology
+        ch_n: number of wavelength channels per link
+
+    """
+
+
+def _lattice(rows: int, cols: int,
+             wrap: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Links and coordinates of a grid, wrapped around into a torus or not"""
+    nodes = np.arange(rows * cols).reshape(rows, cols)
+    if wrap:
+        right = np.column_stack((nodes.ravel(),
+                                 np.roll(nodes, -1, axis=1).ravel()))
+        down = np.column_stack((nodes.ravel(),
+                                np.roll(nodes, -1, axis=0).ravel()))
+    else:
+        right = np.column_stack((nodes[:, :-1].ravel(),
+                                 nodes[:, 1:].ravel()))
+        down = np.column_stack((nodes[:-1].ravel(), nodes[1:].ravel()))
+    r, c = np.divmod(np.arange(rows * cols), cols)
+    return np.concatenate((right, down)), np.column_stack((c, rows - 1 - r))
+
+
+def _compile(name: str, num_nodes: int, edges: np.ndarray,
+             pos: Union[np.ndarray, None] = None,
+             source: Union[int, None] = None,
+             destination: Union[int, None] = None) -> CompiledTopology:
+    """Compiles generated links, given as pairs of node indices"""
+    return compile_topology(
+        list(range(num_nodes)), edges.tolist(),
+        dict(enumerate(map(tuple, pos.tolist()))) if pos is not None
+        else None, source, destination, name)
+
+
+def grid(rows: int, cols: int) -> CompiledTopology:
+    """Grid of `rows` x `cols` nodes, each one linked to its four neighbours
+
+    The source and destination nodes lie at opposite corners.
+
+    """
+    if rows < 1 or cols < 1 or rows * cols < 2:
+        raise ValueError('Expect a grid of at least two nodes')
+    edges, pos = _lattice(rows, cols, wrap=False)
+    return _compile('grid%dx%d' % (rows, cols), rows * cols, edges, pos,
+                    0, rows * cols - 1)
+
+
+def torus(rows: int, cols: int) -> CompiledTopology:
+    """Grid of `rows` x `cols` nodes whose borders wrap around
+
+    The source and destination nodes lie the most hops apart from each other,
+    half way across both dimensions.
+
+    """
+    if rows < 3 or cols < 3:
+        raise ValueError('Expect a torus of at least 3 x 3 nodes')
+    edges, pos = _lattice(rows, cols, wrap=True)
+    return _compile('torus%dx%d' % (rows, cols), rows * cols, edges, pos,
+                    0, (rows // 2) * cols + cols // 2)
+
+
+def ring(num_nodes: int) -> CompiledTopology:
+    """Ring of nodes, the source and destination ones diametrically opposed"""
+    if num_nodes < 3:
+        raise ValueError('Expect a ring of at least three nodes')
+    nodes = np.arange(num_nodes)
+    edges = np.column_stack((nodes, np.roll(nodes, -1)))
+    return _compile('ring%d' % num_nodes, num_nodes, edges,
+                    source=0, destination=num_nodes // 2)
+
+
+def _components(num_nodes: int, edges: np.ndarray) -> np.ndarray:
+    """Connected component of each node, labelled by its lowest node"""
+    parent = list(range(num_nodes))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in edges.tolist():
+        i, j = find(i), find(j)
+        if i != j:
+            parent[max(i, j)] = min(i, j)
+    return np.array([find(i) for i in range(num_nodes)])
+
+
+def waxman(num_nodes: int, alpha: float = 0.1, beta: float = 0.4,
+           seed: int = 0) -> CompiledTopology:
+    """Waxman random topology
+
+    Nodes are scattered uniformly over the unit square, and each pair of
+    them is linked with probability beta exp(-d / (alpha L)), d being their
+    distance and L the diagonal of the box bounding all nodes, which stands
+    for the largest distance between any two nodes of NetworkX's
+    `waxman_graph`. Components left disconnected are then joined by linking
+    each one, in order of their lowest node, to the nearest node of the ones
+    before.
+
+    """
+    if num_nodes < 2:
+        raise ValueError('Expect a topology of at least two nodes')
+    if alpha <= 0 or not 0 < beta <= 1:
+        raise ValueError('Expect alpha > 0 and beta within (0, 1]')
+    rng = np.random.default_rng(seed)
+    pos = rng.random((num_nodes, 2))
+
+    span = np.ptp(pos, axis=0)
+    scale = alpha * max(float(np.hypot(*span)), np.finfo(float).tiny)
+
+    links: List[np.ndarray] = []
+    for i in range(num_nodes - 1):
+        dist = np.hypot(*(pos[i + 1:] - pos[i]).T)
+        linked = rng.random(len(dist)) < beta * np.exp(-dist / scale)
+        others = np.flatnonzero(linked) + i + 1
+        links.append(np.column_stack((np.full(len(others), i), others)))
+    edges = np.concatenate(links)
+
+    components = _components(num_nodes, edges)
+    joins = []
+    for label in np.unique(components)[1:]:
+        members = np.flatnonzero(components == label)
+        before = np.flatnonzero(components < label)
+        dist = np.hypot(*(pos[before][:, np.newaxis] - pos[members]).T)
+        m, b = np.unravel_index(np.argmin(dist), dist.shape)
+        joins.append((before[b], members[m]))
+        components[members] = components[before[b]]
+    if joins:
+        logger.debug('Joined %d disconnected components' % len(joins))
+        edges = np.concatenate((edges, np.array(joins).reshape(-1, 2)))
+
+    return _compile('waxman%d' % num_nodes, num_nodes, edges, pos)
+
+
+def preferential_attachment(num_nodes: int, m: int = 2,
+                            seed: int = 0) -> CompiledTopology:
+    """Barabási-Albert preferential attachment topology
+
+    Starting off a clique of `m` + 1 nodes, every other node is linked to
+    `m` distinct nodes already in place, chosen with probability
+    proportional to their degree.
+
+    """
+    if m < 1 or num_nodes < m + 2:
+        raise ValueError('Expect m >= 1 and more than m + 1 nodes')
+    rng = np.random.default_rng(seed)
+
+    edges = [(i, j) for i in range(m + 1) for j in range(i + 1, m + 1)]
+    # every node appears once per link it takes part in
+    ends = [node for edge in edges for node in edge]
+    for node in range(m + 1, num_nodes):
+        targets: Set[int] = set()
+        while len(targets) < m:
+            targets.add(ends[rng.integers(len(ends))])
+        for target in sorted(targets):
+            edges.append((target, node))
+            ends.extend((target, node))
+
+    return _compile('ba%d' % num_nodes, num_nodes, np.array(edges))
+
+
+GENERATORS: Dict[str, Callable[..., CompiledTopology]] = {
+    'grid': grid,
+    'torus': torus,
+    'ring': ring,
+    'waxman': waxman,
+    'ba': preferential_attachment,
+}
+
+
+def is_synthetic_topology(topname: str) -> bool:
+    """Whether a topology identifier is the specification of a synthetic
+    topology, i.e., starts with the name of a generator and a colon"""
+    return topname.partition(':')[0] in GENERATORS and ':' in topname
+
+
+def _parse_spec(spec: str) -> Tuple[str, Tuple[int, ...], Dict[str, float]]:
+    """Splits a specification into generator name, size and parameters"""
+    kind, _, rest = spec.partition(':')
+    size, *params = rest.split(',')
+    try:
+        dims = tuple(int(dim) for dim in size.split('x'))
+        kwargs = {}
+        for param in params:
+            key, _, value = param.partition('=')
+            kwargs[key.strip()] = int(value) if key.strip() in ('m', 'seed') \
+                else float(value)
+    except ValueError:
+        raise ValueError('Malformed topology specification "%s"' % spec)
+    return kind, dims, kwargs
+
+
+def synthesize_topology(spec: str) -> CompiledTopology:
+    """Generates a synthetic topology out of its specification
+
+    Args:
+        spec: specification of the topology, e.g., "grid:10x20" or
+            "waxman:1000,alpha=0.05,seed=7"
+
+    Returns:
+        CompiledTopology: the topology as NumPy arrays
+
+    Raises:
+        ValueError: if the specification is not valid
+
+    """
+    kind, dims, kwargs = _parse_spec(spec)
+    if kind not in GENERATORS:
+        raise ValueError('No topology generator named "%s"' % kind)
+    if len(dims) != (2 if kind in ('grid', 'torus') else 1):
+        raise ValueError('Expect the size of a %s as %s' % (
+            kind, 'rows x cols' if kind in ('grid', 'torus') else
+            'a number of nodes'))
+    try:
+        return GENERATORS[kind](*dims, **kwargs)
+    except TypeError:
+        raise ValueError('Unknown parameters for a %s: %s'
+                         % (kind, ', '.join(kwargs)))
+
+
+def generate_topology(spec: str, ch_n: int) -> SyntheticTopology:
+    """Instantiates a network of a synthetic topology
+
+    Args:
+        spec: specification of the topology (see `synthesize_topology`)
+        ch_n: number of wavelength channels per link
+
+    Returns:
+        SyntheticTopology: network topology instance
+
+    Raises:
+        ValueError: if the specification is not valid
+
+    """
+    return SyntheticTopology(synthesize_topology(spec), ch_n)
@@ -0,0 +1,140 @@
+"""Instrumentation of the simulation loop: time per phase and RWA latency
+
+"""
+
+import logging
+import math
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+__all__ = (
+    'PHASES',
+    'latency_bin',
+    'PhaseProfile',
+)
+
+logger = logging.getLogger(__name__)
+
+# phases every call goes through, in order: the RWA callable itself, the
+# check that the λ is free along the whole route, the allocation of the
+# lightpath, and the release of the connections that departed meanwhile
+PHASES = ('rwa', 'continuity', 'allocation', 'release')
+
+# RWA latencies are binned on a log scale, from 100 ns up to 100 s
+LATENCY_MIN = 1e-7
+BINS_PER_DECADE = 20
+NUM_BINS = 9 * BINS_PER_DECADE
+
+
+def latency_bin(seconds: float) -> int:
+    """Index of the histogram bin a latency falls within
+
+    Args:
+        seconds: latency, in seconds
+
+    Returns:
+        :obj:`int`: bin index. Latencies out of range fall within the first
+            or the last bin
+
+    """
+    if seconds <= LATENCY_MIN:
+        return 0
+    return min(int(math.log10(seconds / LATENCY_MIN) * BINS_PER_DECADE),
+               NUM_BINS - 1)
+
+
+class PhaseProfile(object):
+    """Time spent per phase of the simulation loop, per load
+
+    Besides the total time spent on each of the `PHASES`, a histogram of the
+    latency of every single RWA decision is kept, with log-spaced bins
+    (5% apart or so), so percentiles can be estimated without storing a
+    sample per call.
+
+    The simulation loop is expected to accumulate into plain lists over a
+    whole load, which are then handed over via `record`, so the bookkeeping
+    per call is kept to a bare minimum.
+
+    """
+
+    def __init__(self) -> None:
+        self._phases: Dict[float, np.ndarray] = {}
+        self._latency: Dict[float, np.ndarray] = {}
+
+    @staticmethod
+    def counters() -> Tuple[List[float], List[int]]:
+        """Fresh accumulators for the time per phase and the latency histogram
+
+        Returns:
+            :obj:`tuple`: zeroed list of times per phase, in seconds, and
+                zeroed list of counts per latency bin
+
+        """
+        return [0.0 for _ in PHASES], [0 for _ in range(NUM_BINS)]
+
+    def record(self, load: float,
+               phase_time: Union[Sequence[float], np.ndarray],
+               latency: Union[Sequence[int], np.ndarray]) -> None:
+        """Adds up time per phase and latency counts of a load
+
+        Args:
+            load: network load, in Erlangs
+            phase_time: time spent on each phase, in seconds
+            latency: number of RWA decisions per latency bin
+
+        """
+        if load not in self._phases:
+            self._phases[load] = np.zeros(len(PHASES))
+            self._latency[load] = np.zeros(NUM_BINS, dtype=np.int64)
+        self._phases[load] += phase_time
+        self._latency[load] += latency
+
+    def add(self, other: 'PhaseProfile') -> None:
+        """Adds up another profile, e.g., of another repetition
+
+        Args:
+            other: profile to be accumulated into this one
+
+        """
+        for load in other.loads:
+            self.record(load, other.phase_time(load), other.histogram(load))
+
+    @property
+    def loads(self) -> List[float]:
+        """The network loads profiled, in ascending order"""
+        return sorted(self._phases)
+
+    def phase_time(self, load: float) -> np.ndarray:
+        """Time spent on each phase at a load, in seconds"""
+        return self._phases[load].copy()
+
+    def histogram(self, load: float) -> np.ndarray:
+        """Number of RWA decisions per latency bin at a load"""
+        return self._latency[load].copy()
+
+    def ncalls(self, load: float) -> int:
+        """Number of RWA decisions profiled at a load"""
+        return int(self._latency[load].sum())
+
+    def percentiles(self, load: float,
+                    q: Sequence[float] = (50, 95, 99)) -> np.ndarray:
+        """Estimates percentiles of the RWA decision latency at a load
+
+        Args:
+            load: network load, in Erlangs
+            q: percentiles to be estimated, within [0, 100]
+
+        Returns:
+            :obj:`np.ndarray`: latencies, in seconds, at the geometric center
+                of the bins the percentiles fall within (NaN if no decision
+                has been profiled)
+
+        """
+        cumulative = np.cumsum(self._latency[load])
+        if not cumulative[-1]:
+            return np.full(len(q), np.nan)
+        index = np.searchsorted(cumulative,
+                                np.asarray(q) / 100.0 * cumulative[-1])
+        index = np.minimum(index, NUM_BINS - 1)
+        return LATENCY_MIN * 10.0 ** ((index + 0.5) / BINS_PER_DECADE)
@@ -0,0 +1,260 @@
+"""Progress reporting of the simulation, either to humans or to machines
+
+"""
+
+import json
+import logging
+import math
+import sys
+from timeit import default_timer
+from typing import Any, List, Sequence, Type, Union
+
+__all__ = (
+    'ProgressReporter',
+    'ConsoleProgressReporter',
+    'JsonProgressReporter',
+    'get_progress_reporter',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter(object):
+    """Silent progress reporter, base class of the verbose ones
+
+    Updates are expected on every single call, but are only rendered at a
+    bounded refresh rate, so the cost of reporting does not grow with the
+    number of calls. Subclasses are responsible for overriding the rendering
+    methods, which are no-ops here.
+
+    The simulation loop is supposed to skip reporters that are not `enabled`
+    altogether, so no work at all is done when progress is disabled.
+
+    Args:
+        interval: minimum time, in seconds, between two renderings
+
+    """
+
+    enabled: bool = False
+
+    def __init__(self, interval: float = 0.1) -> None:
+        self._interval: float = interval
+        self._deadline: float = 0.0
+        self._start: float = 0.0
+        self._simulation: int = 0
+        self._load: float = 0
+
+    def begin(self, simulation: int, load: float) -> None:
+        """Signals the start of a load within a repetition
+
+        Args:
+            simulation: index of the repetition
+            load: network load, in Erlangs
+
+        """
+        self._simulation = simulation
+        self._load = load
+        self._start = default_timer()
+        self._deadline = self._start
+
+    def update(self, calls: int, blocks: int) -> None:
+        """Reports the progress within the current load, if it is time to
+
+        Args:
+            calls: number of calls simulated so far
+            blocks: number of calls blocked so far
+
+        """
+        now = default_timer()
+        if now >= self._deadline:
+            self._deadline = now + self._interval
+            self.render(calls, blocks, now - self._start)
+
+    def end(self, calls: int, blocks: int) -> None:
+        """Signals the end of the current load, always rendering it
+
+        Args:
+            calls: number of calls simulated
+            blocks: number of calls blocked
+
+        """
+        self.render(calls, blocks, default_timer() - self._start)
+
+    def render(self, calls: int, blocks: int, elapsed: float) -> None:
+        """Renders the progress within the current load
+
+        Args:
+            calls: number of calls simulated so far
+            blocks: number of calls blocked so far
+            elapsed: time, in seconds, since the load began
+
+        """
+        pass
+
+    def header(self, loads: Sequence[float]) -> None:
+        """Reports the loads about to be simulated
+
+        Args:
+            loads: network loads, in Erlangs
+
+        """
+        pass
+
+    def result(self, simulation: int, blocklist: List[int],
+               bplist: List[float], cilist: List[float],
+               sim_time: float, algorithm: Union[str, None] = None) -> None:
+        """Reports the outcome of a whole repetition
+
+        Args:
+            simulation: index of the repetition
+            blocklist: number of blocked calls per load
+            bplist: blocking probabilities, as percentages, per load
+            cilist: half-widths of the blocking probabilities' confidence
+                intervals, as percentages, per load (empty if not computed)
+            sim_time: time, in seconds, taken by the repetition
+            algorithm: identifier of the algorithm, when comparing several
+
+        """
+        pass
+
+    def summary(self, means: List[float], halfwidths: List[float],
+                algorithm: Union[str, None] = None) -> None:
+        """Reports the across-replication estimate of the blocking probability
+
+        Args:
+            means: average blocking probabilities, as percentages, per load
+            halfwidths: half-widths of their confidence intervals
+            algorithm: identifier of the algorithm, when comparing several
+
+        """
+        pass
+
+
+class ConsoleProgressReporter(ProgressReporter):
+    """Renders progress as a single, refreshing line on the terminal"""
+
+    enabled: bool = True
+
+    def __init__(self, interval: float = 0.1) -> None:
+        super().__init__(interval)
+        self._blocklist: List[int] = []
+
+    def begin(self, simulation: int, load: float) -> None:
+        if simulation != self._simulation:
+            self._blocklist = []
+        super().begin(simulation, load)
+
+    def end(self, calls: int, blocks: int) -> None:
+        super().end(calls, blocks)
+        self._blocklist.append(blocks)
+
+    def render(self, calls: int, blocks: int, elapsed: float) -> None:
+        sys.stdout.write('\rBlocks: %s %04d' % (
+            ''.join('%04d ' % b for b in self._blocklist), calls))
+        sys.stdout.flush()
+
+    def header(self, loads: Sequence[float]) -> None:
+        print('Load:   ' + ''.join('%4g ' % load for load in loads))
+
+    def result(self, simulation: int, blocklist: List[int],
+               bplist: List[float], cilist: List[float],
+               sim_time: float, algorithm: Union[str, None] = None) -> None:
+        print('\rBlocks: ' + ''.join('%04d ' % b for b in blocklist))
+        print('%-7s ' % 'BP (%):', end='')
+        print(' '.join(['%4.1f' % bp for bp in bplist]), end=' ')
+        if algorithm is not None:
+            print('[sim %d, %s: %.2f secs]' % (simulation + 1, algorithm,
+                                               sim_time))
+        else:
+            print('[sim %d: %.2f secs]' % (simulation + 1, sim_time))
+        if cilist:
+            print('%-7s ' % 'CI (±):', end='')
+            print(' '.join(['%4.1f' % ci for ci in cilist]))
+
+    def summary(self, means: List[float], halfwidths: List[float],
+                algorithm: Union[str, None] = None) -> None:
+        print('%-7s ' % 'Mean:', end='')
+        print(' '.join(['%4.1f' % mean for mean in means]), end='')
+        print(' [%s]' % algorithm if algorithm is not None else '')
+        print('%-7s ' % 'CI (±):', end='')
+        print(' '.join(['%4.1f' % halfwidth for halfwidth in halfwidths]))
+
+
+class JsonProgressReporter(ProgressReporter):
+    """Emits progress as JSON lines, one event per line, on standard output
+
+    Every line is a JSON object whose `event` key is either "progress",
+    "load", "result" or "summary", so job schedulers can follow the
+    simulation without parsing console output.
+
+    """
+
+    enabled: bool = True
+
+    def __init__(self, interval: float = 1.0) -> None:
+        super().__init__(interval)
+
+    def _emit(self, event: str, **kwargs) -> None:
+        record = {'event': event}
+        record.update({key: _finite(value) for key, value in kwargs.items()})
+        sys.stdout.write(json.dumps(record, allow_nan=False) + '\n')
+        sys.stdout.flush()
+
+    def _progress(self, event: str, calls: int, blocks: int,
+                  elapsed: float) -> None:
+        self._emit(event, simulation=self._simulation, load=self._load,
+                   calls=calls, blocks=blocks,
+                   calls_per_sec=calls / elapsed if elapsed > 0 else None)
+
+    def render(self, calls: int, blocks: int, elapsed: float) -> None:
+        self._progress('progress', calls, blocks, elapsed)
+
+    def end(self, calls: int, blocks: int) -> None:
+        self._progress('load', calls, blocks, default_timer() - self._start)
+
+    def result(self, simulation: int, blocklist: List[int],
+               bplist: List[float], cilist: List[float],
+               sim_time: float, algorithm: Union[str, None] = None) -> None:
+        self._emit('result', simulation=simulation, algorithm=algorithm,
+                   blocks=blocklist, bp=bplist, ci=cilist, time=sim_time)
+
+    def summary(self, means: List[float], halfwidths: List[float],
+                algorithm: Union[str, None] = None) -> None:
+        self._emit('summary', algorithm=algorithm, bp=means, ci=halfwidths)
+
+
+def _finite(value: Any) -> Any:
+    """Maps non-finite floats, e.g., unknown CIs, to None, i.e., JSON null"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def get_progress_reporter(kind: str, interval: Union[float, None] = None
+                          ) -> ProgressReporter:
+    """Instantiates a progress reporter from its CLI string identifier
+
+    Args:
+        kind: either "console", "json" or "none"
+        interval: minimum time, in seconds, between two renderings. Defaults
+            to each reporter's own refresh rate
+
+    Returns:
+        ProgressReporter: progress reporter instance
+
+    Raises:
+        ValueError: if `kind` is not a valid progress reporter identifier
+
+    """
+    reporter: Type[ProgressReporter]
+    if kind == 'console':
+        reporter = ConsoleProgressReporter
+    elif kind == 'json':
+        reporter = JsonProgressReporter
+    elif kind == 'none':
+        reporter = ProgressReporter
+    else:
+        raise ValueError('No progress reporter named "%s"' % kind)
+    return reporter() if interval is None else reporter(interval)
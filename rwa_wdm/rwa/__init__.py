@@ -2,8 +2,12 @@ from .rwa import (
     dijkstra_vertex_coloring,
     dijkstra_first_fit,
     dijkstra_random_fit,
+    dijkstra_most_used,
+    dijkstra_least_used,
     yen_vertex_coloring,
     yen_first_fit,
     yen_random_fit,
+    yen_most_used,
+    yen_least_used,
     genetic_algorithm
 )
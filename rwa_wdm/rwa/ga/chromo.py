@@ -3,7 +3,7 @@
 """
 import logging
 from itertools import count
-from typing import List
+from typing import List, Union
 
 import numpy as np
 
@@ -23,24 +23,26 @@ class Fitness(object):
     available per route, and number of hops in the route.
 
     Args:
-        labels: general objective function (GOF)'s label `L`
+        labels: general objective function (GOF)'s label `L`, or None if
+            not computed
         lambdas: number of wavelengths available on a single link
         hops: number of hops in the route
 
     """
 
-    def __init__(self, labels: np.ndarray, lambdas: int, hops: int) -> None:
-        self._gof_labels: np.ndarray = labels
+    def __init__(self, labels: Union[np.ndarray, None], lambdas: int,
+                 hops: int) -> None:
+        self._gof_labels: Union[np.ndarray, None] = labels
         self._num_wavelenths_available: int = lambdas
         self._route_length: int = hops
 
     @property
-    def labels(self) -> np.ndarray:
+    def labels(self) -> Union[np.ndarray, None]:
         """The labels `L` produced by the general objective function (GOF)"""
         return self._gof_labels
 
     @labels.setter
-    def labels(self, value: np.ndarray) -> None:
+    def labels(self, value: Union[np.ndarray, None]) -> None:
         self._gof_labels = value
 
     @property
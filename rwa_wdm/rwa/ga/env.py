@@ -8,6 +8,7 @@ from .utils import gof
 from .chromo import Chromosome, Fitness
 from .pop import Population
 from ...net import Network
+from ...net.bitset import PackedWavelengthAvailability, popcount
 
 __all__ = (
     'evaluate',
@@ -28,11 +29,18 @@ def evaluate(net: Network, chromosome: Chromosome) -> Fitness:
 
     Returns:
         Fitness: Fitness object storing GOF labels, number of λ available per
-            link, and number of hops in the route
+            link, and number of hops in the route. Labels are not computed
+            if the network holds its wavelength availability packed, as the
+            bits set along the route tell the λs available all the same
 
     """
-    labels = gof(net.n, net.nchannels, chromosome.genes)
-    lambdas_available = np.count_nonzero(labels == 1.0)
+    if isinstance(net.n, PackedWavelengthAvailability):
+        labels = None
+        links = net.route_links(chromosome.genes)
+        lambdas_available = popcount(net.n.path(links))
+    else:
+        labels = gof(net, chromosome.genes)
+        lambdas_available = int(np.count_nonzero(labels == 1.0))
     route_length = len(chromosome)
 
     return Fitness(labels, lambdas_available, route_length)
@@ -4,6 +4,7 @@ from typing import List, Tuple, Union
 from .pop import Population
 from .env import evaluate, select, cross, mutate
 from ...net import Network
+from ...net.bitset import PackedWavelengthAvailability, first_set_bit
 
 __all__ = (
     'GeneticAlgorithm',
@@ -113,8 +114,17 @@ class GeneticAlgorithm(object):
                                 self._mutation_rate, net)
 
         route = population.best.genes
-        try:
-            wavelength = population.best.fit.labels.tolist().index(1)
-        except ValueError:
-            wavelength = None
-        return route, wavelength
+        labels = population.best.fit.labels
+        if labels is not None:
+            try:
+                wavelength = labels.tolist().index(1)
+            except ValueError:
+                wavelength = None
+            return route, wavelength
+
+        # labels are left out of packed networks: the lowest λ whose label
+        # would be 1 is the lowest bit set along the route
+        n = net.n
+        if isinstance(n, PackedWavelengthAvailability):
+            return route, first_set_bit(n.path(net.route_links(route)))
+        return route, None
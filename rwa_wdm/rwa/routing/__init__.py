@@ -1,2 +1,4 @@
 from .dijkstra import dijkstra
 from .yen import yen
+from .cache import RouteCache, route_cache
+from .table import RouteTable
@@ -0,0 +1,192 @@
+"""Routes cached per topology, so the same call need not be routed again
+
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from itertools import islice
+from typing import Hashable, List, Tuple, Union
+
+import numpy as np
+import networkx as nx
+
+__all__ = (
+    'RouteCache',
+    'route_cache',
+    'topology_key',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def topology_key(mat: np.ndarray) -> Tuple[Tuple[int, ...], str]:
+    """Identity of a topology, as a fingerprint of its adjacency matrix
+
+    Networks of the same topology, e.g., the clones a simulation runs over,
+    share the same identity, and thus the routes cached for them. The
+    fingerprint is computed once and remembered by the adjacency matrix
+    itself, if it can hold attributes, as `AdjacencyMatrix` does, so it
+    must be forgotten via `RouteCache.invalidate` whenever the matrix
+    changes.
+
+    Args:
+        mat: Network's adjacency matrix graph
+
+    Returns:
+        :obj:`tuple`: shape of the matrix and digest of its contents
+
+    """
+    key = getattr(mat, '_topology_key', None)
+    if key is None:
+        bits = np.packbits(np.asarray(mat) != 0)
+        key = mat.shape, hashlib.sha1(bits.tobytes()).hexdigest()
+        try:
+            setattr(mat, '_topology_key', key)
+        except AttributeError:
+            pass  # plain arrays cannot remember it, so compute it every time
+    return key
+
+
+class RouteCache(object):
+    """Routes computed by Dijkstra's and Yen's algorithms, kept for reuse
+
+    Routes are the very same ones `dijkstra` and `yen` produce, but are
+    keyed by the identity of the topology (see `topology_key`), the source
+    and destination nodes, the number of alternate routes and the edge
+    weight, so every call after the first between the same pair of nodes
+    just looks them up. The graph of each topology is built only once as
+    well. Routes returned are shared by all callers, so they must not be
+    modified.
+
+    Least recently used routes are evicted once the cache holds `maxsize`
+    entries.
+
+    Args:
+        maxsize: maximum number of entries, or None for no limit
+        maxgraphs: maximum number of topologies whose graph is kept
+
+    """
+
+    def __init__(self, maxsize: Union[int, None] = 65536,
+                 maxgraphs: int = 8) -> None:
+        self._maxsize: Union[int, None] = maxsize
+        self._maxgraphs: int = maxgraphs
+        self._routes: OrderedDict = OrderedDict()
+        self._graphs: OrderedDict = OrderedDict()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups the cache answered"""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups that had to be routed"""
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def _graph(self, mat: np.ndarray, topology: Hashable) -> nx.Graph:
+        """Graph of a topology, built once"""
+        G = self._graphs.get(topology)
+        if G is None:
+            G = nx.from_numpy_matrix(mat, create_using=nx.Graph())
+            self._graphs[topology] = G
+            if len(self._graphs) > self._maxgraphs:
+                self._graphs.popitem(last=False)
+        else:
+            self._graphs.move_to_end(topology)
+        return G
+
+    def _lookup(self, mat: np.ndarray, s: int, d: int, k: int,
+                weight: Union[str, None]):
+        topology = topology_key(mat)
+        key = topology, s, d, k, weight
+        routes = self._routes.get(key)
+        if routes is not None:
+            self._hits += 1
+            self._routes.move_to_end(key)
+            return routes
+
+        self._misses += 1
+        G = self._graph(mat, topology)
+        if k:
+            # paths are generated lazily, shortest first, so stop at the k-th
+            routes = list(islice(nx.shortest_simple_paths(G, s, d,
+                                                          weight=weight), k))
+        else:
+            _, routes = nx.bidirectional_dijkstra(G, s, d, weight=weight)
+        self._routes[key] = routes
+        if self._maxsize is not None and len(self._routes) > self._maxsize:
+            self._routes.popitem(last=False)
+        return routes
+
+    def shortest(self, mat: np.ndarray, s: int, d: int,
+                 weight: Union[str, None] = None) -> List[int]:
+        """Shortest route between a pair of nodes, as `dijkstra` finds it
+
+        Args:
+            mat: Network's adjacency matrix graph
+            s: source node index
+            d: destination node index
+            weight: edge attribute to weigh links by, or None for hops
+
+        Returns:
+            :obj:`list` of :obj:`int`: sequence of router indices encoding a
+                path
+
+        """
+        return self._lookup(mat, int(s), int(d), 0, weight)
+
+    def alternate(self, mat: np.ndarray, s: int, d: int, k: int,
+                  weight: Union[str, None] = None) -> List[List[int]]:
+        """Alternate routes between a pair of nodes, as `yen` finds them
+
+        Args:
+            mat: Network's adjacency matrix graph
+            s: source node index
+            d: destination node index
+            k: number of alternate paths
+            weight: edge attribute to weigh links by, or None for hops
+
+        Returns:
+            :obj:`list` of :obj:`list`: a sequence of `k` paths
+
+        Raises:
+            ValueError: if `k` is not positive
+
+        """
+        if k < 1:
+            raise ValueError('Number of alternate paths should be positive')
+        return self._lookup(mat, int(s), int(d), int(k), weight)
+
+    def invalidate(self, mat: Union[np.ndarray, None] = None) -> None:
+        """Forgets the routes and graph of a topology, or of all of them
+
+        Must be called whenever an adjacency matrix whose routes are cached
+        changes, before routing over it again.
+
+        Args:
+            mat: Network's adjacency matrix graph, or None for all topologies
+
+        """
+        if mat is None:
+            self._routes.clear()
+            self._graphs.clear()
+            return
+        topology = topology_key(mat)
+        for key in [key for key in self._routes if key[0] == topology]:
+            del self._routes[key]
+        self._graphs.pop(topology, None)
+        try:
+            delattr(mat, '_topology_key')
+        except AttributeError:
+            pass
+
+
+# the cache RWA algorithms share, and thus every network of a process
+route_cache = RouteCache()
@@ -2,19 +2,24 @@
 
 """
 
-from typing import List
+from typing import List, Union
 
 import numpy as np
 import networkx as nx
 
 
-def dijkstra(mat: np.ndarray, s: int, d: int) -> List[int]:
+def dijkstra(mat: np.ndarray, s: int, d: int,
+             weight: Union[str, None] = None) -> List[int]:
     """Dijkstra routing algorithm
 
+    The graph is built anew upon every call. RWA algorithms route through
+    `route_cache` instead, which keeps both graphs and routes.
+
     Args:
         mat: Network's adjacency matrix graph
         s: source node index
         d: destination node index
+        weight: edge attribute to weigh links by, or None for hops
 
     Returns:
         :obj:`list` of :obj:`int`: sequence of router indices encoding a path
@@ -27,5 +32,5 @@ def dijkstra(mat: np.ndarray, s: int, d: int) -> List[int]:
                          'adjacency matrix dimensions')
 
     G = nx.from_numpy_matrix(mat, create_using=nx.Graph())
-    hops, path = nx.bidirectional_dijkstra(G, s, d, weight=None)
+    hops, path = nx.bidirectional_dijkstra(G, s, d, weight=weight)
     return path
@@ -0,0 +1,90 @@
+"""Routes precomputed between pairs of nodes, so calls need not route again
+
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .cache import RouteCache, route_cache
+
+__all__ = (
+    'RouteTable',
+)
+
+
+class RouteTable(object):
+    """Shortest and alternate routes between pairs of nodes, built up front
+
+    Routes are the very same ones `dijkstra` and `yen` produce, but they are
+    all computed up front, through a `RouteCache` so the graph is built only
+    once for all pairs, and every call between the same pair of nodes then
+    just looks them up. Routes returned are shared by all callers, so they
+    must not be modified.
+
+    Args:
+        mat: Network's adjacency matrix graph
+        pairs: source and destination nodes of each pair to route
+        shortest: whether to compute the shortest route of each pair, as
+            `dijkstra` does
+        k: number of alternate routes of each pair to compute, as `yen`
+            does, or 0 for none
+        cache: cache to compute routes through. Defaults to the one RWA
+            algorithms share
+
+    """
+
+    def __init__(self, mat: np.ndarray, pairs: Iterable[Tuple[int, int]],
+                 shortest: bool = True, k: int = 0,
+                 cache: RouteCache = route_cache) -> None:
+        self._k: int = k
+        self._shortest: Dict[Tuple[int, int], List[int]] = {}
+        self._alternate: Dict[Tuple[int, int], List[List[int]]] = {}
+
+        for s, d in pairs:
+            s, d = int(s), int(d)
+            if shortest:
+                self._shortest[s, d] = cache.shortest(mat, s, d)
+            if k:
+                self._alternate[s, d] = cache.alternate(mat, s, d, k)
+
+    @property
+    def k(self) -> int:
+        """Number of alternate routes per pair"""
+        return self._k
+
+    def __len__(self) -> int:
+        return max(len(self._shortest), len(self._alternate))
+
+    def shortest(self, s: int, d: int) -> List[int]:
+        """Shortest route between a pair of nodes
+
+        Args:
+            s: source node index
+            d: destination node index
+
+        Returns:
+            :obj:`list` of :obj:`int`: sequence of router indices encoding a
+                path
+
+        Raises:
+            KeyError: if no shortest route was computed for the pair
+
+        """
+        return self._shortest[s, d]
+
+    def alternate(self, s: int, d: int) -> List[List[int]]:
+        """Alternate routes between a pair of nodes, shortest first
+
+        Args:
+            s: source node index
+            d: destination node index
+
+        Returns:
+            :obj:`list` of :obj:`list`: a sequence of `k` paths
+
+        Raises:
+            KeyError: if no alternate routes were computed for the pair
+
+        """
+        return self._alternate[s, d]
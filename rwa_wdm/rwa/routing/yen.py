@@ -2,20 +2,26 @@
 
 """
 
-from typing import List
+from itertools import islice
+from typing import List, Union
 
 import numpy as np
 import networkx as nx
 
 
-def yen(mat: np.ndarray, s: int, d: int, k: int) -> List[List[int]]:
+def yen(mat: np.ndarray, s: int, d: int, k: int,
+        weight: Union[str, None] = None) -> List[List[int]]:
     """Yen's routing algorithm, a.k.a. K-shortest paths
 
+    The graph is built anew upon every call. RWA algorithms route through
+    `route_cache` instead, which keeps both graphs and routes.
+
     Args:
         mat: Network's adjacency matrix graph
         s: source node index
         d: destination node index
         k: number of alternate paths
+        weight: edge attribute to weigh links by, or None for hops
 
     Returns:
         :obj:`list` of :obj:`list`: a sequence of `k` paths
@@ -30,5 +36,6 @@ def yen(mat: np.ndarray, s: int, d: int, k: int) -> List[List[int]]:
         raise ValueError('Number of alternate paths should be positive')
 
     G = nx.from_numpy_matrix(mat, create_using=nx.Graph())
-    paths = list(nx.shortest_simple_paths(G, s, d, weight=None))
-    return paths[:k]
+    # paths are generated lazily, shortest first, so stop at the k-th
+    return list(islice(nx.shortest_simple_paths(G, s, d, weight=weight),
+                       k))
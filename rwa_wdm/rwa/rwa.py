@@ -1,15 +1,20 @@
-from typing import Callable, Union
+from typing import Callable, List, Union
 
-from ..net import Lightpath, Network
-from .routing import dijkstra, yen
-from .wlassignment import vertex_coloring, first_fit, random_fit
+from ..net import Lightpath, Network, path_availability
+from .routing import route_cache
+from .wlassignment import (vertex_coloring, first_fit, random_fit,
+                           most_used, least_used)
 from .ga import GeneticAlgorithm
 
 __all__ = (
     'dijkstra_vertex_coloring',
     'dijkstra_first_fit',
+    'dijkstra_most_used',
+    'dijkstra_least_used',
     'yen_vertex_coloring',
     'yen_first_fit',
+    'yen_most_used',
+    'yen_least_used',
     'genetic_algorithm',
 )
 
@@ -19,9 +24,28 @@ __all__ = (
 ga: Union[GeneticAlgorithm, None] = None
 
 
+def _shortest_route(net: Network) -> List[int]:
+    """Shortest route of the current call, precomputed if available, or
+    cached after the first call between the same nodes otherwise"""
+    if net.routes is not None:
+        return net.routes.shortest(net.s, net.d)
+    return route_cache.shortest(net.a, net.s, net.d)
+
+
+def _alternate_routes(net: Network, k: int) -> List[List[int]]:
+    """Alternate routes of the current call, precomputed if available, or
+    cached after the first call between the same nodes otherwise"""
+    if net.routes is not None and net.routes.k == k:
+        return net.routes.alternate(net.s, net.d)
+    return route_cache.alternate(net.a, net.s, net.d, k)
+
+
 def dijkstra_vertex_coloring(net: Network, k: int) -> Union[Lightpath, None]:
     """Dijkstra and vertex coloring combination as RWA algorithm
 
+    The color chosen is available on every link along the route, as
+    `vertex_coloring` tries it out before returning it.
+
     Args:
         net: Network topology instance
         k: number of alternate paths (ignored)
@@ -31,9 +55,9 @@ def dijkstra_vertex_coloring(net: Network, k: int) -> Union[Lightpath, None]:
             lightpath
 
     """
-    route = dijkstra(net.a, net.s, net.d)
+    route = _shortest_route(net)
     wavelength = vertex_coloring(net, Lightpath(route, None))
-    if wavelength is not None and wavelength < net.nchannels:
+    if wavelength is not None:
         return Lightpath(route, wavelength)
     return None
 
@@ -50,7 +74,7 @@ def dijkstra_first_fit(net: Network, k: int) -> Union[Lightpath, None]:
             lightpath
 
     """
-    route = dijkstra(net.a, net.s, net.d)
+    route = _shortest_route(net)
     wavelength = first_fit(net, route)
     if wavelength is not None and wavelength < net.nchannels:
         return Lightpath(route, wavelength)
@@ -69,29 +93,69 @@ def dijkstra_random_fit(net: Network, k: int) -> Union[Lightpath, None]:
             lightpath
 
     """
-    route = dijkstra(net.a, net.s, net.d)
+    route = _shortest_route(net)
     wavelength = random_fit(net, route)
     if wavelength is not None and wavelength < net.nchannels:
         return Lightpath(route, wavelength)
     return None
 
 
+def dijkstra_most_used(net: Network, k: int) -> Union[Lightpath, None]:
+    """Dijkstra and most-used combination as RWA algorithm
+
+    Args:
+        net: Network topology instance
+        k: number of alternate paths (ignored)
+
+    Returns:
+        Lightpath: if successful, returns both route and wavelength index as a
+            lightpath
+
+    """
+    route = _shortest_route(net)
+    wavelength = most_used(net, route)
+    if wavelength is not None and wavelength < net.nchannels:
+        return Lightpath(route, wavelength)
+    return None
+
+
+def dijkstra_least_used(net: Network, k: int) -> Union[Lightpath, None]:
+    """Dijkstra and least-used combination as RWA algorithm
+
+    Args:
+        net: Network topology instance
+        k: number of alternate paths (ignored)
+
+    Returns:
+        Lightpath: if successful, returns both route and wavelength index as a
+            lightpath
+
+    """
+    route = _shortest_route(net)
+    wavelength = least_used(net, route)
+    if wavelength is not None and wavelength < net.nchannels:
+        return Lightpath(route, wavelength)
+    return None
+
+
 def yen_vertex_coloring(net: Network, k: int) -> Union[Lightpath, None]:
     """Yen and vertex coloring combination as RWA algorithm
 
+    Routes are tried in turn until one of them is given a color, which
+    `vertex_coloring` only does if it is available on every link along it.
+
     Args:
         net: Network topology instance
-        k: number of alternate paths (ignored)
+        k: number of alternate paths
 
     Returns:
         Lightpath: if successful, returns both route and wavelength index as a
             lightpath
 
     """
-    routes = yen(net.a, net.s, net.d, k)
-    for route in routes:
+    for route in _alternate_routes(net, k):
         wavelength = vertex_coloring(net, Lightpath(route, None))
-        if wavelength is not None and wavelength < net.nchannels:
+        if wavelength is not None:
             return Lightpath(route, wavelength)
     return None
 
@@ -101,16 +165,16 @@ def yen_first_fit(net: Network, k: int) -> Union[Lightpath, None]:
 
     Args:
         net: Network topology instance
-        k: number of alternate paths (ignored)
+        k: number of alternate paths
 
     Returns:
         Lightpath: if successful, returns both route and wavelength index as a
             lightpath
 
     """
-    routes = yen(net.a, net.s, net.d, k)
-    for route in routes:
-        wavelength = first_fit(net, route)
+    routes = _alternate_routes(net, k)
+    for route, available in zip(routes, path_availability(net, routes)):
+        wavelength = first_fit(net, route, available)
         if wavelength is not None and wavelength < net.nchannels:
             return Lightpath(route, wavelength)
     return None
@@ -121,16 +185,56 @@ def yen_random_fit(net: Network, k: int) -> Union[Lightpath, None]:
 
     Args:
         net: Network topology instance
-        k: number of alternate paths (ignored)
+        k: number of alternate paths
+
+    Returns:
+        Lightpath: if successful, returns both route and wavelength index as a
+            lightpath
+
+    """
+    routes = _alternate_routes(net, k)
+    for route, available in zip(routes, path_availability(net, routes)):
+        wavelength = random_fit(net, route, available)
+        if wavelength is not None and wavelength < net.nchannels:
+            return Lightpath(route, wavelength)
+    return None
+
+
+def yen_most_used(net: Network, k: int) -> Union[Lightpath, None]:
+    """Yen and most-used combination as RWA algorithm
+
+    Args:
+        net: Network topology instance
+        k: number of alternate paths
+
+    Returns:
+        Lightpath: if successful, returns both route and wavelength index as a
+            lightpath
+
+    """
+    routes = _alternate_routes(net, k)
+    for route, available in zip(routes, path_availability(net, routes)):
+        wavelength = most_used(net, route, available)
+        if wavelength is not None and wavelength < net.nchannels:
+            return Lightpath(route, wavelength)
+    return None
+
+
+def yen_least_used(net: Network, k: int) -> Union[Lightpath, None]:
+    """Yen and least-used combination as RWA algorithm
+
+    Args:
+        net: Network topology instance
+        k: number of alternate paths
 
     Returns:
         Lightpath: if successful, returns both route and wavelength index as a
             lightpath
 
     """
-    routes = yen(net.a, net.s, net.d, k)
-    for route in routes:
-        wavelength = random_fit(net, route)
+    routes = _alternate_routes(net, k)
+    for route, available in zip(routes, path_availability(net, routes)):
+        wavelength = least_used(net, route, available)
         if wavelength is not None and wavelength < net.nchannels:
             return Lightpath(route, wavelength)
     return None
@@ -1,3 +1,5 @@
 from .vcolor import vertex_coloring
 from .ff import first_fit
 from .rf import random_fit
+from .mu import most_used
+from .lu import least_used
@@ -3,27 +3,40 @@
 """
 from typing import List, Union
 
+import numpy as np
+
 # FIXME https://mypy.readthedocs.io/en/latest/common_issues.html#import-cycles
-from ...net import Network
+from ...net import Network, path_availability
+from ...net.bitset import PackedWavelengthAvailability, first_set_bit
 
 
-def first_fit(net: Network, route: List[int]) -> Union[int, None]:
+def first_fit(net: Network, route: List[int],
+              available: Union[np.ndarray, None] = None) -> Union[int, None]:
     """First-fit algorithm
 
-    Select the wavelength with the lowest index available at the first link of
-    the path, starting of course from the source node.
+    Select the wavelength with the lowest index available along the whole
+    path, from the source node all the way to the destination node.
+
+    If the network holds its wavelength availability packed and no mask is
+    given, the lowest bit set in the bitwise AND of the route's words is
+    taken instead.
 
     Args:
         net: Network object
         route: path encoded as a sequence of router indices
+        available: mask of the λ channels available along the route, as
+            returned by `path_availability`, if already computed
 
     Returns:
         :obj:`int`: upon wavelength assignment success, return the wavelength
             index to be used on the lightpath
 
     """
-    i, j = route[0], route[1]
-    for w in range(net.nchannels):
-        if net.n[i][j][w]:
-            return w
+    if available is None:
+        if isinstance(net.n, PackedWavelengthAvailability):
+            return first_set_bit(net.n.path(net.route_links(route)))
+        available = path_availability(net, route)
+    w = int(np.argmax(available))
+    if available[w]:
+        return w
     return None
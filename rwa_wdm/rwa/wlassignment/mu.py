@@ -0,0 +1,41 @@
+"""Most-used wavelength assignment strategy
+
+"""
+from typing import List, Union
+
+import numpy as np
+
+# FIXME https://mypy.readthedocs.io/en/latest/common_issues.html#import-cycles
+from ...net import Network, path_availability
+
+
+def most_used(net: Network, route: List[int],
+              available: Union[np.ndarray, None] = None) -> Union[int, None]:
+    """Most-used algorithm
+
+    Select, out of the wavelengths available along the whole path, the one
+    busy on the largest number of links throughout the network, so that
+    lightpaths are packed into as few λs as possible. Ties are broken in
+    favour of the lowest index.
+
+    The number of links each λ is busy on is kept up to date by the network
+    itself (see `Network.wavelength_usage`), so choosing takes a single pass
+    over the channels rather than a scan of the whole network.
+
+    Args:
+        net: Network object
+        route: path encoded as a sequence of router indices
+        available: mask of the λ channels available along the route, as
+            returned by `path_availability`, if already computed
+
+    Returns:
+        :obj:`int`: upon wavelength assignment success, return the wavelength
+            index to be used on the lightpath
+
+    """
+    if available is None:
+        available = path_availability(net, route)
+    wavelengths = np.flatnonzero(available)
+    if not len(wavelengths):
+        return None
+    return int(wavelengths[np.argmax(net.wavelength_usage[wavelengths])])
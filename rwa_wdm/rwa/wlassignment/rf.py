@@ -6,26 +6,37 @@ from typing import List, Union
 import numpy as np
 
 # FIXME https://mypy.readthedocs.io/en/latest/common_issues.html#import-cycles
-from ...net import Network
+from ...net import Network, path_availability
+from ...net.bitset import PackedWavelengthAvailability, random_set_bit
 
 
-def random_fit(net: Network, route: List[int]) -> Union[int, None]:
+def random_fit(net: Network, route: List[int],
+               available: Union[np.ndarray, None] = None) -> Union[int, None]:
     """Random-fit algorithm
 
-    Select a random wavelength index from the fixed set of available
-    wavelengths
+    Select a random wavelength index from the set of wavelengths available
+    along the whole path
+
+    If the network holds its wavelength availability packed and no mask is
+    given, a bit set is drawn straight from the bitwise AND of the route's
+    words instead, which picks the very same λ.
 
     Args:
         net: Network object
         route: path encoded as a sequence of router indices
+        available: mask of the λ channels available along the route, as
+            returned by `path_availability`, if already computed
 
     Returns:
         :obj:`int`: upon wavelength assignment success, return the wavelength
             index to be used on the lightpath
 
     """
-    i, j = route[0], route[1]
+    if available is None:
+        if isinstance(net.n, PackedWavelengthAvailability):
+            return random_set_bit(net.n.path(net.route_links(route)))
+        available = path_availability(net, route)
     try:
-        return np.random.choice(np.flatnonzero(net.n[i][j]))
+        return int(np.random.choice(np.flatnonzero(available)))
     except ValueError:
         return None
@@ -6,7 +6,6 @@ from itertools import count
 from typing import Union
 
 import numpy as np
-import networkx as nx
 
 # FIXME https://mypy.readthedocs.io/en/latest/common_issues.html#import-cycles
 from ...net import Network, Lightpath
@@ -15,6 +14,14 @@ from ...net import Network, Lightpath
 def vertex_coloring(net: Network, lightpath: Lightpath) -> Union[int, None]:
     """Vertex coloring algorithm
 
+    The route we are trying to find a λ to is a vertex of the graph of the
+    running lightpaths, adjacent to those it shares a link with, and is
+    greedily given the lowest color none of them has. Since channels may be
+    busy other than by running lightpaths, e.g., due to the network's
+    initial occupancy, the color is then tried out as a tentative
+    allocation (see `Network.begin`), which is rolled back right after, so
+    the network is left untouched.
+
     Args:
         net: Network object
         lightpath: the lightpath we are trying to allocate a λ to
@@ -24,46 +31,36 @@ def vertex_coloring(net: Network, lightpath: Lightpath) -> Union[int, None]:
             index to be used on the lightpath
 
     """
-    net.t.add_lightpath(lightpath)  # this is temporary
-
-    # NOTE `nconns` gotta be at least one for this to work. The current
-    # route is assumed to be already in the graph when vertex coloring
-    # strategies take place, because the route we are trying to find a λ
-    # to must be already accounted for as part of the "group" of routes.
-    H = np.zeros((net.t.nconns, net.t.nconns), dtype=np.uint16)
-    if net.t.nconns > 1:
-        # cross compare paths over indices i and j
-        for i in range(net.t.nconns):
-            for j in range(i + 1, net.t.nconns):
-                r1 = net.t.lightpaths[i].r
-                r2 = net.t.lightpaths[j].r
-                # cross compare routers over indicies m and n
-                for m in range(1, len(r1)):
-                    for n in range(1, len(r2)):
-                        if (r1[m - 1] == r2[n - 1] and r1[m] == r2[n]) or \
-                           (r1[m] == r2[n - 1] and r1[m - 1] == r2[n]):
-                            H[i][j] = 1
-                            H[j][i] = 1
+    route_links = lightpath.link_ids
+    if route_links is None:
+        route_links = lightpath.link_ids = net.route_links(lightpath.r)
 
-    colors = {}
-    for i in range(net.t.nconns):
-        wavelength = net.t.lightpaths[i].w
-        if wavelength is not None:
-            colors[i] = wavelength
-
-    net.t.remove_lightpath_by_id(lightpath.id)  # I told you it was temporary
+    # paths conflict whenever they share a link, in either direction: cross
+    # compare them all at once via a lightpath x link incidence matrix. Only
+    # the conflicts of the current route are needed.
+    lightpaths = net.t.lightpaths
+    incidence = np.zeros((len(lightpaths), net.nlinks), dtype=np.uint16)
+    for i, lp in enumerate(lightpaths):
+        links = lp.link_ids
+        if links is None:
+            links = lp.link_ids = net.route_links(lp.r)
+        incidence[i, links] = 1
+    route = np.zeros(net.nlinks, dtype=np.uint16)
+    route[route_links] = 1
+    H = incidence @ route
 
     # The following is like NetworkX's greedy color procedure
-    G = nx.from_numpy_matrix(H, create_using=nx.Graph())
-
-    if len(G):
-        u = H.shape[0] - 1
-        neighbour_colors = {colors[v] for v in G[u] if v in colors}
-        for color in count():
-            if color not in neighbour_colors:
-                break
+    neighbour_colors = {lightpaths[v].w for v in np.flatnonzero(H)
+                        if lightpaths[v].w is not None}
+    for color in count():
+        if color not in neighbour_colors:
+            break
+    if color >= net.nchannels:
+        return None
 
-        # assign the node the newly found color
-        return color
-    else:
-        return None  # NOTE I think this is never called
+    net.begin()
+    try:
+        fits = net.try_allocate(Lightpath(lightpath.r, color, route_links))
+    finally:
+        net.rollback()
+    return color if fits else None
@@ -1,27 +1,86 @@
-"""RWA simulator main function
+"""RWA simulator main function and library interface
 
 """
 
-# [1] https://la.mathworks.com/matlabcentral/fileexchange/4797-wdm-network-blocking-computation-toolbox
-
+import copy
 import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from timeit import default_timer  # https://stackoverflow.com/a/25823885/3798300
-from typing import Callable
+from typing import (TYPE_CHECKING, Callable, Dict, Iterator, List, Sequence,
+                    Tuple, Union, cast)
 from argparse import Namespace
 
 import numpy as np
 
-from .io import write_bp_to_disk, write_it_to_disk, plot_bp
-from .net import Network
+from .analytic import estimate_blocking
+from .checkpoint import Checkpoint
+from .event import DepartureScheduler
+from .io import (write_bp_to_disk, write_ci_to_disk, write_it_to_disk,
+                 write_loads_to_disk, write_profile_to_disk, plot_bp)
+from .net import Network, link_availability, path_availability
+from .profiling import PhaseProfile, latency_bin
+from .progress import (ProgressReporter, JsonProgressReporter,
+                       get_progress_reporter)
+from .stats import ci_converged, confidence_interval, refine_loads
+from .trace import (ALLOCATED, BLOCKED_CONTINUITY, BLOCKED_RWA,
+                    EventTrace)
+from .rwa.routing import RouteTable
+from .traffic import (ArrivalProcess, PairDistribution, seed_sequence,
+                      traffic_matrix)
+
+if TYPE_CHECKING:
+    from multiprocessing.synchronize import Event
 
 __all__ = (
+    'ROUTING_ALGORITHMS',
+    'WAVELENGTH_ALGORITHMS',
+    'RWA_ALGORITHMS',
     'get_net_instance_from_args',
+    'get_net_template',
     'get_rwa_algorithm_from_args',
+    'parse_algorithm',
+    'SimulationConfig',
+    'SimulationResult',
+    'serve_call',
+    'simulate',
+    'Simulator',
     'simulator'
 )
 
 logger = logging.getLogger(__name__)
 
+# CLI string identifiers of the algorithms, as understood by
+# `get_rwa_algorithm_from_args`
+ROUTING_ALGORITHMS = ('dijkstra', 'yen')
+WAVELENGTH_ALGORITHMS = ('vertex-coloring', 'first-fit', 'random-fit',
+                         'most-used', 'least-used')
+RWA_ALGORITHMS = ('genetic-algorithm',)
+
+# minimum number of samples (batches or repetitions) before a confidence
+# interval is trusted to stop the simulation
+MIN_CI_SAMPLES = 5
+
+# number of calls between checks of whether a repetition running in a worker
+# process is still wanted (see `Simulator.repetitions`)
+STOP_CHECK_CALLS = 1000
+
+# set by the main process once pending repetitions are of no use anymore, and
+# inherited by every worker process (see `_init_worker`)
+_stop: Union['Event', None] = None
+
+# network instances built so far, per topology and number of channels, to be
+# cloned from rather than built over again (see `get_net_template`)
+_templates: Dict[Tuple[str, int], Network] = {}
+
+# pairs of nodes calls go between and routes precomputed between them, per
+# simulation parameters they depend upon (see `_traffic`)
+_traffic_cache: Dict[Tuple, Tuple[Union[PairDistribution, None],
+                                  RouteTable]] = {}
+
 
 def get_net_instance_from_args(topname: str, numch: int) -> Network:
     """Instantiates a Network object from CLI string identifiers
@@ -31,7 +90,9 @@ def get_net_instance_from_args(topname: str, numch: int) -> Network:
     directly.
 
     Args:
-        topname: short identifier for the network topology
+        topname: short identifier for the network topology, path to a JSON
+            or GML file describing one (see `load_topology`), or
+            specification of a synthetic one (see `generate_topology`)
         numch: number of wavelength channels per network link
 
     Returns:
@@ -41,7 +102,15 @@ def get_net_instance_from_args(topname: str, numch: int) -> Network:
         ValueError: if `topname` is not a valid network identifier
 
     """
-    if topname == 'nsf':
+    from .net.loader import is_topology_file
+    from .net.synthetic import is_synthetic_topology
+    if is_topology_file(topname):
+        from .net import load_topology
+        return load_topology(topname, numch)
+    elif is_synthetic_topology(topname):
+        from .net import generate_topology
+        return generate_topology(topname, numch)
+    elif topname == 'nsf':
         from .net import NationalScienceFoundation
         return NationalScienceFoundation(numch)
     elif topname == 'clara':
@@ -57,7 +126,39 @@ def get_net_instance_from_args(topname: str, numch: int) -> Network:
         raise ValueError('No network named "%s"' % topname)
 
 
-def get_rwa_algorithm_from_args(r_alg: str, wa_alg: str, rwa_alg: str,
+def get_net_template(topname: str, numch: int) -> Network:
+    """Network instance to clone others of the same topology from
+
+    The template is built on first request and kept for the lifetime of
+    the process, so later requests cost no more than a dictionary lookup.
+    It must not be modified: networks to simulate over are spawned from it
+    via `Network.clone` and then given an occupancy of their own via
+    `Network.reset`. Building it leaves NumPy's global RNG untouched.
+
+    Args:
+        topname: short identifier for the network topology
+        numch: number of wavelength channels per network link
+
+    Returns:
+        Network: network topology instance shared by all callers
+
+    Raises:
+        ValueError: if `topname` is not a valid network identifier
+
+    """
+    key = (topname, numch)
+    if key not in _templates:
+        state = np.random.get_state()
+        try:
+            _templates[key] = get_net_instance_from_args(topname, numch)
+        finally:
+            np.random.set_state(state)
+    return _templates[key]
+
+
+def get_rwa_algorithm_from_args(r_alg: Union[str, None],
+                                wa_alg: Union[str, None],
+                                rwa_alg: Union[str, None],
                                 ga_popsize: int, ga_ngen: int,
                                 ga_xrate: float, ga_mrate: float) -> Callable:
     """Defines the main function to perform RWA from CLI string args
@@ -93,6 +194,12 @@ def get_rwa_algorithm_from_args(r_alg: str, wa_alg: str, rwa_alg: str,
             elif wa_alg == 'random-fit':
                 from .rwa import dijkstra_random_fit
                 return dijkstra_random_fit
+            elif wa_alg == 'most-used':
+                from .rwa import dijkstra_most_used
+                return dijkstra_most_used
+            elif wa_alg == 'least-used':
+                from .rwa import dijkstra_least_used
+                return dijkstra_least_used
             else:
                 raise ValueError('Unknown wavelength assignment '
                                  'algorithm "%s"' % wa_alg)
@@ -106,6 +213,12 @@ def get_rwa_algorithm_from_args(r_alg: str, wa_alg: str, rwa_alg: str,
             elif wa_alg == 'random-fit':
                 from .rwa import yen_random_fit
                 return yen_random_fit
+            elif wa_alg == 'most-used':
+                from .rwa import yen_most_used
+                return yen_most_used
+            elif wa_alg == 'least-used':
+                from .rwa import yen_least_used
+                return yen_least_used
             else:
                 raise ValueError('Unknown wavelength assignment '
                                  'algorithm "%s"' % wa_alg)
@@ -121,142 +234,1349 @@ def get_rwa_algorithm_from_args(r_alg: str, wa_alg: str, rwa_alg: str,
         raise ValueError('RWA algorithm not specified')
 
 
+def parse_algorithm(name: str) -> Tuple[Union[str, None], Union[str, None],
+                                        Union[str, None]]:
+    """Splits an algorithm identifier into its CLI string identifiers
+
+    Identifiers are the ones used to name result files, i.e., either the name
+    of a routine that performs RWA as one, such as "genetic-algorithm", or the
+    names of a routing and a wavelength assignment algorithm joined by an
+    underscore, such as "dijkstra_first-fit".
+
+    Args:
+        name: algorithm identifier
+
+    Returns:
+        :obj:`tuple`: identifiers for the routing, wavelength assignment and
+            RWA algorithms, as expected by `get_rwa_algorithm_from_args`
+
+    """
+    if '_' in name:
+        r_alg, wa_alg = name.split('_', 1)
+        return r_alg, wa_alg, None
+    return None, None, name
+
+
+class SimulationConfig(object):
+    """Typed set of parameters of a simulation
+
+    Either a routing and a wavelength assignment algorithm must be given in
+    combination, or a single algorithm that performs RWA as one. Identifiers
+    are the same ones accepted by the command line interface.
+
+    Alternatively, several algorithms may be given at once to be compared in
+    lockstep over the very same traffic (see `simulate`).
+
+    Args:
+        topology: short identifier for the network topology
+        channels: number of wavelength channels per network link
+        routing: identifier for a sole routing algorithm
+        wavelength: identifier for a sole wavelength assignment algorithm
+        rwa: identifier for a routine that performs RWA as one
+        k: number of alternate paths for Yen's routing algorithm
+        algorithms: identifiers of several algorithms to be compared, as
+            understood by `parse_algorithm`, instead of a single one
+        loads: network loads, in Erlangs, to be simulated in order
+        calls: number of connection requests per load (batch size when
+            `ci_width` is set)
+        num_sim: number of repetitions (maximum when `ci_width` is set)
+        seed: root seed of all random streams. If None, it is drawn from the
+            OS's entropy
+        jobs: number of worker processes to run repetitions on
+        independent_loads: simulate each load over a fresh network instance
+        ci_width: target relative half-width of the blocking probability's
+            confidence interval. If None, the number of calls and of
+            repetitions is fixed
+        confidence: confidence level of the confidence intervals
+        max_calls: maximum number of connection requests per load when
+            `ci_width` is set. Must allow for at least `MIN_CI_SAMPLES`
+            batches of `calls`, the fewest a confidence interval is trusted
+            from
+        pop_size: population size for the GA-RWA procedure
+        num_gen: number of generations for the GA-RWA procedure
+        cross_rate: crossover rate for the GA-RWA procedure
+        mut_rate: mutation rate for the GA-RWA procedure
+        checkpoint_dir: directory to periodically save the state of the
+            simulation to. If None, no checkpoints are saved
+        checkpoint_interval: minimum time, in seconds, between two
+            checkpoints of the same repetition
+        resume: resume an interrupted simulation from the checkpoints found
+            in `checkpoint_dir`, rather than starting over
+        refine: number of rounds of adaptive refinement of the load grid, run
+            after `loads` have been simulated (see `Simulator`)
+        refine_points: maximum number of loads added per refinement round
+        profile: accumulate the time spent on each phase of the simulation
+            loop and the latency of RWA decisions (see `PhaseProfile`)
+        trace_dir: directory to write a trace of every call to, along with
+            its blocking cause (see `EventTrace`). If None, no calls are
+            traced
+        trace_buffer: number of calls buffered between two writes to a trace
+        packed: hold the wavelength availability of each network link packed
+            as 64 λs per machine word (see `Network.pack`), which speeds up
+            simulations with many channels. Results are the same either way
+        traffic: traffic matrix calls are offered over, as understood by
+            `traffic_matrix`, i.e., either "uniform" or a matrix file, from
+            which the source and destination nodes of each call are drawn.
+            If None, all calls go between the source and destination nodes
+            of the topology
+
+    """
+
+    def __init__(self, topology: str = 'nsf', channels: int = 8,
+                 routing: Union[str, None] = None,
+                 wavelength: Union[str, None] = None,
+                 rwa: Union[str, None] = None, k: int = 2,
+                 algorithms: Sequence[str] = (),
+                 loads: Sequence[float] = tuple(range(1, 31)),
+                 calls: int = 150, num_sim: int = 1,
+                 seed: Union[int, None] = None, jobs: int = 1,
+                 independent_loads: bool = False,
+                 ci_width: Union[float, None] = None,
+                 confidence: float = 0.95, max_calls: int = 1000000,
+                 pop_size: int = 25, num_gen: int = 25,
+                 cross_rate: float = 0.40, mut_rate: float = 0.02,
+                 checkpoint_dir: Union[str, None] = None,
+                 checkpoint_interval: float = 300.0,
+                 resume: bool = False, refine: int = 0,
+                 refine_points: int = 5, profile: bool = False,
+                 trace_dir: Union[str, None] = None,
+                 trace_buffer: int = 65536, packed: bool = False,
+                 traffic: Union[str, None] = None) -> None:
+        self.topology: str = topology
+        self.channels: int = channels
+        self.routing: Union[str, None] = routing
+        self.wavelength: Union[str, None] = wavelength
+        self.rwa: Union[str, None] = rwa
+        self.k: int = k
+        self.compared: Tuple[str, ...] = tuple(algorithms)
+        self.loads: Tuple[float, ...] = tuple(loads)
+        self.calls: int = calls
+        self.num_sim: int = num_sim
+        self.seed: Union[int, None] = seed
+        self.jobs: int = jobs
+        self.independent_loads: bool = independent_loads
+        self.ci_width: Union[float, None] = ci_width
+        self.confidence: float = confidence
+        self.max_calls: int = max_calls
+        self.pop_size: int = pop_size
+        self.num_gen: int = num_gen
+        self.cross_rate: float = cross_rate
+        self.mut_rate: float = mut_rate
+        self.checkpoint_dir: Union[str, None] = checkpoint_dir
+        self.checkpoint_interval: float = checkpoint_interval
+        self.resume: bool = resume
+        self.refine: int = refine
+        self.refine_points: int = refine_points
+        self.profile: bool = profile
+        self.trace_dir: Union[str, None] = trace_dir
+        self.trace_buffer: int = trace_buffer
+        self.packed: bool = packed
+        self.traffic: Union[str, None] = traffic
+
+    @classmethod
+    def from_args(cls, args: Namespace) -> 'SimulationConfig':
+        """Builds a configuration from CLI arguments
+
+        Args:
+            args: set of arguments provided via CLI to argparse module
+
+        Returns:
+            SimulationConfig: the equivalent simulation configuration
+
+        """
+        return cls(topology=args.topology, channels=args.channels,
+                   routing=args.r, wavelength=args.w, rwa=args.rwa, k=args.y,
+                   algorithms=args.compare or (),
+                   loads=args.loads if args.loads is not None else
+                   range(1, args.load + 1), calls=args.calls,
+                   num_sim=args.num_sim, seed=args.seed, jobs=args.jobs,
+                   independent_loads=args.independent_loads or
+                   args.refine > 0,
+                   ci_width=args.ci_width, confidence=args.confidence,
+                   max_calls=args.max_calls, pop_size=args.pop_size,
+                   num_gen=args.num_gen, cross_rate=args.cross_rate,
+                   mut_rate=args.mut_rate,
+                   checkpoint_dir=args.checkpoint_dir,
+                   checkpoint_interval=args.checkpoint_interval,
+                   resume=args.resume, refine=args.refine,
+                   refine_points=args.refine_points, profile=args.profile,
+                   trace_dir=args.trace_dir, trace_buffer=args.trace_buffer,
+                   packed=args.packed, traffic=args.traffic)
+
+    @property
+    def algorithm(self) -> str:
+        """The RWA algorithm, or routing and wavelength assignment pair"""
+        if self.rwa is not None:
+            return self.rwa
+        return '%s_%s' % (self.routing, self.wavelength)
+
+    @property
+    def algorithms(self) -> Tuple[str, ...]:
+        """Identifiers of all the algorithms to be simulated"""
+        if self.compared:
+            return self.compared
+        return (self.algorithm,)
+
+    def validate(self) -> None:
+        """Checks the consistency of the parameters
+
+        Raises:
+            ValueError: if any of the parameters is out of its valid range, if
+                neither a single RWA algorithm nor a combination of both
+                routing and wavelength assignment algorithms is specified, if
+                any algorithm is unknown, or if the topology or the traffic
+                matrix cannot be found
+
+        """
+        if self.compared:
+            if self.routing is not None or self.wavelength is not None or \
+                    self.rwa is not None:
+                raise ValueError('Set either a single algorithm or a set of '
+                                 'algorithms to be compared.')
+            if len(self.compared) < 2:
+                raise ValueError('Expect at least two algorithms to '
+                                 'compare.')
+            if len(set(self.compared)) < len(self.compared):
+                raise ValueError('Algorithms to be compared should be '
+                                 'unique.')
+        elif self.rwa is None:
+            if self.routing is None or self.wavelength is None:
+                raise ValueError('Either a single RWA algorithm or both '
+                                 'routing and wavelength assignment '
+                                 'algorithms are required.')
+        elif self.routing is not None or self.wavelength is not None:
+            raise ValueError('Set either a single RWA algorithm or both '
+                             'routing and wavelength assignment algorithms.')
+        for name in self.algorithms:
+            routing, wavelength, rwa = parse_algorithm(name)
+            if rwa is not None:
+                if rwa not in RWA_ALGORITHMS:
+                    raise ValueError('Unknown algorithm "%s".' % name)
+            elif routing not in ROUTING_ALGORITHMS or \
+                    wavelength not in WAVELENGTH_ALGORITHMS:
+                raise ValueError('Unknown algorithm "%s".' % name)
+
+        if self.channels < 1:
+            raise ValueError('Expect a positive number of channels.')
+        from .net.loader import is_topology_file
+        from .net.synthetic import is_synthetic_topology
+        if is_topology_file(self.topology):
+            if not os.path.isfile(self.topology):
+                raise ValueError('No topology file "%s".' % self.topology)
+        elif is_synthetic_topology(self.topology):
+            # raises if the specification is malformed. The network is kept
+            # to be simulated over later on, so it is not generated twice
+            get_net_template(self.topology, self.channels)
+        elif self.topology not in ('nsf', 'clara', 'janet', 'rnp'):
+            raise ValueError('Unknown topology "%s".' % self.topology)
+        if self.traffic is not None and self.traffic != 'uniform' and \
+                not os.path.isfile(self.traffic):
+            raise ValueError('No traffic matrix file "%s".' % self.traffic)
+        if not self.loads or min(self.loads) <= 0:
+            raise ValueError('Expect a non-empty sequence of positive loads.')
+        if self.calls < 1:
+            raise ValueError('Expect a positive number of calls.')
+        if self.num_sim < 1:
+            raise ValueError('Expect a positive number of simulations.')
+        if self.jobs < 1:
+            raise ValueError('Expect a positive number of jobs.')
+        if self.ci_width is not None:
+            if self.ci_width <= 0:
+                raise ValueError('Expect a positive confidence interval '
+                                 'width.')
+            if not 0 < self.confidence < 1:
+                raise ValueError('Expect a confidence level between 0 and 1.')
+            if self.max_calls < MIN_CI_SAMPLES * self.calls:
+                raise ValueError('Maximum number of calls should be at least '
+                                 '%d times the number of calls per batch, '
+                                 'for the confidence interval to converge.'
+                                 % MIN_CI_SAMPLES)
+        if self.checkpoint_interval <= 0:
+            raise ValueError('Expect a positive checkpoint interval.')
+        if self.resume and self.checkpoint_dir is None:
+            raise ValueError('A checkpoint directory is required to resume '
+                             'from.')
+        if self.refine < 0:
+            raise ValueError('Expect a non-negative number of refinement '
+                             'rounds.')
+        if self.refine > 0:
+            if self.refine_points < 1:
+                raise ValueError('Expect a positive number of loads per '
+                                 'refinement round.')
+            if not self.independent_loads:
+                raise ValueError('Refinement of the load grid requires '
+                                 'loads to be simulated independently.')
+            if self.ci_width is not None:
+                raise ValueError('Refinement of the load grid requires a '
+                                 'fixed number of simulations.')
+            if len(self.loads) < 2:
+                raise ValueError('Expect at least two loads to refine the '
+                                 'grid in between.')
+        if self.trace_buffer < 1:
+            raise ValueError('Expect a positive trace buffer size.')
+
+
+class SimulationResult(object):
+    """Outcome of a simulation, in memory
+
+    Stores, for every repetition and load, the number of blocked calls, the
+    number of calls simulated, and the half-width of the batch-means
+    confidence interval of the blocking probability, along with the time
+    taken by each repetition.
+
+    Args:
+        loads: network loads, in Erlangs, the simulation runs over
+        algorithm: identifier of the algorithm simulated
+
+    """
+
+    def __init__(self, loads: Sequence[float],
+                 algorithm: Union[str, None] = None) -> None:
+        self._loads: Tuple[float, ...] = tuple(loads)
+        self._algorithm: Union[str, None] = algorithm
+        self._blocks: List[List[int]] = []
+        self._calls: List[List[int]] = []
+        self._ci: List[List[float]] = []
+        self._times: List[float] = []
+        self._profile: Union[PhaseProfile, None] = None
+
+    def append(self, blocks: List[int], calls: List[int], ci: List[float],
+               sim_time: float) -> None:
+        """Appends the outcome of a repetition
+
+        Args:
+            blocks: number of blocked calls per load
+            calls: number of calls simulated per load
+            ci: half-widths, as percentages, of the batch-means confidence
+                intervals per load (NaN if not computed)
+            sim_time: time, in seconds, taken by the repetition
+
+        """
+        self._blocks.append(list(blocks))
+        self._calls.append(list(calls))
+        self._ci.append(list(ci))
+        self._times.append(sim_time)
+
+    @property
+    def loads(self) -> Tuple[float, ...]:
+        """The network loads, in Erlangs"""
+        return self._loads
+
+    @property
+    def algorithm(self) -> Union[str, None]:
+        """The identifier of the algorithm simulated"""
+        return self._algorithm
+
+    @property
+    def nsims(self) -> int:
+        """The number of repetitions simulated"""
+        return len(self._times)
+
+    @property
+    def blocks(self) -> np.ndarray:
+        """The number of blocked calls, per repetition and load"""
+        return np.array(self._blocks, dtype=np.int64).reshape(
+            self.nsims, len(self._loads))
+
+    @property
+    def calls(self) -> np.ndarray:
+        """The number of calls simulated, per repetition and load"""
+        return np.array(self._calls, dtype=np.int64).reshape(
+            self.nsims, len(self._loads))
+
+    @property
+    def bp(self) -> np.ndarray:
+        """The blocking probabilities, as percentages, per repetition and
+        load"""
+        return 100.0 * self.blocks / self.calls
+
+    @property
+    def ci(self) -> np.ndarray:
+        """The half-widths, as percentages, of the batch-means confidence
+        intervals of the blocking probabilities, per repetition and load"""
+        return np.array(self._ci, dtype=np.float64).reshape(
+            self.nsims, len(self._loads))
+
+    @property
+    def times(self) -> List[float]:
+        """The time, in seconds, taken by each repetition"""
+        return list(self._times)
+
+    @property
+    def profile(self) -> Union[PhaseProfile, None]:
+        """The time per phase and RWA latency, accumulated over all
+        repetitions, if profiled"""
+        return self._profile
+
+    @profile.setter
+    def profile(self, profile: Union[PhaseProfile, None]) -> None:
+        self._profile = profile
+
+    def merge(self, other: 'SimulationResult') -> 'SimulationResult':
+        """Combines with the outcome of the same repetitions at other loads
+
+        Args:
+            other: outcome of the same algorithm and number of repetitions,
+                simulated over a different set of loads
+
+        Returns:
+            SimulationResult: outcome over both sets of loads, sorted in
+                ascending order, with the time of each repetition added up
+
+        Raises:
+            ValueError: if the number of repetitions does not match
+
+        """
+        if other.nsims != self.nsims:
+            raise ValueError('Cannot merge results of %d and %d simulations'
+                             % (self.nsims, other.nsims))
+        loads = self._loads + other.loads
+        order = np.argsort(loads, kind='stable')
+        merged = SimulationResult([loads[i] for i in order], self._algorithm)
+        for blocks, calls, ci, sim_time in zip(
+                np.hstack((self.blocks, other.blocks))[:, order].tolist(),
+                np.hstack((self.calls, other.calls))[:, order].tolist(),
+                np.hstack((self.ci, other.ci))[:, order].tolist(),
+                np.add(self._times, other.times).tolist()):
+            merged.append(blocks, calls, ci, sim_time)
+        if self._profile is not None or other.profile is not None:
+            merged.profile = PhaseProfile()
+            for profile in (self._profile, other.profile):
+                if profile is not None:
+                    merged.profile.add(profile)
+        return merged
+
+    def confidence_interval(self, confidence: float = 0.95
+                            ) -> Tuple[np.ndarray, np.ndarray]:
+        """Across-replication estimate of the blocking probabilities
+
+        Args:
+            confidence: confidence level of the intervals
+
+        Returns:
+            :obj:`tuple`: mean blocking probabilities and half-widths of their
+                confidence intervals, as percentages, per load
+
+        """
+        intervals = [confidence_interval(bp, confidence) for bp in self.bp.T]
+        return (np.array([mean for mean, _ in intervals]),
+                np.array([halfwidth for _, halfwidth in intervals]))
+
+
+def serve_call(net: Network, scheduler: DepartureScheduler, rwa: Callable,
+               k: int, holding_time: float) -> bool:
+    """Routes an incoming call and allocates resources to it if possible
+
+    Args:
+        net: Network topology instance
+        scheduler: departure scheduler managing the network's resources
+        rwa: RWA algorithm, as returned by `get_rwa_algorithm_from_args`
+        k: number of alternate paths
+        holding_time: time the call occupies network resources if allocated
+
+    Returns:
+        :obj:`bool`: True if the call was allocated, False if blocked
+
+    """
+    # Call RWA algorithm, which returns a lightpath if successful or None if
+    # no λ can be found available
+    lightpath = rwa(net, k)
+
+    # If lightpath is non None, the RWA algorithm thinks it can allocate on
+    # that λ. First-fit and random-fit only pick λs available along the whole
+    # path, but other algorithms (e.g., vertex coloring) might not, so we
+    # still need to check whether that same wavelength is available on every
+    # link along the path in order to reach the destination node.
+    if lightpath is None:
+        return False
+
+    # allocate resources on the network for the lightpath and schedule its
+    # departure only if the color chosen is available on all links of the
+    # route, both in a single step
+    lightpath.holding_time = holding_time
+    return scheduler.try_allocate(lightpath)
+
+
+def _traced_call(net: Network, scheduler: DepartureScheduler, rwa: Callable,
+                 k: int, holding_time: float, trace: EventTrace) -> bool:
+    """Serves a call just like `serve_call`, recording it into a trace
+
+    Blocked calls are told apart by cause: either the RWA algorithm returned
+    no lightpath at all, or the λ it chose is busy on some link along the
+    route, which is recorded as well.
+
+    """
+    lightpath = rwa(net, k)
+    if lightpath is None:
+        trace.record(scheduler.clock, holding_time, None, -1, BLOCKED_RWA)
+        return False
+
+    lightpath.holding_time = holding_time
+    if not scheduler.try_allocate(lightpath):
+        available = link_availability(net, lightpath.r)[:, lightpath.w]
+        busy = int(np.argmin(available))
+        trace.record(scheduler.clock, holding_time, lightpath.r,
+                     lightpath.w, BLOCKED_CONTINUITY,
+                     (lightpath.r[busy], lightpath.r[busy + 1]))
+        return False
+
+    trace.record(scheduler.clock, holding_time, lightpath.r, lightpath.w,
+                 ALLOCATED)
+    return True
+
+
+def _profiled_call(net: Network, scheduler: DepartureScheduler,
+                   rwa: Callable, k: int, holding_time: float,
+                   until_next: float, phase_time: List[float],
+                   latency: List[int],
+                   trace: Union[EventTrace, None] = None) -> bool:
+    """Serves a call and advances the clock, timing every phase of it
+
+    Does the very same as `serve_call` followed by the scheduler's `advance`,
+    accumulating the time spent on each of the `PHASES` into `phase_time` and
+    counting the latency of the RWA decision into the `latency` histogram.
+    The call is recorded into `trace`, if any, as `_traced_call` does, out of
+    the timed phases.
+
+    """
+    start = default_timer()
+    lightpath = rwa(net, k)
+    end = default_timer()
+    phase_time[0] += end - start
+    latency[latency_bin(end - start)] += 1
+
+    allocated = False
+    if lightpath is None:
+        if trace is not None:
+            trace.record(scheduler.clock, holding_time, None, -1, BLOCKED_RWA)
+    else:
+        start = end
+        allocated = bool(path_availability(net, lightpath.r)[lightpath.w])
+        end = default_timer()
+        phase_time[1] += end - start
+
+        if trace is not None:
+            if allocated:
+                trace.record(scheduler.clock, holding_time, lightpath.r,
+                             lightpath.w, ALLOCATED)
+            else:
+                available = link_availability(net, lightpath.r)
+                busy = int(np.argmin(available[:, lightpath.w]))
+                trace.record(scheduler.clock, holding_time, lightpath.r,
+                             lightpath.w, BLOCKED_CONTINUITY,
+                             (lightpath.r[busy], lightpath.r[busy + 1]))
+            end = default_timer()
+
+        if allocated:
+            start = end
+            lightpath.holding_time = holding_time
+            scheduler.allocate(lightpath)
+            end = default_timer()
+            phase_time[2] += end - start
+
+    start = end
+    scheduler.advance(until_next)
+    phase_time[3] += default_timer() - start
+    return allocated
+
+
+def _traffic(config: SimulationConfig
+             ) -> Tuple[Union[PairDistribution, None], RouteTable]:
+    """Pairs of nodes calls go between, and routes precomputed between them
+
+    Both depend on the topology and traffic matrix only, so they are built
+    once per process and shared by all repetitions and algorithms. Routes
+    are computed only as needed by the routing algorithms simulated.
+
+    Returns:
+        :obj:`tuple`: distribution of the pairs of nodes, or None if all
+            calls go between the topology's source and destination nodes,
+            and table of routes between them
+
+    """
+    routings = frozenset(parse_algorithm(name)[0]
+                         for name in config.algorithms)
+    key = (config.topology, config.traffic, config.k, routings)
+    if key not in _traffic_cache:
+        net = get_net_template(config.topology, config.channels)
+        if config.traffic is None:
+            pairs, endpoints = None, [(net.s, net.d)]
+        else:
+            pairs = PairDistribution(traffic_matrix(config.traffic,
+                                                    net.nnodes))
+            endpoints = pairs.pairs.tolist()
+        routes = RouteTable(net.a, endpoints, 'dijkstra' in routings,
+                            config.k if 'yen' in routings else 0)
+        _traffic_cache[key] = pairs, routes
+    return _traffic_cache[key]
+
+
+class SimulationStopped(Exception):
+    """Raised by `simulate` when asked to stop a repetition midway"""
+
+
+def simulate(config: SimulationConfig, entropy: int, simulation: int,
+             loads: Sequence[float],
+             progress: Union[ProgressReporter, None] = None,
+             checkpoint: Union[Checkpoint, None] = None,
+             stop: Union['Event', None] = None
+             ) -> List[Tuple[List[int], List[int], List[float], float,
+                             Union[PhaseProfile, None]]]:
+    """Runs a single repetition of the simulation over a sequence of loads
+
+    A network is instantiated once and traffic is offered to it at each load
+    in turn, so the state of the network carries over from one load to the
+    next. This function is self-contained on purpose, so that repetitions can
+    be dispatched to worker processes.
+
+    Calls go between the source and destination nodes of the topology, or
+    between pairs of nodes drawn from `config.traffic`, and are routed over
+    routes precomputed for every such pair.
+
+    Calls arrive in batches of `config.calls`. A single batch is simulated per
+    load, unless a target relative half-width `config.ci_width` is set, in
+    which case batches keep coming until the batch-means confidence interval
+    of the blocking probability is narrow enough or `config.max_calls` is
+    reached.
+
+    When several algorithms are configured, they are simulated in lockstep:
+    each one runs over its own, identically initialised network, but all of
+    them consume the same arrival trace, which is generated only once. Each
+    algorithm also keeps its own state of NumPy's global RNG, so its numbers
+    are exactly the ones it would get if simulated alone (common random
+    numbers).
+
+    If `config.profile` is set, the time spent on each phase of every call
+    (see `PHASES`) and the latency of every RWA decision are accumulated
+    into a `PhaseProfile` per algorithm.
+
+    If `config.trace_dir` is set, every call is recorded, along with the
+    cause of its blocking, if blocked, into an `EventTrace` per algorithm,
+    named after the algorithm, the repetition and, when loads are simulated
+    independently, the load.
+
+    If a checkpoint is given, the whole state of the repetition (networks,
+    pending departures, random streams and partial counters) is saved to it
+    every `config.checkpoint_interval` seconds, and so is the outcome once
+    the repetition is over. Should the checkpoint already hold a state, the
+    repetition resumes from there instead of starting over.
+
+    If a stop event is given, it is checked every `STOP_CHECK_CALLS` calls,
+    and the repetition is abandoned as soon as it is set.
+
+    Args:
+        config: parameters of the simulation
+        entropy: root entropy from which all random streams derive
+        simulation: index of the repetition
+        loads: network loads, in Erlangs, to be simulated in order
+        progress: reporter to keep track of the progress of each load. When
+            comparing algorithms, blocks refer to the first one
+        checkpoint: where to save the state of the repetition to, and resume
+            it from
+        stop: event telling the repetition is no longer wanted
+
+    Returns:
+        :obj:`list` of :obj:`tuple`: for each algorithm, the number of
+            blocked calls, the number of calls simulated, and the half-width
+            of the batch-means confidence interval of the blocking
+            probability (NaN when not computed), per load, plus the time, in
+            seconds, taken by the repetition or, when comparing, spent
+            serving that algorithm's calls, and its profile (None unless
+            `config.profile` is set)
+
+    Raises:
+        SimulationStopped: if `stop` gets set before the repetition is over
+
+    """
+    start = default_timer()
+    state = checkpoint.load() if checkpoint is not None else None
+    if state is not None and state['results'] is not None:
+        return state['results']
+
+    # network instantiation and some of the RWA algorithms still draw
+    # from NumPy's global RNG, so it gets seeded as well for the sake of
+    # reproducibility
+    if len(loads) == 1 and config.independent_loads:
+        sequence = seed_sequence(entropy, simulation, loads[0], 0)
+    else:
+        sequence = seed_sequence(entropy, simulation)
+    seed = sequence.generate_state(1)
+
+    pairs, routes = _traffic(config)
+    endpoints: List[List[int]] = \
+        pairs.pairs.tolist() if pairs is not None else []
+
+    nets, schedulers, rwas, states = [], [], [], []
+    for name in config.algorithms:
+        np.random.seed(seed)
+        net = get_net_template(config.topology, config.channels).clone()
+        if config.packed:
+            net.pack()
+        net.reset()
+        net.routes = routes
+        routing, wavelength, rwa = parse_algorithm(name)
+        rwas.append(get_rwa_algorithm_from_args(routing, wavelength, rwa,
+                                                config.pop_size,
+                                                config.num_gen,
+                                                config.cross_rate,
+                                                config.mut_rate))
+        nets.append(net)
+        schedulers.append(DepartureScheduler(net))
+        states.append(np.random.get_state())
+
+    traces = None
+    if config.trace_dir is not None:
+        os.makedirs(config.trace_dir, exist_ok=True)
+        offsets = state['traces'] if state is not None else \
+            [None for _ in nets]
+        traces = [EventTrace(_trace_path(config, name, simulation, loads),
+                             net.nnodes, config.trace_buffer, offset)
+                  for name, net, offset in zip(config.algorithms, nets,
+                                               offsets)]
+
+    lanes = range(len(nets))
+    lockstep = len(nets) > 1
+    if progress is not None and not progress.enabled:
+        progress = None  # keep the hot loop free of any reporting
+    if state is None:
+        first_load = 0
+        blocklist: List[List[int]] = [[] for _ in lanes]
+        calllist: List[List[int]] = [[] for _ in lanes]
+        cilist: List[List[float]] = [[] for _ in lanes]
+        busy_time = [0.0 for _ in lanes]
+        profiles = [PhaseProfile() for _ in lanes] if config.profile else None
+    else:
+        first_load = state['load']
+        blocklist = state['blocklist']
+        calllist = state['calllist']
+        cilist = state['cilist']
+        busy_time = state['busy_time']
+        profiles = state['profiles']
+        states = state['rng']
+        for scheduler, snapshot in zip(schedulers, state['networks']):
+            scheduler.restore(snapshot)
+        np.random.set_state(states[0])
+        start -= state['elapsed']
+
+    # ascending loop through Erlangs
+    for idx in range(first_load, len(loads)):
+        load = loads[idx]
+
+        # @until_next: time until the next call arrives
+        # @holding_time: time an allocated call occupies net resources
+        rng = np.random.default_rng(seed_sequence(entropy, simulation, load))
+        arrivals = ArrivalProcess(load, rng, pairs=pairs)
+        if state is None:
+            blocks = [0 for _ in lanes]
+            calls = 0
+            batch_bp: List[List[float]] = [[] for _ in lanes]
+            batch_blocks = [0 for _ in lanes]
+            first_call = 0
+        else:
+            # pick up within the load the checkpoint was taken at
+            blocks = state['blocks']
+            calls = state['calls']
+            batch_bp = state['batch_bp']
+            batch_blocks = state['batch_blocks']
+            first_call = state['call']
+            arrivals.restore(state['arrivals'])
+            state = None
+        trace = iter(arrivals)
+        if traces is not None:
+            for event_trace in traces:
+                event_trace.load = load
+        if profiles is not None:
+            counters = [PhaseProfile.counters() for _ in lanes]
+        if progress is not None:
+            progress.begin(simulation, load)
+        while True:
+            for call, (until_next, holding_time, pair) in zip(
+                    range(first_call, config.calls), trace):
+                if stop is not None and not call % STOP_CHECK_CALLS and \
+                        stop.is_set():
+                    if traces is not None:
+                        for event_trace in traces:
+                            event_trace.close()
+                    raise SimulationStopped('Simulation %d stopped at load %s'
+                                            % (simulation, load))
+                if progress is not None:
+                    progress.update(calls + call, blocks[0] + batch_blocks[0])
+                if pair is not None:
+                    s, d = endpoints[pair]
+                    for net in nets:
+                        net.s, net.d = s, d
+
+                for a in lanes:
+                    if lockstep:
+                        np.random.set_state(states[a])
+                        lane_start = default_timer()
+
+                    if profiles is None:
+                        if traces is None:
+                            if not serve_call(nets[a], schedulers[a],
+                                              rwas[a], config.k,
+                                              holding_time):
+                                batch_blocks[a] += 1
+                        elif not _traced_call(nets[a], schedulers[a],
+                                              rwas[a], config.k,
+                                              holding_time, traces[a]):
+                            batch_blocks[a] += 1
+
+                        # Move the simulation clock forward to the arrival of
+                        # the next call, releasing only the connections that
+                        # departed meanwhile
+                        schedulers[a].advance(until_next)
+                    elif not _profiled_call(nets[a], schedulers[a], rwas[a],
+                                            config.k, holding_time,
+                                            until_next, *counters[a],
+                                            traces[a] if traces is not None
+                                            else None):
+                        batch_blocks[a] += 1
+
+                    if lockstep:
+                        busy_time[a] += default_timer() - lane_start
+                        states[a] = np.random.get_state()
+
+                if checkpoint is not None and checkpoint.due():
+                    if not lockstep:
+                        states[0] = np.random.get_state()
+                    if profiles is not None:
+                        for profile, counter in zip(profiles, counters):
+                            profile.record(load, *counter)
+                        counters = [PhaseProfile.counters() for _ in lanes]
+                    checkpoint.save({
+                        'results': None,
+                        'traces': [event_trace.flush()
+                                   for event_trace in traces]
+                        if traces is not None else None,
+                        'load': idx,
+                        'call': call + 1,
+                        'calls': calls,
+                        'blocks': blocks,
+                        'batch_blocks': batch_blocks,
+                        'batch_bp': batch_bp,
+                        'arrivals': arrivals.state,
+                        'networks': [s.snapshot() for s in schedulers],
+                        'rng': states,
+                        'blocklist': blocklist,
+                        'calllist': calllist,
+                        'cilist': cilist,
+                        'busy_time': busy_time,
+                        'profiles': profiles,
+                        'elapsed': default_timer() - start,
+                    })
+
+            calls += config.calls
+            for a in lanes:
+                blocks[a] += batch_blocks[a]
+                batch_bp[a].append(batch_blocks[a] / config.calls)
+            batch_blocks = [0 for _ in lanes]
+            first_call = 0
+
+            if config.ci_width is None:
+                halfwidths = [float('nan') for _ in lanes]
+                break
+
+            intervals = [confidence_interval(bp, config.confidence)
+                         for bp in batch_bp]
+            halfwidths = [halfwidth for _, halfwidth in intervals]
+            if calls >= MIN_CI_SAMPLES * config.calls and \
+                    all(ci_converged(mean, halfwidth, config.ci_width)
+                        for mean, halfwidth in intervals):
+                break
+            if calls + config.calls > config.max_calls:
+                logger.warning('Load %s did not reach the target CI within '
+                               '%d calls' % (load, calls))
+                break
+
+        if progress is not None:
+            progress.end(calls, blocks[0])
+        if profiles is not None:
+            for profile, counter in zip(profiles, counters):
+                profile.record(load, *counter)
+        for a in lanes:
+            blocklist[a].append(blocks[a])
+            calllist[a].append(calls)
+            cilist[a].append(100.0 * halfwidths[a])
+
+    if traces is not None:
+        for event_trace in traces:
+            event_trace.close()
+    if not lockstep:
+        busy_time[0] = default_timer() - start
+    lane_profiles: List[Union[PhaseProfile, None]] = \
+        list(profiles) if profiles is not None else [None for _ in lanes]
+    results: List[Tuple[List[int], List[int], List[float], float,
+                        Union[PhaseProfile, None]]] = \
+        list(zip(blocklist, calllist, cilist, busy_time, lane_profiles))
+    if checkpoint is not None:
+        checkpoint.save({'results': results})
+    return results
+
+
+def _trace_path(config: SimulationConfig, name: str, simulation: int,
+                loads: Sequence[float]) -> str:
+    """Trace file of an algorithm in a single task"""
+    if config.trace_dir is None:
+        raise ValueError('Event traces are not enabled')
+    if config.independent_loads:
+        filename = '%s_sim%d_load%g.trace' % (name, simulation, loads[0])
+    else:
+        filename = '%s_sim%d.trace' % (name, simulation)
+    return os.path.join(config.trace_dir, filename)
+
+
+def _fingerprint(config: SimulationConfig) -> Dict[str, object]:
+    """Parameters a simulation cannot be resumed under different values of"""
+    return {key: value for key, value in vars(config).items()
+            if key not in Simulator._RESUMABLE}
+
+
+def _task_checkpoint(config: SimulationConfig,
+                     task: Tuple[int, Tuple[float, ...]],
+                     entropy: Union[int, None] = None) -> Checkpoint:
+    """Checkpoint of a single task, i.e., repetition (and load)
+
+    Snapshots are owned by the parameters of the simulation and the root
+    entropy its random streams derive from, so a task never resumes from the
+    state of another simulation left behind in the same directory.
+    """
+    if config.checkpoint_dir is None:
+        raise ValueError('Checkpoints are not enabled')
+    simulation, loads = task
+    if config.independent_loads:
+        filename = 'sim%d_load%g.ckpt' % (simulation, loads[0])
+    else:
+        filename = 'sim%d.ckpt' % simulation
+    return Checkpoint(os.path.join(config.checkpoint_dir, filename),
+                      config.checkpoint_interval,
+                      (_fingerprint(config), entropy))
+
+
+def _simulate_task(config: SimulationConfig, entropy: int,
+                   progress: ProgressReporter,
+                   task: Tuple[int, Tuple[float, ...]]
+                   ) -> List[Tuple[List[int], List[int], List[float], float,
+                                   Union[PhaseProfile, None]]]:
+    """Wraps `simulate` so it can be mapped over tasks"""
+    checkpoint = _task_checkpoint(config, task, entropy) \
+        if config.checkpoint_dir is not None else None
+    return simulate(config, entropy, task[0], task[1], progress, checkpoint,
+                    _stop)
+
+
+def _init_worker(stop: 'Event') -> None:
+    """Hands the stop event over to a worker process"""
+    global _stop
+    _stop = stop
+
+
+class Simulator(object):
+    """RWA simulator over WDM networks as a library
+
+    Runs the simulation described by a `SimulationConfig` and returns its
+    outcome as a `SimulationResult`, in memory, without touching the disk nor
+    the standard output (unless a verbose progress reporter is given or
+    checkpoints are enabled).
+
+    Repetitions are independent from each other, so they may be fanned out
+    to a pool of `config.jobs` worker processes. If `config.independent_loads`
+    is set, each load is simulated over a fresh network instance as well, so
+    every (repetition, load) pair becomes a task on its own. Either way,
+    results come out in a deterministic order.
+
+    If a target relative half-width `config.ci_width` is set, the number of
+    calls per load is adaptive (see `simulate`), and the number of
+    repetitions `config.num_sim` becomes a maximum: the simulation stops as
+    soon as the across-replication confidence interval of the blocking
+    probability of every load (and algorithm) is narrow enough.
+
+    If `config.checkpoint_dir` is set, every task periodically saves its state
+    under that directory, and so does the simulator whenever a repetition is
+    delivered. With `config.resume` set as well, a simulation that was
+    interrupted picks up from there: delivered repetitions are made available
+    via `restored` rather than simulated again, and the remaining tasks resume
+    from their last checkpoint.
+
+    If `config.refine` is set, `run_all` goes on after the loads configured
+    have been simulated, for as many rounds: each one splits in half the
+    `config.refine_points` intervals between consecutive loads across which
+    the average blocking probability varies the most, i.e., around the knee
+    of the curve, and simulates those new loads only. Every (repetition,
+    load) pair draws from its own random stream, so results at each load do
+    not depend on the grid it happens to be simulated within.
+
+    Example:
+        >>> config = SimulationConfig(topology='nsf', channels=8,
+        ...                           routing='dijkstra',
+        ...                           wavelength='first-fit',
+        ...                           loads=range(1, 11), seed=0)
+        >>> result = Simulator(config).run()
+        >>> result.bp.mean(axis=0)  # doctest: +SKIP
+
+    Args:
+        config: parameters of the simulation
+        progress: reporter to keep track of the progress of the simulation.
+            Defaults to a silent one
+
+    Raises:
+        ValueError: if the configuration is not valid, or if it does not
+            match the one of the checkpoint to be resumed
+
+    """
+
+    # parameters that may change from one run to its resumption
+    _RESUMABLE = ('num_sim', 'jobs', 'checkpoint_dir', 'checkpoint_interval',
+                  'resume', 'trace_buffer', 'packed')
+
+    def __init__(self, config: SimulationConfig,
+                 progress: Union[ProgressReporter, None] = None) -> None:
+        config.validate()
+        self._config: SimulationConfig = config
+        self._progress: ProgressReporter = \
+            progress if progress is not None else ProgressReporter()
+        self._checkpoint: Union[Checkpoint, None] = None
+        self._restored: List[Tuple[int, str, List[int], List[int],
+                                   List[float], float]] = []
+        self._profiles: Dict[str, PhaseProfile] = {
+            name: PhaseProfile() for name in config.algorithms
+        } if config.profile else {}
+
+        # root entropy every per-simulation, per-load random stream derives
+        # from, an int as long as the seed is one or None
+        self._entropy: int = cast(
+            int, np.random.SeedSequence(config.seed).entropy)
+
+        if config.checkpoint_dir is None:
+            return
+        self._checkpoint = Checkpoint(
+            os.path.join(config.checkpoint_dir, 'simulation.ckpt'),
+            owner=_fingerprint(config))
+        state = self._checkpoint.load() if config.resume else None
+        if state is None:
+            if config.resume:
+                logger.warning('No checkpoint found in "%s", starting over'
+                               % config.checkpoint_dir)
+            return
+        self._entropy = state['entropy']
+        self._restored = state['repetitions']
+        self._profiles = state['profiles']
+
+    @property
+    def config(self) -> SimulationConfig:
+        """The parameters of the simulation"""
+        return self._config
+
+    @property
+    def profiles(self) -> Dict[str, PhaseProfile]:
+        """The profile of each algorithm, accumulated over the repetitions
+        delivered so far (empty unless `config.profile` is set)"""
+        return dict(self._profiles)
+
+    @property
+    def restored(self) -> List[Tuple[int, str, List[int], List[int],
+                                     List[float], float]]:
+        """The repetitions delivered by the run being resumed, as yielded by
+        `repetitions`"""
+        return list(self._restored)
+
+    def repetitions(self) -> Iterator[Tuple[int, str, List[int], List[int],
+                                            List[float], float]]:
+        """Runs the simulation, yielding each repetition as it completes
+
+        Repetitions listed in `restored` are not simulated again, and thus
+        not yielded either.
+
+        Yields:
+            :obj:`tuple`: index of the repetition, identifier of the
+                algorithm, number of blocked calls, number of calls simulated
+                and half-width of the batch-means confidence interval of the
+                blocking probability per load, and time taken by the
+                repetition, in seconds. Algorithms compared in lockstep are
+                yielded one after the other for each repetition
+
+        """
+        config = self._config
+        loads = config.loads
+        names = config.algorithms
+        entropy = self._entropy
+        delivered = list(self._restored)
+        done = {simulation for simulation, *_ in delivered}
+
+        tasks: List[Tuple[int, Tuple[float, ...]]]
+        if config.independent_loads:
+            tasks = [(simulation, (load,))
+                     for simulation in range(config.num_sim)
+                     if simulation not in done
+                     for load in loads]
+        else:
+            tasks = [(simulation, loads)
+                     for simulation in range(config.num_sim)
+                     if simulation not in done]
+
+        if self._checkpoint is not None:
+            os.makedirs(os.path.dirname(self._checkpoint.path), exist_ok=True)
+            if not config.resume:
+                # leftovers of a previous run must not be resumed by tasks
+                for task in tasks:
+                    _task_checkpoint(config, task).remove()
+            self._checkpoint.save({'entropy': entropy,
+                                   'repetitions': delivered,
+                                   'profiles': self._profiles})
+
+        # per-call progress is reported by worker processes only if they
+        # would not clutter each other's console line
+        results: Iterator[List[Tuple[List[int], List[int], List[float],
+                                     float, Union[PhaseProfile, None]]]]
+        if config.jobs > 1:
+            stop = multiprocessing.Event()
+            executor = ProcessPoolExecutor(config.jobs,
+                                           initializer=_init_worker,
+                                           initargs=(stop,))
+            worker_progress: ProgressReporter
+            if isinstance(self._progress, JsonProgressReporter):
+                worker_progress = self._progress
+            else:
+                worker_progress = ProgressReporter()
+            futures = [executor.submit(_simulate_task, config, entropy,
+                                       worker_progress, task)
+                       for task in tasks]
+            results = (future.result() for future in futures)
+        else:
+            executor = None
+            results = map(partial(_simulate_task, config, entropy,
+                                  self._progress), tasks)
+
+        try:
+            # results come in the same order of the tasks
+            bp_per_simulation = [
+                [[b / c for b, c in zip(blocks, calls)]
+                 for _, other, blocks, calls, _, _ in delivered
+                 if other == name]
+                for name in names]
+            blocklists: List[List[int]] = [[] for _ in names]
+            calllists: List[List[int]] = [[] for _ in names]
+            cilists: List[List[float]] = [[] for _ in names]
+            sim_times = [0.0 for _ in names]
+            simulation_tasks = []
+            for task, task_results in zip(tasks, results):
+                simulation = task[0]
+                simulation_tasks.append(task)
+                for a, (blocks, calls, ci, task_time, profile) in \
+                        enumerate(task_results):
+                    blocklists[a] += blocks
+                    calllists[a] += calls
+                    cilists[a] += ci
+                    sim_times[a] += task_time
+                    if profile is not None:
+                        self._profiles[names[a]].add(profile)
+                if len(blocklists[0]) < len(loads):
+                    continue
+
+                for a, name in enumerate(names):
+                    yield (simulation, name, blocklists[a], calllists[a],
+                           cilists[a], sim_times[a])
+                    bp_per_simulation[a].append(
+                        [b / c for b, c in zip(blocklists[a], calllists[a])])
+                    delivered.append((simulation, name, blocklists[a],
+                                      calllists[a], cilists[a], sim_times[a]))
+
+                # the repetition is in the hands of the caller by now, so it
+                # is safe to forget about its tasks
+                if self._checkpoint is not None:
+                    self._checkpoint.save({'entropy': entropy,
+                                           'repetitions': delivered,
+                                           'profiles': self._profiles})
+                    for simulation_task in simulation_tasks:
+                        _task_checkpoint(config, simulation_task).remove()
+
+                blocklists = [[] for _ in names]
+                calllists = [[] for _ in names]
+                cilists = [[] for _ in names]
+                sim_times = [0.0 for _ in names]
+                simulation_tasks = []
+
+                # check whether further repetitions are still worth it
+                if config.ci_width is not None and \
+                        len(bp_per_simulation[0]) >= MIN_CI_SAMPLES:
+                    intervals = [confidence_interval(bp, config.confidence)
+                                 for bps in bp_per_simulation
+                                 for bp in zip(*bps)]
+                    if all(ci_converged(mean, halfwidth, config.ci_width)
+                           for mean, halfwidth in intervals):
+                        logger.info('Target CI reached after %d simulations'
+                                    % len(bp_per_simulation[0]))
+                        break
+        finally:
+            if executor is not None:
+                # repetitions still pending once the target CI is reached (or
+                # the caller stops iterating) are of no use. Those not started
+                # yet are cancelled, and the workers running the others are
+                # told to stop rather than waited for, so no process outlives
+                # the simulation by more than `STOP_CHECK_CALLS` calls
+                stop.set()
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=True)
+
+    def run_all(self) -> Dict[str, SimulationResult]:
+        """Runs the whole simulation, for every algorithm configured
+
+        Returns:
+            :obj:`dict`: blocked calls and timings per repetition and load,
+                as a `SimulationResult`, keyed by algorithm identifier. Any
+                `restored` repetitions come first. Loads added by the
+                refinement of the grid, if any, are included
+
+        """
+        results = {name: SimulationResult(self._config.loads, name)
+                   for name in self._config.algorithms}
+        for _, name, blocks, calls, ci, sim_time in self._restored:
+            results[name].append(blocks, calls, ci, sim_time)
+        for _, name, blocks, calls, ci, sim_time in self.repetitions():
+            results[name].append(blocks, calls, ci, sim_time)
+        for name, profile in self._profiles.items():
+            results[name].profile = profile
+
+        for refinement in range(1, self._config.refine + 1):
+            loads = refine_loads(
+                next(iter(results.values())).loads,
+                [result.bp.mean(axis=0) for result in results.values()],
+                self._config.refine_points)
+            if not loads:
+                break
+            logger.info('Refining the load grid with %s Erlangs'
+                        % ', '.join('%g' % load for load in loads))
+            config = copy.copy(self._config)
+            config.loads = tuple(loads)
+            config.seed = self._entropy  # same random streams, other loads
+            config.refine = 0
+            if config.checkpoint_dir is not None:
+                config.checkpoint_dir = os.path.join(
+                    config.checkpoint_dir, 'refine%d' % refinement)
+            for name, result in \
+                    Simulator(config, self._progress).run_all().items():
+                results[name] = results[name].merge(result)
+        return results
+
+    def run(self) -> SimulationResult:
+        """Runs the whole simulation of a single algorithm
+
+        Returns:
+            SimulationResult: blocked calls and timings per repetition and load
+
+        Raises:
+            ValueError: if several algorithms are to be compared, in which
+                case `run_all` should be used instead
+
+        """
+        if len(self._config.algorithms) > 1:
+            raise ValueError('Several algorithms configured, use run_all()')
+        return self.run_all()[self._config.algorithm]
+
+
+def _report(args: Namespace, config: SimulationConfig,
+            progress: ProgressReporter, name: str, result: SimulationResult,
+            simulation: int, row: int, labelled: bool) -> None:
+    """Reports a repetition and appends it to the result files"""
+    blocks_per_erlang = result.bp[row].tolist()
+    cilist = result.ci[row].tolist() if config.ci_width is not None else []
+
+    progress.result(simulation, result.blocks[row].tolist(),
+                    blocks_per_erlang, cilist, result.times[row],
+                    name if labelled else None)
+
+    fbase = _result_basename(config, name)
+    write_bp_to_disk(args.result_dir, fbase + '.bp', blocks_per_erlang)
+    if config.ci_width is not None:
+        write_ci_to_disk(args.result_dir, fbase + '.ci', cilist)
+
+
+def _result_basename(config: SimulationConfig, name: str) -> str:
+    """Base name of the result files of an algorithm"""
+    topology = os.path.splitext(os.path.basename(config.topology))[0]
+    topology = re.sub('[:,=]', '-', topology)  # synthetic topologies
+    return '%s_%dch_%dreq_%s' % (name, config.channels, config.calls,
+                                 topology)
+
+
 def simulator(args: Namespace) -> None:
     """Main RWA simulation routine over WDM networks
 
     The loop levels of the simulator iterate over the number of repetitions,
     (simulations), the number of Erlangs (load), and the number of connection
     requests (calls) to be either allocated on the network or blocked if no
-    resources happen to be available.
+    resources happen to be available. See `Simulator` for details.
+
+    Progress and results are reported as requested via `args.progress`, and
+    blocking probabilities (along with their confidence intervals, if any)
+    are appended to text files under `args.result_dir` as each repetition
+    completes, one set of files per algorithm. When resuming from a
+    checkpoint, only the repetitions that had not been written yet are. When
+    the load grid is refined, repetitions are only complete, and thus
+    written, once the last refinement round is over. Analytical estimates
+    of the blocking probabilities, if requested via `args.estimate`, are
+    written to `.est` files before simulating.
 
     Args:
         args: set of arguments provided via CLI to argparse module
 
     """
+    config = SimulationConfig.from_args(args)
+    progress = get_progress_reporter(args.progress, args.progress_interval)
+    progress.header(config.loads)
+
+    if args.estimate:
+        for name in config.algorithms:
+            routing, _, _ = parse_algorithm(name)
+            if routing is None:
+                logger.warning('No analytical model for %s' % name)
+                continue
+            write_bp_to_disk(args.result_dir,
+                             _result_basename(config, name) + '.est',
+                             estimate_blocking(config.topology,
+                                               config.channels, routing,
+                                               config.loads, config.k,
+                                               config.traffic).tolist())
+
+    sim = Simulator(config, progress)
+    labelled = len(config.algorithms) > 1
+    if config.refine:
+        results = sim.run_all()
+        for name, result in results.items():
+            for row in range(result.nsims):
+                _report(args, config, progress, name, result, row, row,
+                        labelled)
+    else:
+        results = {name: SimulationResult(config.loads, name)
+                   for name in config.algorithms}
+        if sim.restored:
+            # results of these were already written by the interrupted run
+            logger.info('Resuming after %d simulations' % (
+                len(sim.restored) // len(results)))
+            for _, name, blocks, calls, ci, sim_time in sim.restored:
+                results[name].append(blocks, calls, ci, sim_time)
+
+        for simulation, name, blocks, calls, ci, sim_time in \
+                sim.repetitions():
+            results[name].append(blocks, calls, ci, sim_time)
+            _report(args, config, progress, name, results[name], simulation,
+                    -1, labelled)
+
+    for name, result in results.items():
+        if config.ci_width is not None and result.nsims > 1:
+            means, halfwidths = result.confidence_interval(config.confidence)
+            progress.summary(means.tolist(), halfwidths.tolist(),
+                             name if labelled else None)
 
-    # print header for pretty stdout console logging
-    print('Load:   ', end='')
-    for i in range(1, args.load + 1):
-        print('%4d' % i, end=' ')
-    print()
-
-    time_per_simulation = []
-    for simulation in range(args.num_sim):
-        sim_time = default_timer()
-        net = get_net_instance_from_args(args.topology, args.channels)
-        rwa = get_rwa_algorithm_from_args(args.r, args.w, args.rwa,
-                                          args.pop_size, args.num_gen,
-                                          args.cross_rate, args.mut_rate)
-        blocklist = []
-        blocks_per_erlang = []
-
-        # ascending loop through Erlangs
-        for load in range(1, args.load + 1):
-            blocks = 0
-            for call in range(args.calls):
-                print('\rBlocks: ', end='', flush=True)
-                for b in blocklist:
-                    print('%04d ' % b, end='', flush=True)
-                print(' %04d' % call, end='')
-
-                # Poisson arrival is modelled as an exponential distribution
-                # of times, according to Pawełczak's MATLAB package [1]:
-                # @until_next: time until the next call arrives
-                # @holding_time: time an allocated call occupies net resources
-                until_next = -np.log(1 - np.random.rand()) / load
-                holding_time = -np.log(1 - np.random.rand())
-
-                # Call RWA algorithm, which returns a lightpath if successful
-                # or None if no λ can be found available at the route's first
-                # link
-                lightpath = rwa(net, args.y)
-
-                # If lightpath is non None, the first link between the source
-                # node and one of its neighbours has a wavelength available,
-                # and the RWA algorithm running at that node thinks it can
-                # allocate on that λ. However, we still need to check whether
-                # that same wavelength is available on the remaining links
-                # along the path in order to reach the destination node. In
-                # other words, despite the RWA was successful at the first
-                # node, the connection can still be blocked on further links
-                # in the future hops to come, nevertheless.
-                if lightpath is not None:
-                    # check if the color chosen at the first link is available
-                    # on all remaining links of the route
-                    for (i, j) in lightpath.links:
-                        if not net.n[i][j][lightpath.w]:
-                            lightpath = None
-                            break
-
-                # Check if λ was not available either at the first link from
-                # the source or at any other further link along the route.
-                # Otherwise, allocate resources on the network for the
-                # lightpath.
-                if lightpath is None:
-                    blocks += 1
-                else:
-                    lightpath.holding_time = holding_time
-                    net.t.add_lightpath(lightpath)
-                    for (i, j) in lightpath.links:
-                        net.n[i][j][lightpath.w] = 0  # lock channel
-                        net.t[i][j][lightpath.w] = holding_time
-
-                        # make it symmetric
-                        net.n[j][i][lightpath.w] = net.n[i][j][lightpath.w]
-                        net.t[j][i][lightpath.w] = net.t[i][j][lightpath.w]
-
-                # FIXME The following two routines below are part of the same
-                # one: decreasing the time network resources remain allocated
-                # to connections, and removing finished connections from the
-                # traffic matrix. This, however, should be a single routine
-                # iterating over lightpaths links instead of all edges, so when
-                # the time is up on all links of a lightpath, the lightpath
-                # might be popped from the matrix's list. I guess the problem
-                # is the random initialisation of the traffic matrix's holding
-                # times during network object instantiation, but if this is
-                # indeed the fact it needs some consistent testing.
-                for lightpath in net.t.lightpaths:
-                    if lightpath.holding_time > until_next:
-                        lightpath.holding_time -= until_next
-                    else:
-                        # time's up: remove conn from traffic matrix's list
-                        net.t.remove_lightpath_by_id(lightpath.id)
-
-                # Update *all* channels that are still in use
-                for (i, j) in net.get_edges():
-                    for w in range(net.nchannels):
-                        if net.t[i][j][w] > until_next:
-                            net.t[i][j][w] -= until_next
-                        else:
-                            # time's up: free channel
-                            net.t[i][j][w] = 0
-                            if not net.n[i][j][w]:
-                                net.n[i][j][w] = 1  # free channel
-
-                        # make matrices symmetric
-                        net.t[j][i][w] = net.t[i][j][w]
-                        net.n[j][i][w] = net.n[j][i][w]
-
-            blocklist.append(blocks)
-            blocks_per_erlang.append(100.0 * blocks / args.calls)
-
-        sim_time = default_timer() - sim_time
-        time_per_simulation.append(sim_time)
-
-        print('\rBlocks: ', end='', flush=True)
-        for b in blocklist:
-            print('%04d ' % b, end='', flush=True)
-        print('\n%-7s ' % 'BP (%):', end='')
-        print(' '.join(['%4.1f' % b for b in blocks_per_erlang]), end=' ')
-        print('[sim %d: %.2f secs]' % (simulation + 1, sim_time))
-
-        fbase = '%s_%dch_%dreq_%s' % (
-            args.rwa if args.rwa is not None else '%s_%s' % (args.r, args.w),
-            args.channels, args.calls, net.name)
-
-        write_bp_to_disk(args.result_dir, fbase + '.bp', blocks_per_erlang)
-
-    write_it_to_disk(args.result_dir, fbase + '.it', time_per_simulation)
+        fbase = _result_basename(config, name)
+        write_it_to_disk(args.result_dir, fbase + '.it', result.times)
+        profile = result.profile if config.refine else \
+            sim.profiles.get(name)
+        if profile is not None:
+            write_profile_to_disk(args.result_dir, fbase + '.prof', profile)
+        write_loads_to_disk(args.result_dir, fbase + '.loads',
+                            list(result.loads))
 
     if args.plot:
         plot_bp(args.result_dir)
@@ -0,0 +1,311 @@
+"""Static lightpath establishment (SLE): RWA of a whole demand matrix at once
+
+Every demand, i.e., a number of lightpaths requested between a pair of
+nodes, is known in advance, so instead of serving calls one at a time as
+they arrive, demands are sorted by some heuristic and then routed and
+assigned wavelengths in a single pass over an initially idle network:
+
+.. code-block:: sh
+
+    python -m rwa_wdm.sle -t nsf -c 16 --uniform 2 --order longest-first
+    python -m rwa_wdm.sle -t nsf -c 0 --demands demands.txt -r yen
+
+"""
+
+import argparse
+import logging
+import sys
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .net import Lightpath, Network
+from .rwa.routing import RouteTable
+
+__all__ = (
+    'ORDERS',
+    'SLEResult',
+    'order_demands',
+    'establish',
+    'main',
+)
+
+logger = logging.getLogger(__name__)
+
+ORDERS = ('longest-first', 'shortest-first', 'largest-first', 'given')
+
+
+class SLEResult(object):
+    """Outcome of the static lightpath establishment of a demand matrix
+
+    Args:
+        demands: number of lightpaths requested between each pair of nodes
+        lightpaths: lightpaths established, in the order they were
+        rejected: number of lightpaths that could not be established between
+            each pair of nodes
+
+    """
+
+    def __init__(self, demands: np.ndarray, lightpaths: List[Lightpath],
+                 rejected: np.ndarray) -> None:
+        self._demands: np.ndarray = demands
+        self._lightpaths: List[Lightpath] = lightpaths
+        self._rejected: np.ndarray = rejected
+
+    @property
+    def demands(self) -> np.ndarray:
+        """Number of lightpaths requested between each pair of nodes"""
+        return self._demands
+
+    @property
+    def lightpaths(self) -> List[Lightpath]:
+        """Lightpaths established"""
+        return self._lightpaths
+
+    @property
+    def rejected(self) -> np.ndarray:
+        """Number of lightpaths rejected between each pair of nodes"""
+        return self._rejected
+
+    @property
+    def nrejected(self) -> int:
+        """Total number of lightpaths rejected"""
+        return int(self._rejected.sum())
+
+    @property
+    def nwavelengths(self) -> int:
+        """Number of wavelengths needed to establish the lightpaths, i.e.,
+        one more than the highest λ index assigned"""
+        if not self._lightpaths:
+            return 0
+        return 1 + max(lightpath.w for lightpath in self._lightpaths)
+
+    @property
+    def blocking(self) -> float:
+        """Fraction of the lightpaths requested that were rejected"""
+        total = self._demands.sum()
+        return float(self._rejected.sum() / total) if total else 0.0
+
+
+def order_demands(routes: Dict[Tuple[int, int], List[List[int]]],
+                  demands: np.ndarray, order: str) -> List[Tuple[int, int]]:
+    """Sorts the pairs of nodes with demands by an ordering heuristic
+
+    Args:
+        routes: candidate routes of each pair of nodes, shortest first
+        demands: number of lightpaths requested between each pair of nodes
+        order: either "longest-first" or "shortest-first", by number of hops
+            of the shortest route, "largest-first", by number of lightpaths
+            requested, or "given", in row-major order of the demand matrix.
+            Ties are broken in row-major order
+
+    Returns:
+        :obj:`list`: pairs of nodes, in the order they should be served
+
+    Raises:
+        ValueError: if `order` is not a valid ordering heuristic
+
+    """
+    pairs = sorted(routes)
+    if order == 'longest-first':
+        pairs.sort(key=lambda pair: -len(routes[pair][0]))
+    elif order == 'shortest-first':
+        pairs.sort(key=lambda pair: len(routes[pair][0]))
+    elif order == 'largest-first':
+        pairs.sort(key=lambda pair: -demands[pair])
+    elif order != 'given':
+        raise ValueError('No ordering heuristic named "%s"' % order)
+    return pairs
+
+
+def _first_fit(free: np.ndarray, links: np.ndarray, start: int,
+               count: int) -> np.ndarray:
+    """Lowest `count` λs, from `start` on, free on every link of a route
+
+    The link × λ availability matrix is scanned in windows of doubling
+    width, so few columns are looked at when free λs lie close to `start`.
+    """
+    window = max(count, 64)
+    while True:
+        stop = min(start + window, free.shape[1])
+        wavelengths = start + np.flatnonzero(
+            free[links, start:stop].all(axis=0))
+        if len(wavelengths) >= count or stop == free.shape[1]:
+            return wavelengths[:count]
+        window *= 2
+
+
+def establish(net: Network, demands: np.ndarray,
+              channels: Union[int, None] = None, routing: str = 'dijkstra',
+              k: int = 2, order: str = 'longest-first') -> SLEResult:
+    """Routes and assigns wavelengths to every lightpath of a demand matrix
+
+    Demands are served in the order given by `order_demands`. All the
+    lightpaths a pair of nodes requests are set up at once: the λs free on
+    every link of a route are found by a single vectorized AND over the rows
+    of a link × λ availability matrix, and as many of the lowest-indexed
+    ones as needed are taken, i.e., first-fit. With Yen's routing, the
+    lightpaths that do not fit on a route are tried on the next one.
+
+    The network starts idle: its topology is used, but its current
+    occupation is not.
+
+    Args:
+        net: Network topology instance
+        demands: square matrix with the number of lightpaths requested
+            between each pair of nodes, from row to column
+        channels: number of wavelength channels per link. If None, channels
+            are unlimited, so no lightpath is ever rejected and `nwavelengths`
+            tells how many λs the demands need
+        routing: either "dijkstra" or "yen"
+        k: number of alternate paths for Yen's routing algorithm
+        order: ordering heuristic, out of `ORDERS`
+
+    Returns:
+        SLEResult: lightpaths established and rejected
+
+    Raises:
+        ValueError: if the demand matrix does not match the topology, if
+            the routing algorithm is unknown, or if `k` is not positive
+
+    """
+    demands = np.asarray(demands, dtype=np.int64)
+    if demands.shape != (net.nnodes, net.nnodes):
+        raise ValueError('Expect a %d x %d demand matrix'
+                         % (net.nnodes, net.nnodes))
+    if (demands < 0).any():
+        raise ValueError('Expect non-negative demands')
+    if routing not in ('dijkstra', 'yen'):
+        raise ValueError('No routing algorithm named "%s"' % routing)
+    if routing == 'yen' and k < 1:
+        raise ValueError('Number of alternate paths should be positive')
+
+    pairs = [(int(s), int(d)) for s, d in zip(*np.nonzero(demands))]
+    if any(s == d for s, d in pairs):
+        raise ValueError('Expect no demands from a node to itself')
+
+    # the graph is built once for all pairs, rather than once per pair
+    routes: Dict[Tuple[int, int], List[List[int]]] = {}
+    if routing == 'dijkstra':
+        table = RouteTable(net.a, pairs)
+        for pair in pairs:
+            routes[pair] = [table.shortest(*pair)]
+    else:
+        table = RouteTable(net.a, pairs, shortest=False, k=k)
+        for pair in pairs:
+            routes[pair] = table.alternate(*pair)
+
+    # with unlimited channels, λs are added as pairs run out of them, by
+    # doubling their number. Since there are never fewer than the largest
+    # demand, a single doubling is enough for any pair
+    unlimited = channels is None
+    if channels is None:
+        channels = max(int(demands.max(initial=0)), 1)
+    free = np.ones((net.nlinks, channels), dtype=bool)
+    # no λ below these is free on each link, so searches start from there
+    lowest = np.zeros(net.nlinks, dtype=np.int64)
+
+    lightpaths: List[Lightpath] = []
+    rejected = np.zeros_like(demands)
+    for pair in order_demands(routes, demands, order):
+        pending = int(demands[pair])
+        for route in routes[pair]:
+            links = net.route_links(route)
+            start = int(lowest[links].max())
+            wavelengths = _first_fit(free, links, start, pending)
+            if unlimited and len(wavelengths) < pending:
+                free = np.hstack((free, np.ones_like(free)))
+                wavelengths = _first_fit(free, links, start, pending)
+            if not len(wavelengths):
+                continue
+            free[np.ix_(links, wavelengths)] = False
+            for link in links[lowest[links] == wavelengths[0]]:
+                row = free[link, lowest[link]:]
+                lowest[link] += row.argmax() if row.any() else len(row)
+            lightpaths.extend(Lightpath(route, int(w)) for w in wavelengths)
+            pending -= len(wavelengths)
+            if not pending:
+                break
+        rejected[pair] = pending
+    return SLEResult(demands, lightpaths, rejected)
+
+
+def main(argv: Union[Sequence[str], None] = None) -> int:
+    """Command line entry point of the static lightpath establishment
+
+    Args:
+        argv: command line arguments. Defaults to `sys.argv`
+
+    Returns:
+        :obj:`int`: exit status, i.e., 1 if any lightpath was rejected, 0
+            otherwise
+
+    """
+    from .sim import get_net_instance_from_args
+
+    parser = argparse.ArgumentParser(
+        prog='python -m rwa_wdm.sle',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description='Static lightpath establishment of a demand matrix')
+    parser.add_argument('-t', dest='topology', default='nsf',
+                        metavar='<topology>',
+                        help='network topology, either one of nsf, clara, '
+                             'janet, rnp, a .json or .gml file or a '
+                             'synthetic one, e.g., grid:10x10')
+    parser.add_argument('-c', type=int, dest='channels', default=0,
+                        metavar='<channels>',
+                        help='number of λ per link (0 for unlimited, in '
+                             'which case the number of λ needed is reported)')
+    parser.add_argument('-r', dest='routing', default='dijkstra',
+                        choices=['dijkstra', 'yen'], metavar='<algorithm>',
+                        help='routing algorithm')
+    parser.add_argument('-y', type=int, default=2, metavar='<yen-alt-paths>',
+                        help='number of routing alternate paths (Yen\'s)')
+    parser.add_argument('--order', default='longest-first', choices=ORDERS,
+                        metavar='<heuristic>',
+                        help='order demands are served in, out of %s'
+                             % ', '.join(ORDERS))
+    demand = parser.add_mutually_exclusive_group(required=True)
+    demand.add_argument('--demands', default=None, metavar='<matrix-file>',
+                        help='text file with the number of lightpaths '
+                             'requested between each pair of nodes, as a '
+                             'whitespace-separated square matrix')
+    demand.add_argument('--uniform', type=int, default=None,
+                        metavar='<lightpaths>',
+                        help='request this many lightpaths between every '
+                             'pair of distinct nodes')
+    args = parser.parse_args(argv)
+
+    if args.channels < 0:
+        parser.error('number of channels should not be negative')
+
+    try:
+        net = get_net_instance_from_args(args.topology,
+                                         max(args.channels, 1))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if args.demands is not None:
+        demands = np.loadtxt(args.demands, dtype=np.int64, ndmin=2)
+    else:
+        demands = np.full((net.nnodes, net.nnodes), args.uniform,
+                          dtype=np.int64)
+        np.fill_diagonal(demands, 0)
+
+    try:
+        result = establish(net, demands, args.channels or None,
+                           args.routing, args.y, args.order)
+    except ValueError as e:
+        parser.error(str(e))
+    print('Lightpaths requested:   %d' % result.demands.sum())
+    print('Lightpaths established: %d' % len(result.lightpaths))
+    print('Lightpaths rejected:    %d (%.2f%%)'
+          % (result.nrejected, 100 * result.blocking))
+    print('Wavelengths needed:     %d' % result.nwavelengths)
+    for s, d in zip(*np.nonzero(result.rejected)):
+        print('Rejected %d of %d lightpaths from %d to %d' % (
+            result.rejected[s, d], result.demands[s, d], s, d))
+    return 1 if result.nrejected else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Statistics for output analysis of the simulation
+
+"""
+
+# [1] M. Abramowitz and I. A. Stegun, Handbook of Mathematical Functions,
+#     eq. 26.7.5 (Cornish-Fisher expansion of Student's t quantiles)
+# [2] M. Abramowitz and I. A. Stegun, Handbook of Mathematical Functions,
+#     eqs. 26.7.3 and 26.7.4 (Student's t distribution for integer degrees
+#     of freedom)
+
+import logging
+import math
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+__all__ = (
+    'normal_quantile',
+    't_quantile',
+    'confidence_interval',
+    'ci_converged',
+    'refine_loads',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def normal_quantile(p: float) -> float:
+    """Quantile function of the standard normal distribution
+
+    Args:
+        p: cumulative probability, within the open interval (0, 1)
+
+    Returns:
+        :obj:`float`: value `z` such that P(Z <= z) = `p`
+
+    """
+    if not 0.0 < p < 1.0:
+        raise ValueError('Probability should lie within (0, 1)')
+
+    # bisection over the CDF is plenty accurate and is called only once per
+    # confidence interval computation
+    lo, hi = -40.0, 40.0
+    for _ in range(100):
+        mid = (lo + hi) / 2.0
+        if 0.5 * math.erfc(-mid / math.sqrt(2.0)) < p:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2.0
+
+
+# degrees of freedom up to which t quantiles are computed exactly. Above it,
+# the Cornish-Fisher expansion is accurate to five decimal places or better
+EXACT_T_DOF = 30
+
+
+def _t_cdf(theta: float, dof: int) -> float:
+    """Cumulative distribution function of Student's t distribution [2]
+
+    Args:
+        theta: angle within [-pi/2, pi/2] such that t = sqrt(dof) tan(theta)
+        dof: degrees of freedom
+
+    Returns:
+        :obj:`float`: P(T <= t)
+
+    """
+    s, c = math.sin(abs(theta)), math.cos(theta)
+    # P(|T| <= t) is a finite series in powers of cos(theta)
+    if dof % 2:
+        term, series = c, 0.0
+        for i in range(1, (dof - 1) // 2 + 1):
+            series += term
+            term *= c * c * 2 * i / (2 * i + 1)
+        a = 2.0 / math.pi * (abs(theta) + s * series)
+    else:
+        term, series = 1.0, 0.0
+        for i in range(1, dof // 2 + 1):
+            series += term
+            term *= c * c * (2 * i - 1) / (2 * i)
+        a = s * series
+    return 0.5 + math.copysign(a, theta) / 2.0
+
+
+def t_quantile(p: float, dof: int) -> float:
+    """Quantile function of Student's t distribution
+
+    Computed exactly for up to `EXACT_T_DOF` degrees of freedom, by bisection
+    over the distribution function [2]. Above that, it is computed from the
+    normal quantile via Cornish-Fisher expansion [1].
+
+    Args:
+        p: cumulative probability, within the open interval (0, 1)
+        dof: degrees of freedom
+
+    Returns:
+        :obj:`float`: value `t` such that P(T <= t) = `p`
+
+    """
+    if dof < 1:
+        raise ValueError('Degrees of freedom should be a positive integer')
+
+    if dof <= EXACT_T_DOF:
+        if not 0.0 < p < 1.0:
+            raise ValueError('Probability should lie within (0, 1)')
+        # bisect over theta rather than t, which is unbounded
+        lo, hi = -math.pi / 2.0, math.pi / 2.0
+        for _ in range(100):
+            mid = (lo + hi) / 2.0
+            if _t_cdf(mid, dof) < p:
+                lo = mid
+            else:
+                hi = mid
+        return math.sqrt(dof) * math.tan((lo + hi) / 2.0)
+
+    z = normal_quantile(p)
+    g1 = (z ** 3 + z) / 4.0
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96.0
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384.0
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5
+          - 1920 * z ** 3 - 945 * z) / 92160.0
+    return z + g1 / dof + g2 / dof ** 2 + g3 / dof ** 3 + g4 / dof ** 4
+
+
+def confidence_interval(samples: Sequence[float],
+                        confidence: float = 0.95) -> Tuple[float, float]:
+    """Confidence interval for the mean of i.i.d. samples
+
+    Samples are meant to be either the blocking probabilities of consecutive
+    batches of calls (batch means) or of independent replications.
+
+    Args:
+        samples: observations whose mean is to be estimated
+        confidence: confidence level of the interval
+
+    Returns:
+        :obj:`tuple`: sample mean and half-width of the interval. The
+            half-width is infinite if fewer than two samples are given
+
+    """
+    x = np.asarray(samples, dtype=np.float64)
+    mean = float(x.mean()) if x.size else float('nan')
+    if x.size < 2:
+        return mean, float('inf')
+
+    stderr = x.std(ddof=1) / math.sqrt(x.size)
+    t = t_quantile(0.5 + confidence / 2.0, x.size - 1)
+    return mean, float(t * stderr)
+
+
+def ci_converged(mean: float, halfwidth: float, rel_width: float) -> bool:
+    """Checks whether a confidence interval is narrow enough
+
+    Args:
+        mean: sample mean
+        halfwidth: half-width of the confidence interval
+        rel_width: target half-width relative to the mean
+
+    Returns:
+        :obj:`bool`: True if the half-width does not exceed the target. A
+            zero-width interval around a zero mean, i.e., no blocking at all
+            on any sample, also counts as converged
+
+    """
+    return halfwidth <= rel_width * abs(mean)
+
+
+def refine_loads(loads: Sequence[float], bp: Sequence[float],
+                 num_loads: int) -> List[float]:
+    """Picks new loads where the blocking probability changes the fastest
+
+    The blocking probability curve is usually flat at both ends and steep
+    around its knee, so the intervals between consecutive loads across which
+    the blocking probability varies the most are split in half.
+
+    Args:
+        loads: network loads, in Erlangs, in ascending order
+        bp: blocking probabilities at each of the loads, or several curves
+            thereof as rows (e.g., one per algorithm compared), in which case
+            the steepest of them counts for each interval
+        num_loads: maximum number of loads to be picked
+
+    Returns:
+        :obj:`list`: new loads, in ascending order. Intervals across which the
+            blocking probability does not vary at all are never split
+
+    """
+    x = np.asarray(loads, dtype=np.float64)
+    delta = np.abs(np.diff(np.asarray(bp, dtype=np.float64), axis=-1))
+    if delta.ndim > 1:
+        delta = delta.reshape(-1, delta.shape[-1]).max(axis=0)
+    steepest = np.argsort(-delta, kind='stable')[:num_loads]
+    steepest = np.sort(steepest[delta[steepest] > 0])
+    return ((x[steepest] + x[steepest + 1]) / 2.0).tolist()
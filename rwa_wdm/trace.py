@@ -0,0 +1,271 @@
+"""Per-call event trace of the simulation, with blocking-cause attribution
+
+"""
+
+import logging
+import struct
+from typing import BinaryIO, Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+__all__ = (
+    'ALLOCATED',
+    'BLOCKED_RWA',
+    'BLOCKED_CONTINUITY',
+    'CAUSES',
+    'EventTrace',
+    'read_trace',
+    'route_starts',
+    'blocking_causes',
+)
+
+logger = logging.getLogger(__name__)
+
+# outcome of a call: either allocated, or blocked because the RWA algorithm
+# found no λ at all (i.e., returned None), or because the λ it chose turned
+# out to be busy on some link further along the route
+ALLOCATED = 0
+BLOCKED_RWA = 1
+BLOCKED_CONTINUITY = 2
+CAUSES = ('allocated', 'rwa', 'continuity')
+
+# trace files start with a magic string, the version of the format and the
+# size, in bytes, of node identifiers. Then come blocks of records, each one
+# made of a block header, telling the number of records and of route nodes
+# within, the fixed-size records, and the nodes of all their routes, one
+# route after the other
+MAGIC = b'RWATRACE'
+VERSION = 2
+HEADER = struct.Struct('<8sHH')
+BLOCK_HEADER = struct.Struct('<QQ')
+
+
+def _node_dtype(num_nodes: int) -> np.dtype:
+    """Smallest integer type node identifiers of a network fit into"""
+    if num_nodes <= np.iinfo(np.int16).max:
+        return np.dtype('<i2')
+    if num_nodes <= np.iinfo(np.int32).max:
+        return np.dtype('<i4')
+    raise ValueError('Cannot trace networks of more than %d nodes'
+                     % np.iinfo(np.int32).max)
+
+
+def _record_dtype(node_dtype: np.dtype) -> np.dtype:
+    """Layout of a single record on disk"""
+    return np.dtype([
+        ('time', '<f8'),         # arrival time of the call
+        ('holding_time', '<f8'),
+        ('load', '<f8'),
+        ('wavelength', '<i4'),   # λ chosen by the RWA algorithm, or -1
+        ('cause', 'u1'),         # one of ALLOCATED, BLOCKED_*
+        ('link', node_dtype, (2,)),  # link the λ was busy on, or (-1, -1)
+        ('route_length', '<u4'),  # number of nodes of the route, 0 if none
+    ])
+
+
+class EventTrace(object):
+    """Records every call of a simulation into a binary trace file
+
+    Records are stored column-wise into preallocated arrays used as a ring
+    buffer: once `capacity` records have piled up, they are written to disk
+    in a single binary block and the buffer starts over. Recording a call
+    thus costs a handful of array assignments, and nothing at all is done
+    when tracing is disabled, since the simulation loop then skips the trace
+    altogether.
+
+    Routes are not padded to the largest number of nodes a route may have,
+    but stored one after the other into a flat array, each record telling
+    the length of its own, so the size of the trace grows with the routes
+    actually taken rather than with the size of the network.
+
+    The trace can also be reopened at a given `offset`, as returned by
+    `flush`, in which case anything written past it is discarded. That is
+    how a resumed simulation gets rid of the records of calls simulated
+    after its last checkpoint.
+
+    Args:
+        path: file to write records to
+        num_nodes: number of nodes of the network, which node identifiers
+            are sized after
+        capacity: number of records buffered between two writes to disk
+        offset: size, in bytes, to truncate an existing trace to before
+            appending to it. If None, the trace is started over
+
+    Raises:
+        ValueError: if the network has too many nodes to be traced
+
+    """
+
+    def __init__(self, path: str, num_nodes: int, capacity: int = 65536,
+                 offset: Union[int, None] = None) -> None:
+        self._path: str = path
+        node_dtype = _node_dtype(num_nodes)
+        self._dtype: np.dtype = _record_dtype(node_dtype)
+        self._capacity: int = capacity
+        self._size: int = 0
+        self._num_route_nodes: int = 0
+        self.load: float = 0.0
+
+        self._time = np.empty(capacity)
+        self._holding_time = np.empty(capacity)
+        self._load = np.empty(capacity)
+        self._wavelength = np.empty(capacity, dtype=np.int32)
+        self._cause = np.empty(capacity, dtype=np.uint8)
+        self._link = np.empty((capacity, 2), dtype=node_dtype)
+        self._route_length = np.empty(capacity, dtype=np.uint32)
+        # grown as needed, since routes vary in length
+        self._route_nodes = np.empty(4 * capacity, dtype=node_dtype)
+
+        if offset is None:
+            self._file: BinaryIO = open(path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, VERSION, node_dtype.itemsize))
+        else:
+            self._file = open(path, 'r+b')
+            self._file.truncate(offset)
+            self._file.seek(offset)
+
+    @property
+    def path(self) -> str:
+        """The file records are written to"""
+        return self._path
+
+    def record(self, time: float, holding_time: float,
+               route: Union[Sequence[int], None], wavelength: int,
+               cause: int, link: Union[Tuple[int, int], None] = None) -> None:
+        """Records the outcome of a call at the current `load`
+
+        Args:
+            time: arrival time of the call
+            holding_time: time the call occupies network resources if
+                allocated
+            route: route chosen by the RWA algorithm, if any
+            wavelength: λ chosen by the RWA algorithm, or -1 if none
+            cause: either `ALLOCATED`, `BLOCKED_RWA` or `BLOCKED_CONTINUITY`
+            link: link the λ was found busy on, if blocked because of it
+
+        """
+        n = self._size
+        self._time[n] = time
+        self._holding_time[n] = holding_time
+        self._load[n] = self.load
+        self._wavelength[n] = wavelength
+        self._cause[n] = cause
+        self._link[n] = -1 if link is None else link
+        if route is None:
+            self._route_length[n] = 0
+        else:
+            m = self._num_route_nodes
+            if m + len(route) > len(self._route_nodes):
+                self._route_nodes = np.resize(
+                    self._route_nodes,
+                    max(2 * len(self._route_nodes), m + len(route)))
+            self._route_nodes[m:m + len(route)] = route
+            self._route_length[n] = len(route)
+            self._num_route_nodes = m + len(route)
+        self._size = n + 1
+        if self._size == self._capacity:
+            self.flush()
+
+    def flush(self) -> int:
+        """Writes the buffered records to disk
+
+        Returns:
+            :obj:`int`: size of the trace file, in bytes, which can be handed
+                back as `offset` to resume the trace from this point
+
+        """
+        n = self._size
+        if n:
+            block = np.empty(n, dtype=self._dtype)
+            block['time'] = self._time[:n]
+            block['holding_time'] = self._holding_time[:n]
+            block['load'] = self._load[:n]
+            block['wavelength'] = self._wavelength[:n]
+            block['cause'] = self._cause[:n]
+            block['link'] = self._link[:n]
+            block['route_length'] = self._route_length[:n]
+            m = self._num_route_nodes
+            self._file.write(BLOCK_HEADER.pack(n, m))
+            self._file.write(block.tobytes())
+            self._file.write(self._route_nodes[:m].tobytes())
+            self._size = 0
+            self._num_route_nodes = 0
+        self._file.flush()
+        return self._file.tell()
+
+    def close(self) -> None:
+        """Writes the buffered records to disk and closes the trace file"""
+        self.flush()
+        self._file.close()
+
+
+def read_trace(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Reads a trace file back
+
+    The route of the `i`-th record is made of the nodes
+    ``nodes[start[i]:start[i] + records['route_length'][i]]``, where
+    `start` is the exclusive cumulative sum of the routes' lengths, as
+    `route_starts` computes it.
+
+    Args:
+        path: file written by an `EventTrace`
+
+    Returns:
+        :obj:`tuple`: structured array with a record per call, whose fields
+            are "time", "holding_time", "load", "wavelength", "cause",
+            "link" and "route_length", and the nodes of all routes, one
+            route after the other
+
+    Raises:
+        ValueError: if the file is not a trace file of a supported version
+
+    """
+    with open(path, 'rb') as f:
+        magic, version, node_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('"%s" is not a trace file of version %d'
+                             % (path, VERSION))
+        node_dtype = np.dtype('<i%d' % node_size)
+        dtype = _record_dtype(node_dtype)
+        records, nodes = [], []
+        while True:
+            header = f.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                break
+            n, m = BLOCK_HEADER.unpack(header)
+            records.append(np.fromfile(f, dtype=dtype, count=n))
+            nodes.append(np.fromfile(f, dtype=node_dtype, count=m))
+    if not records:
+        return np.empty(0, dtype=dtype), np.empty(0, dtype=node_dtype)
+    return np.concatenate(records), np.concatenate(nodes)
+
+
+def route_starts(records: np.ndarray) -> np.ndarray:
+    """Index of the first node of each record's route within the nodes
+    returned by `read_trace`"""
+    lengths = records['route_length'].astype(np.int64)
+    return np.cumsum(lengths) - lengths
+
+
+def blocking_causes(records: np.ndarray
+                    ) -> Tuple[Dict[str, int], Dict[Tuple[int, int], int]]:
+    """Counts the outcomes of the calls in a trace
+
+    Args:
+        records: records as returned by `read_trace`, possibly filtered,
+            e.g., by load
+
+    Returns:
+        :obj:`tuple`: number of calls per outcome, keyed by the names in
+            `CAUSES`, and number of calls blocked on each link because of the
+            wavelength continuity constraint, keyed by link
+
+    """
+    causes = np.bincount(records['cause'], minlength=len(CAUSES))
+    links: Dict[Tuple[int, int], int] = {}
+    blocked = records['link'][records['cause'] == BLOCKED_CONTINUITY]
+    if len(blocked):
+        pairs, counts = np.unique(np.sort(blocked, axis=1), axis=0,
+                                  return_counts=True)
+        links = {(int(i), int(j)): int(c) for (i, j), c in zip(pairs, counts)}
+    return dict(zip(CAUSES, causes.tolist())), links
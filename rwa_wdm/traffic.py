@@ -0,0 +1,310 @@
+"""Traffic models: call arrivals and holding times
+
+"""
+
+# [1] https://la.mathworks.com/matlabcentral/fileexchange/4797-wdm-network-blocking-computation-toolbox
+
+import logging
+from itertools import islice, repeat
+from typing import Any, Iterable, Iterator, List, Mapping, Tuple, Union
+
+import numpy as np
+
+__all__ = (
+    'AliasTable',
+    'ArrivalProcess',
+    'PairDistribution',
+    'load_grid',
+    'seed_sequence',
+    'traffic_matrix',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def seed_sequence(entropy: Union[int, None],
+                  *spawn_key: Union[int, float]) -> np.random.SeedSequence:
+    """Derives an independent seed sequence for a piece of a simulation
+
+    Every (simulation, load) pair gets its own stream, identified by the
+    spawn key over the same root entropy, so the numbers drawn depend neither
+    on the order nor on the process the pieces happen to be run in.
+
+    Integral values within the key stand for themselves, while fractional
+    ones (i.e., loads off the integer grid) are identified by the bits of
+    their double precision representation.
+
+    Args:
+        entropy: root seed of the whole simulation. If None, fresh entropy is
+            pulled from the OS
+        spawn_key: indices identifying the stream, e.g. repetition and load
+
+    Returns:
+        np.random.SeedSequence: seed sequence to feed a random Generator
+
+    """
+    return np.random.SeedSequence(entropy, spawn_key=tuple(
+        int(key) if float(key).is_integer() else
+        int(np.float64(key).view(np.uint64)) for key in spawn_key))
+
+
+def load_grid(spec: str) -> Tuple[float, ...]:
+    """Parses a specification of the network loads to be simulated
+
+    The following formats are understood, all bounds being inclusive:
+
+    - "1,2,5,10": an explicit list of loads
+    - "1:30": loads from 1 to 30 Erlangs, one Erlang apart
+    - "0.5:30:0.5": loads from 0.5 to 30 Erlangs, 0.5 Erlangs apart
+    - "log:1:100:20": 20 loads logarithmically spaced from 1 to 100 Erlangs
+
+    Args:
+        spec: load grid specification
+
+    Returns:
+        :obj:`tuple`: network loads, in Erlangs, in ascending order
+
+    Raises:
+        ValueError: if the specification cannot be parsed or if any of the
+            resulting loads is not positive
+
+    """
+    fields = spec.split(':')
+    try:
+        if fields[0] == 'log':
+            start, stop, num = float(fields[1]), float(fields[2]), \
+                int(fields[3])
+            if len(fields) != 4 or start <= 0 or stop < start or num < 1:
+                raise ValueError
+            loads: List[float] = np.geomspace(start, stop, num).tolist()
+        elif len(fields) == 1:
+            loads = [float(load) for load in spec.split(',')]
+        elif len(fields) in (2, 3):
+            start, stop = float(fields[0]), float(fields[1])
+            step = float(fields[2]) if len(fields) == 3 else 1.0
+            if step <= 0 or stop < start:
+                raise ValueError
+            # tolerate rounding errors on the upper bound
+            num = int(np.floor((stop - start) / step + 1e-9)) + 1
+            loads = (start + step * np.arange(num)).tolist()
+        else:
+            raise ValueError
+    except (ValueError, IndexError):
+        raise ValueError('Bad load grid specification "%s"' % spec)
+    if min(loads) <= 0:
+        raise ValueError('Loads should be positive')
+    return tuple(sorted(set(round(load, 9) for load in loads)))
+
+
+def traffic_matrix(spec: str, num_nodes: int) -> np.ndarray:
+    """Parses a specification of the traffic offered between pairs of nodes
+
+    Args:
+        spec: either "uniform", for the same traffic between every pair of
+            distinct nodes, or a text file storing a whitespace-separated
+            square matrix with the relative amount of traffic from each node
+            (row) to each other node (column)
+        num_nodes: number of nodes in the network
+
+    Returns:
+        :obj:`np.ndarray`: square matrix of non-negative weights, zero along
+            the diagonal
+
+    Raises:
+        ValueError: if the matrix does not match the network, or has negative
+            or no traffic at all
+
+    """
+    if spec == 'uniform':
+        matrix = np.ones((num_nodes, num_nodes))
+    else:
+        matrix = np.loadtxt(spec, dtype=np.float64, ndmin=2)
+    if matrix.shape != (num_nodes, num_nodes):
+        raise ValueError('Expect a %d x %d traffic matrix'
+                         % (num_nodes, num_nodes))
+    if (matrix < 0).any():
+        raise ValueError('Expect non-negative traffic')
+    np.fill_diagonal(matrix, 0)
+    if not matrix.any():
+        raise ValueError('Expect traffic between some pair of nodes')
+    return matrix
+
+
+class AliasTable(object):
+    """Walker's alias method for sampling a discrete distribution in O(1)
+
+    The table is built once, in time linear on the number of outcomes, via
+    Vose's algorithm. Drawing an outcome then takes a uniform choice of a
+    column and a single biased coin flip between the column's own outcome
+    and its alias, however many outcomes there are.
+
+    Args:
+        weights: non-negative weight of each outcome, not necessarily
+            normalized
+
+    """
+
+    def __init__(self, weights: np.ndarray) -> None:
+        weights = np.asarray(weights, dtype=np.float64).ravel()
+        if not len(weights) or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError('Expect non-negative weights, not all zero')
+        num = len(weights)
+        scaled = (weights * num / weights.sum()).tolist()
+        self._prob: np.ndarray = np.ones(num)
+        self._alias: np.ndarray = np.arange(num)
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._prob[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # whatever is left over is 1 but for rounding errors
+
+    def __len__(self) -> int:
+        return len(self._prob)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draws outcomes, as indices into the weights
+
+        Args:
+            rng: random number generator to draw from
+            size: number of outcomes to draw
+
+        Returns:
+            :obj:`np.ndarray`: indices of the outcomes drawn
+
+        """
+        column = rng.integers(len(self._prob), size=size)
+        flip = rng.random(size)
+        return np.where(flip < self._prob[column], column,
+                        self._alias[column])
+
+
+class PairDistribution(AliasTable):
+    """Distribution of the source and destination nodes of calls
+
+    Args:
+        matrix: square matrix with the relative amount of traffic from each
+            node (row) to each other node (column), as returned by
+            `traffic_matrix`
+
+    """
+
+    def __init__(self, matrix: np.ndarray) -> None:
+        matrix = np.asarray(matrix, dtype=np.float64)
+        self._pairs: np.ndarray = np.argwhere(matrix > 0)
+        super().__init__(matrix[matrix > 0])
+
+    @property
+    def pairs(self) -> np.ndarray:
+        """Source and destination nodes, as a row per pair with traffic, in
+        row-major order of the traffic matrix"""
+        return self._pairs
+
+
+class ArrivalProcess(object):
+    """Poisson arrival process with exponential holding times
+
+    Poisson arrival is modelled as an exponential distribution of times,
+    according to Pawełczak's MATLAB package [1]: the time until the next call
+    arrives has mean 1 / `load`, while the time an allocated call occupies
+    network resources has unit mean.
+
+    Samples are drawn in vectorized chunks from a `numpy.random.Generator` and
+    handed out one call at a time, so long runs are streamed lazily instead of
+    being materialized all at once. The position within the stream can be
+    saved via `state` and later restored, so that an interrupted simulation
+    resumes with the very same calls it would have seen otherwise.
+
+    Calls may also be given a pair of source and destination nodes each,
+    drawn from a `PairDistribution` after the times of the chunk, so the
+    times are the same as those of single-pair traffic within the first
+    chunk.
+
+    Args:
+        load: network load, in Erlangs, i.e., the rate of arrivals
+        rng: random number generator the samples are drawn from
+        chunk_size: number of calls sampled per vectorized draw
+        pairs: distribution of the pairs of nodes calls go between. If None,
+            calls are not assigned any pair of nodes
+
+    """
+
+    def __init__(self, load: float, rng: np.random.Generator,
+                 chunk_size: int = 4096,
+                 pairs: Union[PairDistribution, None] = None) -> None:
+        if load <= 0:
+            raise ValueError('Load should be positive')
+        if chunk_size < 1:
+            raise ValueError('Chunk size should be a positive integer')
+        self._load: float = load
+        self._rng: np.random.Generator = rng
+        self._chunk_size: int = chunk_size
+        self._pairs: Union[PairDistribution, None] = pairs
+        self._chunk_state: Union[Mapping[str, Any], None] = None
+        self._consumed: int = 0
+        self._skip: int = 0
+
+    @property
+    def load(self) -> float:
+        """The arrival rate, in Erlangs"""
+        return self._load
+
+    @property
+    def state(self) -> Tuple[Union[Mapping[str, Any], None], int]:
+        """The position within the random stream, i.e., the state of the
+        generator before the current chunk was drawn and the number of calls
+        handed out from that chunk so far"""
+        return self._chunk_state, self._consumed
+
+    def restore(self, state: Tuple[Union[Mapping[str, Any], None], int]
+                ) -> None:
+        """Rewinds the stream to a position previously taken from `state`
+
+        Must be called before iterating over the process.
+
+        Args:
+            state: position within the random stream
+
+        """
+        chunk_state, consumed = state
+        if chunk_state is not None:
+            self._rng.bit_generator.state = chunk_state
+        self._skip = consumed
+
+    def sample(self, num_calls: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Draws inter-arrival and holding times for a block of calls
+
+        Args:
+            num_calls: number of calls to be sampled
+
+        Returns:
+            :obj:`tuple`: two arrays of size `num_calls` storing the time until
+                the next call arrives and the time each call holds resources
+
+        """
+        until_next = self._rng.standard_exponential(num_calls) / self._load
+        holding_time = self._rng.standard_exponential(num_calls)
+        return until_next, holding_time
+
+    def __iter__(self) -> Iterator[Tuple[float, float, Union[int, None]]]:
+        """Hands out calls one at a time, as the time until the next call
+        arrives, the time the call holds resources and the index of its pair
+        of nodes within the `PairDistribution`, if any, or None"""
+        skip, self._skip = self._skip, 0
+        while True:
+            self._chunk_state = self._rng.bit_generator.state
+            until_next, holding_time = self.sample(self._chunk_size)
+            if self._pairs is not None:
+                pairs: Iterable[Union[int, None]] = self._pairs.sample(
+                    self._rng, self._chunk_size).tolist()
+            else:
+                pairs = repeat(None)
+            calls = zip(until_next.tolist(), holding_time.tolist(), pairs)
+            for self._consumed, call in enumerate(islice(calls, skip, None),
+                                                  skip + 1):
+                yield call
+            skip = 0
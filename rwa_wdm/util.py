@@ -1,30 +1,32 @@
 import logging
 from argparse import Namespace
 
+from .sim import SimulationConfig
+
 logger = logging.getLogger(__name__)
 
 
-def validate_args(args: Namespace) -> None:
+def validate_args(args: Namespace) -> SimulationConfig:
     """Validates arguments passed via command line through argparse module
 
+    Arguments are checked as the simulation configuration they translate to
+    (see `SimulationConfig.validate`), besides the few that only concern the
+    command line interface itself.
+
     Args:
         args: `Namespace` object from argparse module
 
+    Returns:
+        SimulationConfig: the equivalent simulation configuration
+
     Raises:
         ValueError: if a combination of both routing and wavelength assignment
-            algorithms is not specified nor a single RWA algorithm as one.
-
+            algorithms is not specified nor a single RWA algorithm as one, or
+            if any other argument is not valid
 
     """
-    if args.rwa is None:
-        if args.r is None and args.w is None:
-            raise ValueError('The use of either --rwa flag or both -r and -w '
-                             'combined is required.')
-        elif not (args.r and args.w):
-            raise ValueError('Flags -r and -w should be set in combination.')
-    elif args.rwa is not None:
-        if args.r is not None or args.w is not None:
-            raise ValueError('Set either --rwa flag alone or both -r and -w '
-                             'flags combined.')
-    if args.num_sim < 1:
-        raise ValueError('Expect a positive integer as number of simulations.')
+    if args.progress_interval is not None and args.progress_interval <= 0:
+        raise ValueError('Expect a positive progress interval.')
+    config = SimulationConfig.from_args(args)
+    config.validate()
+    return config